@@ -0,0 +1 @@
+"""Benchmark suite of PyApriori, run with ``python -m benchmarks.run``."""
@@ -0,0 +1,128 @@
+"""Benchmark datasets: bundled FIMI files and IBM Quest style synthetic data."""
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from pyapriori.utils import read_fimi
+
+DATA_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "notebooks", "data"
+)
+
+
+def load_fimi(name: str) -> csr_matrix:
+    """Load a FIMI dataset bundled in ``notebooks/data``
+
+    Parameters
+    ----------
+    name: str :
+        File name without the ``.dat`` suffix, e.g. ``"mushroom"``.
+
+    Returns
+    -------
+    csr_matrix
+
+    """
+    return read_fimi(os.path.join(DATA_DIRECTORY, name + ".dat"))
+
+
+def quest_name(
+    n_transactions: int, average_length: int, average_pattern_length: int
+) -> str:
+    """Conventional name of a Quest dataset, e.g. ``"T10I4D10K"``"""
+    size = "{}K".format(n_transactions // 1000) if n_transactions >= 1000 else ""
+    return "T{}I{}D{}".format(
+        average_length, average_pattern_length, size or n_transactions
+    )
+
+
+def quest_transactions(
+    n_transactions: int = 10000,
+    average_length: int = 10,
+    average_pattern_length: int = 4,
+    n_items: int = 1000,
+    n_patterns: int = 1000,
+    correlation: float = 0.5,
+    random_state: int = 0,
+) -> csr_matrix:
+    """Synthetic baskets of the IBM Quest generator (Agrawal and Srikant, 1994)
+
+    Transactions are filled with corrupted copies of potentially frequent
+    patterns. Pattern lengths are Poisson distributed with mean
+    `average_pattern_length`, every pattern reuses an exponentially
+    distributed fraction of the items of the previous one and is picked with
+    an exponentially distributed weight. Each copy drops items while a
+    uniform draw is below the corruption level of the pattern. A pattern
+    that does not fit into the remaining size of a transaction is added
+    anyway in half of the cases and moved to the next transaction otherwise.
+
+    Parameters
+    ----------
+    n_transactions: int :
+         (Default value = 10000)
+    average_length: int :
+        Mean of the Poisson distributed transaction sizes.
+         (Default value = 10)
+    average_pattern_length: int :
+         (Default value = 4)
+    n_items: int :
+         (Default value = 1000)
+    n_patterns: int :
+         (Default value = 1000)
+    correlation: float :
+        Mean fraction of items a pattern shares with the previous one.
+         (Default value = 0.5)
+    random_state: int :
+        Seed, the data only depends on the parameters and the seed.
+         (Default value = 0)
+
+    Returns
+    -------
+    csr_matrix
+        Boolean ``(n_transactions, n_items)`` matrix.
+
+    """
+    random = np.random.RandomState(random_state)
+    patterns = []
+    previous = np.zeros(0, dtype=np.int64)
+    for _ in range(n_patterns):
+        length = min(max(random.poisson(average_pattern_length), 1), n_items)
+        n_shared = min(
+            int(round(min(random.exponential(correlation), 1.0) * length)),
+            len(previous),
+        )
+        shared = random.choice(previous, n_shared, replace=False)
+        fresh = random.choice(
+            np.setdiff1d(np.arange(n_items), shared), length - n_shared, replace=False
+        )
+        previous = np.concatenate((shared, fresh))
+        patterns.append(previous)
+    weights = random.exponential(1.0, n_patterns)
+    weights /= weights.sum()
+    corruption = np.clip(random.normal(0.5, 0.1, n_patterns), 0.0, 1.0)
+
+    indptr = [0]
+    indices = []
+    pending = None
+    for _ in range(n_transactions):
+        size = max(random.poisson(average_length), 1)
+        basket = set()
+        while len(basket) < size:
+            if pending is None:
+                pattern = random.choice(n_patterns, p=weights)
+                items = patterns[pattern]
+                keep = len(items)
+                while keep > 0 and random.rand() < corruption[pattern]:
+                    keep -= 1
+                pending = random.permutation(items)[:keep]
+            if basket and len(basket) + len(pending) > size and random.rand() < 0.5:
+                break
+            basket.update(pending.tolist())
+            pending = None
+        indices.extend(sorted(basket))
+        indptr.append(len(indices))
+    return csr_matrix(
+        (np.ones(len(indices), dtype=bool), indices, indptr),
+        shape=(n_transactions, n_items),
+    )
@@ -0,0 +1,333 @@
+"""Run the benchmark suite and compare it with a stored baseline.
+
+Usage::
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+Every case fits `PyApriori` on one dataset, support threshold, input type
+and backend, the ``"fpgrowth"`` backend fits `PyFPGrowth` instead.
+Runtime is the best of ``--repeat`` fits, peak host memory is traced with
+`tracemalloc` in a separate fit so tracing does not slow down the timed
+ones.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import scipy
+from scipy.sparse import csc_matrix, csr_matrix
+
+import pyapriori
+from benchmarks.datasets import load_fimi, quest_name, quest_transactions
+from pyapriori import PyApriori, PyFPGrowth
+
+# Dataset name, loader and absolute support thresholds
+DATASETS = [
+    ("mushroom", lambda: load_fimi("mushroom"), (2000, 1500)),
+    ("chess", lambda: load_fimi("chess"), (3000, 2900, 2000)),
+    (
+        quest_name(5000, 10, 4),
+        lambda: quest_transactions(5000, 10, 4),
+        (100, 50),
+    ),
+]
+QUICK_DATASETS = [
+    ("mushroom", lambda: load_fimi("mushroom"), (2000,)),
+    (
+        quest_name(2000, 10, 4),
+        lambda: quest_transactions(2000, 10, 4),
+        (40,),
+    ),
+]
+BACKENDS = ("default", "bitset", "auto", "fpgrowth")
+
+
+def _cupy_input() -> Optional[Callable]:
+    """Conversion to a cupy array, ``None`` without a usable GPU"""
+    try:
+        import cupy as cp
+
+        if cp.cuda.runtime.getDeviceCount() == 0:
+            return None
+    except Exception:
+        return None
+    return lambda data: cp.asarray(data.toarray())
+
+
+def input_types() -> Dict[str, Callable]:
+    """Conversions of a CSR dataset to every available input type"""
+    inputs = {
+        "numpy": lambda data: data.toarray(),
+        "csr": csr_matrix,
+        "csc": csc_matrix,
+    }
+    cupy_input = _cupy_input()
+    if cupy_input is not None:
+        inputs["cupy"] = cupy_input
+    return inputs
+
+
+def _device_memory(data) -> Optional[int]:
+    """Bytes held by the cupy memory pool for cupy `data`"""
+    module = type(data).__module__
+    if not module.startswith("cupy"):
+        return None
+    import cupy as cp
+
+    return cp.get_default_memory_pool().total_bytes()
+
+
+def run_case(data, min_support: int, backend: str, repeat: int) -> dict:
+    """Time one fit configuration
+
+    Parameters
+    ----------
+    data: Data :
+
+    min_support: int :
+
+    backend: str :
+
+    repeat: int :
+        Number of timed fits, the fastest is reported.
+
+    Returns
+    -------
+    dict
+        ``time`` in seconds, ``peak_memory`` and ``device_memory`` in bytes
+        and the number of frequent itemsets ``n_itemsets``.
+
+    """
+    if backend == "fpgrowth":
+        miner = PyFPGrowth(min_support, 1, itemset_format="ids")
+    else:
+        miner = PyApriori(min_support, 1, backend=backend, itemset_format="ids")
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, support = miner.fit(data)
+        times.append(time.perf_counter() - start)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.clear_traces()
+    miner.fit(data)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    if not tracing:
+        tracemalloc.stop()
+    return {
+        "time": min(times),
+        "peak_memory": peak_memory,
+        "device_memory": _device_memory(data),
+        "n_itemsets": 0 if support is None else int(len(support)),
+    }
+
+
+def run_suite(
+    datasets: list,
+    inputs: Dict[str, Callable],
+    backends: tuple = BACKENDS,
+    repeat: int = 5,
+    log: Callable[[str], None] = print,
+) -> List[dict]:
+    """Run every combination of dataset, support, input type and backend"""
+    results = []
+    for name, load, supports in datasets:
+        dataset = load()
+        for input_name, convert in inputs.items():
+            data = convert(dataset)
+            for min_support in supports:
+                for backend in backends:
+                    result = {
+                        "dataset": name,
+                        "n_transactions": dataset.shape[0],
+                        "n_items": dataset.shape[1],
+                        "min_support": min_support,
+                        "input": input_name,
+                        "backend": backend,
+                    }
+                    result.update(run_case(data, min_support, backend, repeat))
+                    log(
+                        "{dataset:>12} {min_support:>6} {input:>5} {backend:>7} "
+                        "{time:9.3f} s {peak_memory:>12,d} B {n_itemsets:>9,d} "
+                        "itemsets".format(**result)
+                    )
+                    results.append(result)
+    return results
+
+
+def _key(result: dict) -> tuple:
+    return (
+        result["dataset"],
+        result["min_support"],
+        result["input"],
+        result["backend"],
+    )
+
+
+def compare(
+    results: List[dict],
+    baseline: List[dict],
+    tolerance: float,
+    min_time: float = 0.05,
+) -> List[str]:
+    """Regressions of `results` against `baseline`
+
+    Parameters
+    ----------
+    results: List[dict] :
+
+    baseline: List[dict] :
+
+    tolerance: float :
+        Allowed relative increase of runtime and peak memory.
+    min_time: float :
+        Runtimes are compared as at least `min_time` seconds, so timer noise
+        of very short fits is not reported.
+         (Default value = 0.05)
+
+    Returns
+    -------
+    List[str]
+        One message per case that is slower, needs more memory or finds a
+        different number of itemsets. Cases missing in `baseline` are not
+        compared, they are listed by `missing_cases`.
+
+    """
+    baseline = {_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        reference = baseline.get(_key(result))
+        if reference is None:
+            continue
+        case = "{} min_support={} input={} backend={}".format(*_key(result))
+        if result["n_itemsets"] != reference["n_itemsets"]:
+            regressions.append(
+                "{}: {} itemsets, baseline {}".format(
+                    case, result["n_itemsets"], reference["n_itemsets"]
+                )
+            )
+        for metric, floor in (("time", min_time), ("peak_memory", 0)):
+            value = max(result[metric], floor)
+            reference_value = max(reference[metric], floor)
+            if value > reference_value * (1 + tolerance):
+                regressions.append(
+                    "{}: {} {:.4g}, baseline {:.4g} (+{:.0%})".format(
+                        case,
+                        metric,
+                        result[metric],
+                        reference[metric],
+                        value / reference_value - 1,
+                    )
+                )
+    return regressions
+
+
+def missing_cases(results: List[dict], baseline: List[dict]) -> List[str]:
+    """Cases of `results` that `baseline` has no entry for
+
+    Parameters
+    ----------
+    results: List[dict] :
+
+    baseline: List[dict] :
+
+
+    Returns
+    -------
+    List[str]
+        One message per case `compare` cannot check.
+
+    """
+    keys = {_key(result) for result in baseline}
+    return [
+        "{} min_support={} input={} backend={}: not in the baseline".format(
+            *_key(result)
+        )
+        for result in results
+        if _key(result) not in keys
+    ]
+
+
+def environment() -> dict:
+    """Versions and platform the results were measured on"""
+    return {
+        "pyapriori": pyapriori.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed relative increase of time and memory (default 0.5)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="shorter runtimes are compared as this many seconds (default 0.05)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed fits per case")
+    parser.add_argument(
+        "--quick", action="store_true", help="run a small subset of the cases"
+    )
+    parser.add_argument(
+        "--inputs", nargs="+", help="input types to run (default all available)"
+    )
+    parser.add_argument(
+        "--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS
+    )
+    args = parser.parse_args(argv)
+
+    inputs = input_types()
+    if args.inputs:
+        unknown = set(args.inputs) - set(inputs)
+        if unknown:
+            parser.error("unavailable input types: {}".format(", ".join(unknown)))
+        inputs = {name: inputs[name] for name in args.inputs}
+    results = run_suite(
+        QUICK_DATASETS if args.quick else DATASETS,
+        inputs,
+        tuple(args.backends),
+        args.repeat,
+    )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {"environment": environment(), "results": results}, file, indent=2
+            )
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        for case in missing_cases(results, baseline):
+            print("MISSING " + case)
+        regressions = compare(results, baseline, args.tolerance, args.min_time)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+        print("No regressions against {}".format(args.baseline))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
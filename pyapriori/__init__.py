@@ -1,6 +1,14 @@
 """Top-level package for PyApriori."""
 from pyapriori import utils
 from pyapriori.pyapriori import PyApriori
+from pyapriori.fpgrowth import PyFPGrowth
+from pyapriori.eclat import PyEclat
+from pyapriori.incremental import PyIncrementalApriori
+from pyapriori.partition import PyPartitionApriori
+from pyapriori.sampling import PySamplingApriori
+from pyapriori.rules import Rules, association_rules, iter_association_rules
+from pyapriori.utils.itemsets import FrequentItemsets
+from pyapriori.utils.profiling import LevelStats
 
 __author__ = """Lukas Sykora"""
 __email__ = "lukassykora@seznam.cz"
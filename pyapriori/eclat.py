@@ -0,0 +1,94 @@
+"""Eclat module."""
+from typing import Union
+
+from pyapriori.pyapriori import ITEMSET_FORMATS
+from pyapriori.utils.adapters import to_matrix
+from pyapriori.utils.eclat import mine_eclat
+from pyapriori.utils.utils import (
+    Data,
+    absolute_support,
+    format_itemsets,
+    frequent_single_itemsets,
+    get_numpy_or_cupy,
+    group_itemsets,
+    to_bitset,
+)
+
+
+class PyEclat:
+    """Depth-first Eclat frequent itemsets miner with the interface of `PyApriori`
+
+    The column-reduced, support-sorted matrix of `frequent_single_itemsets`
+    is packed into vertical bitset tidsets and mined one equivalence class
+    at a time, so memory is bounded by the recursion depth rather than by
+    the size of a level.
+
+    Parameters
+    ----------
+    min_support: Union[int, float] :
+        Number of transactions, or a float between 0 and 1 giving the
+        fraction of the transactions.
+         (Default value = 2)
+    min_length: int :
+         (Default value = 2)
+    itemset_format: str :
+        Representation of the itemsets returned by `fit`, ``"dense"`` boolean
+        rows, ``"ids"`` sorted item ids, ``"labels"`` item names or
+        ``"compact"`` (`FrequentItemsets`).
+         (Default value = "dense")
+    diffsets: bool :
+        Use the dEclat diffset optimization, which keeps the sets small on
+        dense data.
+         (Default value = True)
+
+    """
+
+    def __init__(
+        self,
+        min_support: Union[int, float] = 2,
+        min_length: int = 2,
+        itemset_format: str = "dense",
+        diffsets: bool = True,
+    ):
+        if itemset_format not in ITEMSET_FORMATS:
+            raise ValueError(
+                "Unknown itemset_format {!r}, expected one of {}".format(
+                    itemset_format, ITEMSET_FORMATS
+                )
+            )
+        self.min_support = min_support
+        self.min_length = min_length
+        self.itemset_format = itemset_format
+        self.diffsets = diffsets
+
+    def fit(self, data: Data) -> tuple:
+        """
+
+        Parameters
+        ----------
+        data: Data :
+
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)`` in the format of `PyApriori.fit`.
+            Itemsets are ordered by length, then by their sorted item ids.
+
+        """
+        data, labels = to_matrix(data)
+        numpy_or_cupy = get_numpy_or_cupy(data)
+        n_items = data.shape[1]
+
+        min_support = absolute_support(self.min_support, data.shape[0])
+        items, support, data = frequent_single_itemsets(
+            data, min_support, itemset_format="ids"
+        )
+        items = items.ravel()
+        tidsets = to_bitset(data).words
+        members = numpy_or_cupy.arange(len(items), dtype=numpy_or_cupy.int32)
+        blocks = mine_eclat(members, tidsets, support, min_support, self.diffsets)
+        levels, levels_support = group_itemsets(blocks, items, self.min_length)
+        return format_itemsets(
+            levels, levels_support, items, n_items, self.itemset_format, labels
+        )
@@ -0,0 +1,111 @@
+"""FP-Growth module."""
+from typing import Union
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from pyapriori.pyapriori import ITEMSET_FORMATS
+from pyapriori.utils.adapters import to_matrix
+from pyapriori.utils.fptree import build_fptree, mine_fptree
+from pyapriori.utils.utils import (
+    Data,
+    absolute_support,
+    format_itemsets,
+    frequent_single_itemsets,
+    group_itemsets,
+    to_host_csr,
+)
+
+
+class PyFPGrowth:
+    """FP-Growth frequent itemsets miner with the interface of `PyApriori`
+
+    Transactions are compressed into an FP-tree whose nodes are stored in
+    flat arrays and mined with conditional trees, so the number of
+    candidates does not explode on dense data at low support. The
+    conditional trees of all frequent items of a tree are built together in
+    the same arrays, so the Python overhead grows with the itemset length
+    rather than with the number of itemsets. The tree is built and mined in
+    host memory, cupy inputs are copied to the host and the result is
+    returned as cupy arrays.
+
+    Parameters
+    ----------
+    min_support: Union[int, float] :
+        Number of transactions, or a float between 0 and 1 giving the
+        fraction of the transactions.
+         (Default value = 2)
+    min_length: int :
+         (Default value = 2)
+    itemset_format: str :
+        Representation of the itemsets returned by `fit`, ``"dense"`` boolean
+        rows, ``"ids"`` sorted item ids, ``"labels"`` item names or
+        ``"compact"`` (`FrequentItemsets`).
+         (Default value = "dense")
+
+    """
+
+    def __init__(
+        self,
+        min_support: Union[int, float] = 2,
+        min_length: int = 2,
+        itemset_format: str = "dense",
+    ):
+        if itemset_format not in ITEMSET_FORMATS:
+            raise ValueError(
+                "Unknown itemset_format {!r}, expected one of {}".format(
+                    itemset_format, ITEMSET_FORMATS
+                )
+            )
+        self.min_support = min_support
+        self.min_length = min_length
+        self.itemset_format = itemset_format
+
+    def fit(self, data: Data) -> tuple:
+        """
+
+        Parameters
+        ----------
+        data: Data :
+
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)`` in the format of `PyApriori.fit`.
+            Itemsets are ordered by length, then by their sorted item ids.
+
+        """
+        data, labels = to_matrix(data)
+        n_items = data.shape[1]
+        min_support = absolute_support(self.min_support, data.shape[0])
+
+        items, _, data = frequent_single_itemsets(
+            data, min_support, itemset_format="ids"
+        )
+        items = items.ravel()
+        n_frequent = len(items)
+
+        # Transactions as item ranks, rank 0 is the most frequent item
+        data = to_host_csr(data)
+        ranks = csr_matrix(
+            (data.data.astype(bool), n_frequent - 1 - data.indices, data.indptr),
+            shape=data.shape,
+        )
+        ranks.eliminate_zeros()
+        ranks.sort_indices()
+        tree = build_fptree(
+            ranks.indptr,
+            ranks.indices.astype(np.int64),
+            np.ones(ranks.shape[0]),
+            n_frequent,
+        )
+
+        blocks = [
+            (n_frequent - 1 - ranks, support)
+            for ranks, support in mine_fptree(tree, n_frequent, min_support)
+        ]
+        levels, levels_support = group_itemsets(blocks, items, self.min_length)
+        return format_itemsets(
+            levels, levels_support, items, n_items, self.itemset_format, labels
+        )
@@ -0,0 +1,264 @@
+"""Incremental Apriori module."""
+from typing import Union
+
+from pyapriori.pyapriori import ITEMSET_FORMATS
+from pyapriori.utils.adapters import to_matrix
+from pyapriori.utils.utils import (
+    Data,
+    MultiDimensionalArray,
+    absolute_support,
+    align_columns,
+    as_transactions,
+    count_itemsets,
+    format_itemsets,
+    frequent_items,
+    generate_candidates,
+    get_numpy_or_cupy,
+    get_support,
+    join_candidates,
+    match_itemsets,
+    prefix_support,
+    prune_candidates,
+)
+
+
+class PyIncrementalApriori:
+    """Apriori miner updated with new transactions (FUP with negative borders)
+
+    Besides the frequent itemsets, the miner keeps the support of their
+    negative border, the candidates of every level that were counted but are
+    infrequent. When transactions are added, only the new rows are counted
+    for these itemsets. Old transactions are scanned again only for the
+    candidates of the updated levels with unknown support, which are the
+    itemsets crossing the border. The result equals `PyApriori.fit` on all
+    transactions seen so far.
+
+    Parameters
+    ----------
+    min_support: Union[int, float] :
+        Number of transactions, or a float between 0 and 1 giving the
+        fraction of the transactions.
+         (Default value = 2)
+    min_length: int :
+         (Default value = 2)
+    itemset_format: str :
+        Representation of the itemsets returned by `fit` and `update`, as in
+        `PyApriori`.
+         (Default value = "dense")
+    n_jobs: int :
+        Number of threads counting support of host data.
+         (Default value = 1)
+
+    Attributes
+    ----------
+    rescanned_candidates: dict :
+        Number of itemsets of every size `k` counted on the old transactions
+        in the last `update`.
+
+    """
+
+    def __init__(
+        self,
+        min_support: Union[int, float] = 2,
+        min_length: int = 2,
+        itemset_format: str = "dense",
+        n_jobs: int = 1,
+    ):
+        if itemset_format not in ITEMSET_FORMATS:
+            raise ValueError(
+                "Unknown itemset_format {!r}, expected one of {}".format(
+                    itemset_format, ITEMSET_FORMATS
+                )
+            )
+        self.min_support = min_support
+        self.min_length = min_length
+        self.itemset_format = itemset_format
+        self.n_jobs = n_jobs
+        self.rescanned_candidates = {}
+        self._chunks = []
+        self._n_transactions = 0
+        self._labels = None
+        self._columns_support = None
+        self._border = {}
+
+    def fit(self, data: Data) -> tuple:
+        """Mine `data` from scratch, dropping the state of previous calls
+
+        Parameters
+        ----------
+        data: Data :
+            Transactions in any input accepted by `PyApriori.fit`.
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)`` in the format of `PyApriori.fit`.
+
+        """
+        self._chunks = []
+        self._n_transactions = 0
+        self._labels = None
+        self._columns_support = None
+        self._border = {}
+        return self.update(data)
+
+    def update(self, data: Data) -> tuple:
+        """Add transactions and update the frequent itemsets
+
+        The matrices of all updates are referenced by the miner to rescan
+        them for itemsets crossing the border. Their columns must refer to
+        the same items, new items are appended as new columns.
+
+        Parameters
+        ----------
+        data: Data :
+            New transactions in any input accepted by `PyApriori.fit`.
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)`` of all transactions seen so far, in the
+            order of `PyApriori.fit`.
+
+        """
+        data, labels = to_matrix(data)
+        if labels is not None:
+            self._labels = labels
+        data = as_transactions(data)
+        numpy_or_cupy = get_numpy_or_cupy(data)
+        n_items = data.shape[1]
+        if self._columns_support is not None:
+            n_items = max(n_items, len(self._columns_support))
+        data = align_columns(data, n_items)
+
+        columns_support = get_support(data, numpy_or_cupy, self.n_jobs)
+        if self._columns_support is not None:
+            columns_support = columns_support + numpy_or_cupy.pad(
+                self._columns_support, (0, n_items - len(self._columns_support))
+            )
+        # A fractional threshold grows with the transactions, itemsets may
+        # then drop out of the result and are kept in the border
+        n_transactions = self._n_transactions + data.shape[0]
+        min_support = absolute_support(self.min_support, n_transactions)
+        items, _ = frequent_items(columns_support, min_support)
+        # Levels are mined on sorted item ids, which do not depend on the
+        # support order of the items and stay valid across updates
+        level = numpy_or_cupy.sort(items).astype(numpy_or_cupy.int32).reshape(-1, 1)
+        levels = [level]
+        levels_support = [columns_support[level[:, 0]]]
+
+        self.rescanned_candidates = {}
+        border = {}
+        k = 2
+        multiplier_mask_left = None
+        while len(level) > 1:
+            multiplier_mask_left, multiplier_mask_right = generate_candidates(
+                level, multiplier_mask_left
+            )
+            multiplier_mask_left, multiplier_mask_right = prune_candidates(
+                level, multiplier_mask_left, multiplier_mask_right
+            )
+            if len(multiplier_mask_left) == 0:
+                break
+            candidates = join_candidates(
+                level, multiplier_mask_left, multiplier_mask_right
+            )
+            candidates_support = self._update_support(
+                data,
+                candidates,
+                prefix_support(
+                    data,
+                    level,
+                    multiplier_mask_left,
+                    multiplier_mask_right,
+                    n_jobs=self.n_jobs,
+                ),
+            )
+            border[k] = (candidates, candidates_support)
+
+            over_support_mask = candidates_support >= min_support
+            level = candidates[over_support_mask]
+            multiplier_mask_left = multiplier_mask_left[over_support_mask]
+            levels.append(level)
+            levels_support.append(candidates_support[over_support_mask])
+            k += 1
+
+        self._chunks.append(data)
+        self._n_transactions = n_transactions
+        self._columns_support = columns_support
+        self._border = border
+        return self._format(levels, levels_support, items, n_items)
+
+    def _update_support(
+        self,
+        data: Data,
+        candidates: MultiDimensionalArray,
+        support: MultiDimensionalArray,
+    ) -> MultiDimensionalArray:
+        """Support of `candidates` in the old transactions and `data`
+
+        Parameters
+        ----------
+        data: Data :
+            New transactions.
+        candidates: MultiDimensionalArray :
+            ``(n_candidates, k)`` sorted item ids in lexicographic order.
+        support: MultiDimensionalArray :
+            Support of `candidates` in `data`.
+
+        Returns
+        -------
+        MultiDimensionalArray
+
+        """
+        numpy_or_cupy = get_numpy_or_cupy(candidates)
+        n_items = data.shape[1]
+        known, known_support = self._border.get(
+            candidates.shape[1], (candidates[:0], support[:0])
+        )
+        matches = match_itemsets(known, candidates, reference_sorted=True)
+        found = matches >= 0
+        support[found] += known_support[matches[found]]
+
+        unknown = numpy_or_cupy.flatnonzero(~found)
+        self.rescanned_candidates[candidates.shape[1]] = len(unknown)
+        if len(unknown) > 0:
+            for chunk in self._chunks:
+                support[unknown] += count_itemsets(
+                    align_columns(chunk, n_items), candidates[unknown], self.n_jobs
+                )
+        return support
+
+    def _format(
+        self,
+        levels: list,
+        levels_support: list,
+        items: MultiDimensionalArray,
+        n_items: int,
+    ) -> tuple:
+        """Result of `update` with itemsets ordered as by `PyApriori.fit`
+
+        `PyApriori.fit` orders every level by the positions of the items in
+        `items`, the frequent items by ascending support.
+
+        """
+        numpy_or_cupy = get_numpy_or_cupy(items)
+        positions = numpy_or_cupy.zeros(n_items, dtype=numpy_or_cupy.int32)
+        positions[items] = numpy_or_cupy.arange(len(items), dtype=numpy_or_cupy.int32)
+        result = []
+        result_support = []
+        for level, level_support in zip(levels, levels_support):
+            if level.shape[1] < self.min_length or len(level) == 0:
+                continue
+            level = numpy_or_cupy.sort(positions[level], axis=1)
+            order = numpy_or_cupy.lexsort(level.T[::-1])
+            result.append(level[order])
+            result_support.append(level_support[order])
+        return format_itemsets(
+            result,
+            result_support,
+            items,
+            n_items,
+            self.itemset_format,
+            self._labels,
+        )
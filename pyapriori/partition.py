@@ -0,0 +1,335 @@
+"""Partition (SON) Apriori module."""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+from types import ModuleType
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from pyapriori.pyapriori import BACKENDS, ITEMSET_FORMATS, PyApriori
+from pyapriori.utils.adapters import to_matrix
+from pyapriori.utils.parallel import (
+    effective_n_jobs,
+    row_block,
+    row_block_weights,
+    row_blocks,
+)
+from pyapriori.utils.utils import (
+    Data,
+    MultiDimensionalArray,
+    absolute_support,
+    as_transactions,
+    column_bytes,
+    count_itemsets,
+    format_itemsets,
+    get_numpy_or_cupy,
+    get_support,
+    group_itemsets,
+)
+from pyapriori.utils.weights import check_weights
+
+
+class _SerialExecutor(Executor):
+    """Executor running every task in the calling thread"""
+
+    def submit(self, function, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
+
+
+@contextmanager
+def _no_shutdown(executor: Executor):
+    """Context manager yielding `executor` without shutting it down"""
+    yield executor
+
+
+def _partition_size(partition: Data, weights: Optional[MultiDimensionalArray]) -> int:
+    """Number of transactions (total weight) of a partition"""
+    if weights is None:
+        return partition.shape[0]
+    return int(weights.sum())
+
+
+def _mine_partition(
+    partition: Data,
+    weights: Optional[MultiDimensionalArray],
+    min_support: int,
+    backend: str,
+    memory_budget: Optional[int],
+) -> Optional[MultiDimensionalArray]:
+    """Itemsets of at least two items frequent in one partition
+
+    Parameters
+    ----------
+    partition: Data :
+        Rows of the transactions.
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row of `partition`.
+    min_support: int :
+        Absolute threshold scaled to the partition.
+    backend: str :
+
+    memory_budget: Optional[int] :
+
+
+    Returns
+    -------
+    Optional[MultiDimensionalArray]
+        Sorted item ids right padded with -1, ``None`` if nothing is
+        frequent.
+
+    """
+    itemsets, _ = PyApriori(
+        min_support,
+        2,
+        backend=backend,
+        itemset_format="ids",
+        memory_budget=memory_budget,
+    ).fit(partition, weights=weights)
+    return itemsets
+
+
+def _count_partition(
+    partition: Data,
+    weights: Optional[MultiDimensionalArray],
+    candidates: List[MultiDimensionalArray],
+    memory_budget: Optional[int],
+) -> Tuple[MultiDimensionalArray, List[MultiDimensionalArray]]:
+    """Support of the items and of `candidates` in one partition
+
+    Parameters
+    ----------
+    partition: Data :
+        Rows of the transactions.
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row of `partition`.
+    candidates: List[MultiDimensionalArray] :
+        ``(n_candidates, k)`` item ids of every candidate size.
+    memory_budget: Optional[int] :
+        Bytes the intersected columns of the candidates counted at once may
+        take, ``None`` counts a size at once.
+
+    Returns
+    -------
+    tuple
+        ``(columns_support, candidates_support)``
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(partition)
+    columns_support = get_support(partition, numpy_or_cupy, weights=weights)
+    batch_size = None
+    if memory_budget is not None:
+        batch_size = max(1, memory_budget // (2 * column_bytes(partition)))
+    candidates_support = [
+        count_itemsets(partition, level, weights=weights, batch_size=batch_size)
+        for level in candidates
+    ]
+    return columns_support, candidates_support
+
+
+class PyPartitionApriori:
+    """Two-pass partition (SON) miner with the interface of `PyApriori`
+
+    The transactions are split into contiguous row partitions, each mined
+    by `PyApriori` at `min_support` scaled to the size of the partition. An
+    itemset frequent in all transactions is frequent in at least one
+    partition, so the union of the local results holds every frequent
+    itemset. A second pass counts the union in every partition and the
+    partial supports are summed. Both passes are sent to an executor, one
+    task per partition, so a cluster executor can stand in for the local
+    process pool.
+
+    Parameters
+    ----------
+    min_support: Union[int, float] :
+        Number of transactions, or a float between 0 and 1 giving the
+        fraction of the transactions.
+         (Default value = 2)
+    min_length: int :
+         (Default value = 2)
+    itemset_format: str :
+        Representation of the itemsets returned by `fit`, as in `PyApriori`.
+         (Default value = "dense")
+    n_partitions: Optional[int] :
+        Number of row partitions, ``None`` uses one per worker of `n_jobs`.
+         (Default value = None)
+    executor: Optional[Executor] :
+        `concurrent.futures.Executor` running the tasks of both passes, for
+        example a ``ProcessPoolExecutor`` or the executor of a dask or Ray
+        cluster. Partitions and the candidates are pickled to its workers,
+        it is not shut down by `fit`. ``None`` starts a process pool of
+        `n_jobs` workers for host data and runs the tasks in the calling
+        process for device data or a single job.
+         (Default value = None)
+    n_jobs: int :
+        Number of processes of the pool started without an `executor`.
+        ``-1`` uses all CPUs.
+         (Default value = 1)
+    backend: str :
+        Backend of the local `PyApriori` miners.
+         (Default value = "default")
+    memory_budget: Optional[int] :
+        Memory budget of the local miners and of the second pass, see
+        `PyApriori`.
+         (Default value = None)
+
+    Attributes
+    ----------
+    n_candidates: dict :
+        Number of candidates of every size `k` counted in the second pass
+        of the last `fit`, the ones below `min_support` are the false
+        positives of the partitions.
+
+    """
+
+    def __init__(
+        self,
+        min_support: Union[int, float] = 2,
+        min_length: int = 2,
+        itemset_format: str = "dense",
+        n_partitions: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        n_jobs: int = 1,
+        backend: str = "default",
+        memory_budget: Optional[int] = None,
+    ):
+        if itemset_format not in ITEMSET_FORMATS:
+            raise ValueError(
+                "Unknown itemset_format {!r}, expected one of {}".format(
+                    itemset_format, ITEMSET_FORMATS
+                )
+            )
+        if backend not in BACKENDS:
+            raise ValueError(
+                "Unknown backend {!r}, expected one of {}".format(backend, BACKENDS)
+            )
+        self.min_support = min_support
+        self.min_length = min_length
+        self.itemset_format = itemset_format
+        self.n_partitions = n_partitions
+        self.executor = executor
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.memory_budget = memory_budget
+        self.n_candidates = {}
+
+    def fit(self, data: Data, weights: Optional[MultiDimensionalArray] = None) -> tuple:
+        """
+
+        Parameters
+        ----------
+        data: Data :
+            Transactions in any input accepted by `PyApriori.fit`.
+        weights: Optional[MultiDimensionalArray] :
+            Number of occurrences of every transaction, as in `PyApriori.fit`.
+             (Default value = None)
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)`` in the format of `PyApriori.fit`.
+            Itemsets are ordered by length, then by their sorted item ids.
+
+        """
+        data, labels = to_matrix(data)
+        data = as_transactions(data)
+        numpy_or_cupy = get_numpy_or_cupy(data)
+        n_transactions, n_items = data.shape
+        weights = check_weights(weights, n_transactions, numpy_or_cupy)
+        if weights is not None:
+            n_transactions = int(weights.sum())
+        min_support = absolute_support(self.min_support, n_transactions)
+
+        n_partitions = self.n_partitions or effective_n_jobs(self.n_jobs)
+        bounds = row_blocks(data, n_partitions)
+        partitions = [row_block(data, start, stop) for start, stop in bounds]
+        partitions_weights = [
+            row_block_weights(data, weights, start, stop) for start, stop in bounds
+        ]
+        # A partition may hold a frequent itemset only if its local support
+        # reaches the share of `min_support` of the partition. Partitions of
+        # zero weight support nothing, so the threshold is at least one.
+        local_min_support = [
+            (
+                -(-min_support * _partition_size(*partition) // n_transactions)
+                if n_transactions > 0
+                else min_support
+            )
+            for partition in zip(partitions, partitions_weights)
+        ]
+        if min_support >= 1:
+            local_min_support = [max(1, support) for support in local_min_support]
+
+        with self._executor(numpy_or_cupy, len(partitions)) as executor:
+            local_itemsets = executor.map(
+                _mine_partition,
+                partitions,
+                partitions_weights,
+                local_min_support,
+                repeat(self.backend),
+                repeat(self.memory_budget),
+            )
+            candidates = self._union(local_itemsets, numpy_or_cupy)
+            counts = list(
+                executor.map(
+                    _count_partition,
+                    partitions,
+                    partitions_weights,
+                    repeat(candidates),
+                    repeat(self.memory_budget),
+                )
+            )
+
+        columns_support = sum(numpy_or_cupy.asarray(columns) for columns, _ in counts)
+        frequent = numpy_or_cupy.flatnonzero(columns_support >= min_support)
+        blocks = [(frequent.reshape(-1, 1), columns_support[frequent])]
+        self.n_candidates = {}
+        for position, level in enumerate(candidates):
+            support = sum(
+                numpy_or_cupy.asarray(levels_support[position])
+                for _, levels_support in counts
+            )
+            self.n_candidates[level.shape[1]] = len(level)
+            over_support_mask = support >= min_support
+            blocks.append((level[over_support_mask], support[over_support_mask]))
+
+        items = numpy_or_cupy.arange(n_items, dtype=numpy_or_cupy.int32)
+        levels, levels_support = group_itemsets(blocks, items, self.min_length)
+        return format_itemsets(
+            levels, levels_support, items, n_items, self.itemset_format, labels
+        )
+
+    def _executor(self, numpy_or_cupy: ModuleType, n_partitions: int):
+        """Context manager yielding the executor of the two passes"""
+        if self.executor is not None:
+            return _no_shutdown(self.executor)
+        n_workers = min(n_partitions, effective_n_jobs(self.n_jobs))
+        if numpy_or_cupy is np and n_workers > 1:
+            return ProcessPoolExecutor(max_workers=n_workers)
+        return _SerialExecutor()
+
+    @staticmethod
+    def _union(
+        local_itemsets: Iterable[Optional[MultiDimensionalArray]],
+        numpy_or_cupy: ModuleType,
+    ) -> List[MultiDimensionalArray]:
+        """Unique itemsets of the partitions grouped by size"""
+        by_length = {}
+        for itemsets in local_itemsets:
+            if itemsets is None:
+                continue
+            itemsets = numpy_or_cupy.asarray(itemsets)
+            lengths = (itemsets >= 0).sum(axis=1)
+            for length in range(2, itemsets.shape[1] + 1):
+                level = itemsets[lengths == length, :length]
+                if len(level) > 0:
+                    by_length.setdefault(length, []).append(level)
+        return [
+            numpy_or_cupy.unique(numpy_or_cupy.concatenate(by_length[length]), axis=0)
+            for length in sorted(by_length)
+        ]
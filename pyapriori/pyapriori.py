@@ -1,75 +1,728 @@
 """Main module."""
+from typing import Callable, Iterable, Optional, Union
+
+from pyapriori.utils.adapters import to_matrix
+from pyapriori.utils.profiling import LevelProfiler, LevelStats, profile_stage
+from pyapriori.utils.weights import (
+    check_weights,
+    deduplicate_transactions,
+    trim_transactions,
+)
 from pyapriori.utils.utils import (
     frequent_single_itemsets,
     generate_candidates,
-    itemsets_support,
-    min_support_set,
+    batched_support_set,
+    column_bytes,
     Data,
+    MultiDimensionalArray,
     get_numpy_or_cupy,
+    get_support,
+    as_transactions,
+    frequent_items,
+    align_columns,
+    iter_chunks,
+    join_candidates,
+    count_itemsets,
+    to_bitset,
+    data_layout,
+    to_layout,
+    choose_layout,
+    format_itemsets,
+    prune_candidates,
+    prefix_support,
+    covered_itemsets,
+    absolute_support,
+    top_k_threshold,
+    trim_pays_off,
 )
 
+BACKENDS = ("default", "bitset", "auto")
+ITEMSET_FORMATS = ("dense", "ids", "labels", "compact")
+OUTPUTS = ("all", "closed", "maximal")
+
+
+def _stored_support(
+    columns_support: MultiDimensionalArray,
+    weights: Optional[MultiDimensionalArray],
+) -> tuple:
+    """Entries stored per column and the bits of the largest row weight
+
+    Merged rows store one entry for the weight of several, so the support is
+    scaled by the number of rows over their total weight.
+
+    """
+    if weights is None or len(weights) == 0:
+        return columns_support, 1
+    scale = len(weights) / float(weights.sum())
+    return columns_support * scale, int(weights.max()).bit_length()
+
 
 class PyApriori:
-    """ """
+    """Apriori frequent itemsets miner
 
-    def __init__(self, min_support: int = 2, min_length: int = 2):
+    Parameters
+    ----------
+    min_support: Union[int, float] :
+        Minimal number of transactions containing an itemset, or a float
+        between 0 and 1 giving the fraction of the transactions.
+         (Default value = 2)
+    min_length: int :
+         (Default value = 2)
+    backend: str :
+        Layout used for support counting. ``"default"`` keeps the layout of
+        the input data, ``"bitset"`` packs every column into uint64 tidsets
+        and counts support with bitwise AND and popcount. ``"auto"`` picks
+        the cheapest of a Fortran ordered dense, a CSC and the bitset layout
+        before every level of `fit` from the support of the columns and the
+        candidates to count (see `choose_layout`), so the layout follows the
+        density of the intersections. With `low_memory` the layout is chosen
+        once, `fit_stream` keeps the layout of the chunks.
+         (Default value = "default")
+    itemset_format: str :
+        Representation of the itemsets returned by `fit`, ``"dense"`` boolean
+        rows, ``"ids"`` sorted item ids, ``"labels"`` item names (column
+        names of a pandas DataFrame, dictionary of an Arrow column, column
+        indices otherwise) or ``"compact"``, a `FrequentItemsets` holding the
+        item ids of every itemset in CSR buffers.
+         (Default value = "dense")
+    n_jobs: int :
+        Number of threads counting support of host (numpy and scipy) data.
+        Transactions are split into row blocks shared by the threads and
+        the partial supports are summed. ``-1`` uses all CPUs.
+         (Default value = 1)
+    output: str :
+        Itemsets returned by `fit`. ``"all"`` frequent itemsets, ``"closed"``
+        only itemsets without a superset of the same support or
+        ``"maximal"`` only itemsets without a frequent superset. Each level
+        is filtered as soon as the next one is counted, so redundant
+        itemsets are never accumulated.
+         (Default value = "all")
+    max_candidates_per_batch: Optional[int] :
+        Candidates of a level counted at once. Each slice is counted and
+        filtered before the next one is allocated, which bounds the peak
+        memory of a level without changing the result. ``None`` counts a
+        level at once.
+         (Default value = None)
+    memory_budget: Optional[int] :
+        Bytes the left, right and intersected candidate columns of a slice
+        may take, converted to a number of candidates per level from the
+        estimated size of a column. Combined with `max_candidates_per_batch`
+        the smaller slice is used.
+         (Default value = None)
+    low_memory: bool :
+        Keep only the frequent single item columns instead of the columns of
+        the last level. Candidates are counted from intersections of their
+        prefix, recomputed for `prefix_cache_size` prefixes at a time, which
+        trades some recomputation for a much smaller resident set on wide
+        levels.
+         (Default value = False)
+    prefix_cache_size: int :
+        Prefix intersections held at once with `low_memory`, also the number
+        of candidates counted at once unless a batch size is set.
+         (Default value = 1024)
+    profile: bool :
+        Collect `LevelStats` of every level of `fit` in `level_stats`. Stages
+        are timed and host memory is traced only if profiling is enabled.
+         (Default value = False)
+    callback: Optional[Callable[[LevelStats], None]] :
+        Called with the `LevelStats` of every level as soon as it is counted,
+        enables profiling.
+         (Default value = None)
+    top_k: Optional[int] :
+        Return only the `top_k` most frequent itemsets of at least
+        `min_length` items, with ties of the last support included. The
+        support threshold starts at `min_support` and is raised to the
+        `top_k`-th largest support found after every level, which prunes the
+        candidates of the following levels. Requires ``output="all"``.
+         (Default value = None)
+    trim_transactions: bool :
+        Before every level of `fit`, drop the transactions holding fewer
+        frequent itemsets of the last level than the size of the candidates,
+        as they cannot support any of them, and merge identical transactions
+        into one row weighted by their number. Later levels are counted on
+        the shrinking matrix with weighted supports.
+         (Default value = False)
+    deduplicate: bool :
+        Replace the transactions passed to `fit` by the unique ones weighted
+        by their number before anything is counted. Rows are grouped by a
+        128-bit hash of their items (see `pyapriori.utils.row_keys`), which
+        pays off on data with many repeated baskets.
+         (Default value = False)
+
+    Attributes
+    ----------
+    pruned_candidates: dict :
+        Number of candidates of every size `k` dropped by the Apriori subset
+        check in the last `fit`, before their support was counted.
+    level_stats: list :
+        `LevelStats` of every level of the last profiled `fit`.
+    support_threshold: int :
+        Absolute support threshold of the last fit, the final dynamic one
+        with `top_k`.
+    layouts: dict :
+        Layout the candidates of every size `k` were counted in by the last
+        `fit` with ``backend="auto"``.
+
+    """
+
+    def __init__(
+        self,
+        min_support: Union[int, float] = 2,
+        min_length: int = 2,
+        backend: str = "default",
+        itemset_format: str = "dense",
+        n_jobs: int = 1,
+        output: str = "all",
+        max_candidates_per_batch: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+        low_memory: bool = False,
+        prefix_cache_size: int = 1024,
+        profile: bool = False,
+        callback: Optional[Callable[[LevelStats], None]] = None,
+        top_k: Optional[int] = None,
+        trim_transactions: bool = False,
+        deduplicate: bool = False,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(
+                "Unknown backend {!r}, expected one of {}".format(backend, BACKENDS)
+            )
+        if itemset_format not in ITEMSET_FORMATS:
+            raise ValueError(
+                "Unknown itemset_format {!r}, expected one of {}".format(
+                    itemset_format, ITEMSET_FORMATS
+                )
+            )
+        if output not in OUTPUTS:
+            raise ValueError(
+                "Unknown output {!r}, expected one of {}".format(output, OUTPUTS)
+            )
+        if top_k is not None and (top_k < 1 or output != "all"):
+            raise ValueError('top_k must be positive and needs output="all"')
         self.min_support = min_support
         self.min_length = min_length
+        self.backend = backend
+        self.itemset_format = itemset_format
+        self.n_jobs = n_jobs
+        self.output = output
+        self.max_candidates_per_batch = max_candidates_per_batch
+        self.memory_budget = memory_budget
+        self.low_memory = low_memory
+        self.prefix_cache_size = prefix_cache_size
+        self.profile = profile
+        self.callback = callback
+        self.top_k = top_k
+        self.trim_transactions = trim_transactions
+        self.deduplicate = deduplicate
+        self.pruned_candidates = {}
+        self.level_stats = []
+        self.support_threshold = None
+        self.layouts = {}
 
-    def fit(self, data: Data) -> tuple:
+    def fit(self, data: Data, weights: Optional[MultiDimensionalArray] = None) -> tuple:
         """
 
         Parameters
         ----------
         data: Data :
-
+            Transaction matrix, a one-hot pandas DataFrame or an Arrow list
+            column (see `pyapriori.utils.to_matrix`).
+        weights: Optional[MultiDimensionalArray] :
+            Non-negative integer number of occurrences of every transaction.
+            Supports are sums of weights and a fractional `min_support` is
+            relative to the total weight. ``None`` counts every row once.
+             (Default value = None)
 
         Returns
         -------
+        tuple
+            ``(itemsets, support)``. With ``itemset_format="dense"`` the
+            itemsets are boolean rows as wide as `data`, with ``"ids"`` they
+            are an int32 array of sorted item ids right padded with -1. Both
+            are ``None`` if no itemset is frequent.
 
         """
+        data, labels = to_matrix(data)
         numpy_or_cupy = get_numpy_or_cupy(data)
+        n_transactions, n_items = data.shape
+        weights = check_weights(weights, n_transactions, numpy_or_cupy)
+        if weights is not None:
+            n_transactions = int(weights.sum())
+        min_support = absolute_support(self.min_support, n_transactions)
+        if self.deduplicate:
+            data, weights = deduplicate_transactions(as_transactions(data), weights)
 
-        candidates, candidates_support, data = frequent_single_itemsets(
-            data, self.min_support
+        items, candidates_support, data = frequent_single_itemsets(
+            data,
+            min_support,
+            itemset_format="ids",
+            n_jobs=self.n_jobs,
+            weights=weights,
         )
+        items = items.ravel()
+        if self.backend == "bitset":
+            data = to_bitset(data)
+        # Candidates are kept as positions of their items in the reduced data
+        candidates = numpy_or_cupy.arange(
+            len(items), dtype=numpy_or_cupy.int32
+        ).reshape(-1, 1)
+        self.pruned_candidates = {}
+        self.layouts = {}
+        profiler = None
+        if self.profile or self.callback is not None:
+            profiler = LevelProfiler(numpy_or_cupy, self.callback)
+        top_support = numpy_or_cupy.zeros(0, dtype=numpy_or_cupy.int64)
         k = 2
         multiplier_mask_left = None
-        result = None
-        result_support = None
-        if self.min_length < 2:
-            result = candidates
-            result_support = candidates_support
+        result = []
+        result_support = []
+        try:
+            while candidates.size > 0:
+                top_support, min_support, keep = self._raise_threshold(
+                    top_support, min_support, candidates, candidates_support
+                )
+                if keep is not None:
+                    candidates = candidates[keep]
+                    candidates_support = candidates_support[keep]
+                    if multiplier_mask_left is not None:
+                        multiplier_mask_left = multiplier_mask_left[keep]
+                    if not self.low_memory:
+                        data = data[:, keep]
+                if profiler is not None:
+                    profiler.start_level(
+                        k,
+                        float(candidates_support.sum())
+                        / max(n_transactions * len(candidates), 1),
+                    )
+                with profile_stage(profiler, "generate_candidates"):
+                    multiplier_mask_left, multiplier_mask_right = generate_candidates(
+                        candidates, multiplier_mask_left
+                    )
+                    n_generated = len(multiplier_mask_left)
+                    multiplier_mask_left, multiplier_mask_right = prune_candidates(
+                        candidates, multiplier_mask_left, multiplier_mask_right
+                    )
+                self.pruned_candidates[k] = n_generated - len(multiplier_mask_left)
+                if len(multiplier_mask_left) == 0:
+                    if profiler is not None:
+                        profiler.end_level(n_generated, self.pruned_candidates[k], 0)
+                    break
+                if self.trim_transactions and (k == 2 or not self.low_memory):
+                    with profile_stage(profiler, "trim"):
+                        data, weights = self._trim(
+                            data,
+                            weights,
+                            candidates_support,
+                            multiplier_mask_left,
+                            multiplier_mask_right,
+                            k,
+                        )
+                if self.backend == "auto" and not (self.low_memory and self.layouts):
+                    with profile_stage(profiler, "layout"):
+                        data = self._switch_layout(
+                            data,
+                            candidates_support,
+                            multiplier_mask_left,
+                            multiplier_mask_right,
+                            weights,
+                        )
+                    self.layouts[k] = data_layout(data)
+                previous, previous_support = candidates, candidates_support
+                if self.low_memory:
+                    (
+                        candidates,
+                        candidates_support,
+                        multiplier_mask_left,
+                    ) = self._prefix_support_set(
+                        previous,
+                        data,
+                        multiplier_mask_left,
+                        multiplier_mask_right,
+                        min_support,
+                        profiler,
+                        weights,
+                    )
+                else:
+                    (
+                        candidates,
+                        candidates_support,
+                        multiplier_mask_left,
+                        data,
+                    ) = batched_support_set(
+                        previous,
+                        data,
+                        multiplier_mask_left,
+                        multiplier_mask_right,
+                        min_support,
+                        self._batch_size(data),
+                        self.n_jobs,
+                        profiler,
+                        weights,
+                    )
+                if profiler is not None:
+                    profiler.end_level(
+                        n_generated, self.pruned_candidates[k], len(candidates)
+                    )
+                self._collect_level(
+                    result,
+                    result_support,
+                    previous,
+                    previous_support,
+                    candidates,
+                    candidates_support,
+                )
+                k += 1
+        finally:
+            if profiler is not None:
+                profiler.close()
+        self._collect_level(result, result_support, candidates, candidates_support)
+        self.level_stats = profiler.levels if profiler is not None else []
+        self.support_threshold = self._select_top_k(result, result_support, min_support)
+        return format_itemsets(
+            result, result_support, items, n_items, self.itemset_format, labels
+        )
+
+    def fit_stream(
+        self, chunks: Union[Iterable[Data], Callable[[], Iterable[Data]]]
+    ) -> tuple:
+        """Fit on transactions split into row chunks
+
+        The chunks are scanned once per level and only one chunk is held in
+        memory at a time. Supports of the candidates are summed over the
+        chunks, so the result equals `fit` on the stacked chunks. With
+        `max_candidates_per_batch` or `memory_budget` the candidates are
+        counted on a chunk in slices.
+
+        Parameters
+        ----------
+        chunks: Union[Iterable[Data], Callable[[], Iterable[Data]]] :
+            Re-iterable collection of transaction matrices or paths to FIMI
+            ``.dat`` files, or a callable returning a new iterator over them
+            (for example ``lambda: iter_fimi(path, chunk_size)``). Chunks may
+            have fewer columns than the widest chunk.
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)`` as returned by `fit`.
+
+        """
+        # Level 1
+        columns_support = None
+        n_transactions = 0
+        for chunk in iter_chunks(chunks):
+            n_transactions += chunk.shape[0]
+            numpy_or_cupy = get_numpy_or_cupy(chunk)
+            chunk_support = get_support(
+                as_transactions(chunk), numpy_or_cupy, self.n_jobs
+            )
+            if columns_support is None:
+                columns_support = chunk_support
+                continue
+            width = max(len(columns_support), len(chunk_support))
+            columns_support = numpy_or_cupy.pad(
+                columns_support, (0, width - len(columns_support))
+            ) + numpy_or_cupy.pad(chunk_support, (0, width - len(chunk_support)))
+        if columns_support is None:
+            return None, None
+        n_items = len(columns_support)
+        min_support = absolute_support(self.min_support, n_transactions)
+
+        items, candidates_support = frequent_items(columns_support, min_support)
+        candidates = numpy_or_cupy.arange(
+            len(items), dtype=numpy_or_cupy.int32
+        ).reshape(-1, 1)
+        self.pruned_candidates = {}
+        top_support = numpy_or_cupy.zeros(0, dtype=numpy_or_cupy.int64)
+        k = 2
+        multiplier_mask_left = None
+        result = []
+        result_support = []
         while candidates.size > 0:
+            top_support, min_support, keep = self._raise_threshold(
+                top_support, min_support, candidates, candidates_support
+            )
+            if keep is not None:
+                candidates = candidates[keep]
+                candidates_support = candidates_support[keep]
+                if multiplier_mask_left is not None:
+                    multiplier_mask_left = multiplier_mask_left[keep]
             multiplier_mask_left, multiplier_mask_right = generate_candidates(
                 candidates, multiplier_mask_left
             )
+            n_generated = len(multiplier_mask_left)
+            multiplier_mask_left, multiplier_mask_right = prune_candidates(
+                candidates, multiplier_mask_left, multiplier_mask_right
+            )
+            self.pruned_candidates[k] = n_generated - len(multiplier_mask_left)
             if len(multiplier_mask_left) == 0:
                 break
-            data, candidates_support = itemsets_support(
-                data, multiplier_mask_left, multiplier_mask_right
+            previous, previous_support = candidates, candidates_support
+            candidates = join_candidates(
+                previous, multiplier_mask_left, multiplier_mask_right
             )
-            (
-                candidates,
-                candidates_support,
-                multiplier_mask_left,
-                data,
-            ) = min_support_set(
+            candidates_support = 0
+            for chunk in iter_chunks(chunks):
+                data = as_transactions(align_columns(chunk, n_items))[:, items]
+                if self.backend == "bitset":
+                    data = to_bitset(data)
+                candidates_support = candidates_support + count_itemsets(
+                    data, candidates, self.n_jobs, batch_size=self._batch_size(data)
+                )
+            over_support_mask = candidates_support >= min_support
+            candidates = candidates[over_support_mask]
+            candidates_support = candidates_support[over_support_mask]
+            multiplier_mask_left = multiplier_mask_left[over_support_mask]
+            self._collect_level(
+                result,
+                result_support,
+                previous,
+                previous_support,
                 candidates,
                 candidates_support,
+            )
+            k += 1
+        self._collect_level(result, result_support, candidates, candidates_support)
+        self.support_threshold = self._select_top_k(result, result_support, min_support)
+        return format_itemsets(
+            result, result_support, items, n_items, self.itemset_format
+        )
+
+    def _prefix_support_set(
+        self,
+        previous_candidates: MultiDimensionalArray,
+        data: Data,
+        multiplier_mask_left: MultiDimensionalArray,
+        multiplier_mask_right: MultiDimensionalArray,
+        min_support: int,
+        profiler: Optional[LevelProfiler] = None,
+        weights: Optional[MultiDimensionalArray] = None,
+    ) -> tuple:
+        """Frequent candidates of the next level counted by `prefix_support`
+
+        Returns
+        -------
+        tuple
+            ``(candidates, support, multiplier_mask_left)`` of the frequent
+            candidates.
+
+        """
+        batch_size = self._batch_size(data)
+        with profile_stage(profiler, "itemsets_support"):
+            candidates_support = prefix_support(
                 data,
+                previous_candidates,
                 multiplier_mask_left,
                 multiplier_mask_right,
-                self.min_support,
+                batch_size or self.prefix_cache_size,
+                self.n_jobs,
+                weights,
             )
-            if k >= self.min_length:
-                if result is not None:
-                    result = numpy_or_cupy.concatenate((result, candidates), axis=0)
-                    result_support = numpy_or_cupy.concatenate(
-                        (result_support, candidates_support), axis=0
-                    )
-                else:
-                    result = candidates
-                    result_support = candidates_support
-            k += 1
-        return result, result_support
+        with profile_stage(profiler, "min_support_set"):
+            over_support_mask = candidates_support >= min_support
+            multiplier_mask_left = multiplier_mask_left[over_support_mask]
+            candidates = join_candidates(
+                previous_candidates,
+                multiplier_mask_left,
+                multiplier_mask_right[over_support_mask],
+            )
+        return (
+            candidates,
+            candidates_support[over_support_mask],
+            multiplier_mask_left,
+        )
+
+    def _switch_layout(
+        self,
+        data: Data,
+        columns_support: MultiDimensionalArray,
+        multiplier_mask_left: MultiDimensionalArray,
+        multiplier_mask_right: MultiDimensionalArray,
+        weights: Optional[MultiDimensionalArray] = None,
+    ) -> Data:
+        """`data` in the layout `choose_layout` picks for the next level
+
+        The input layout is normalized to a column oriented one on the first
+        level, even if it is kept. Unless levels are counted in batches, a
+        layout needing more memory for the level than the current one is
+        not picked.
+
+        """
+        layout = data_layout(data)
+        columns_support, weight_bits = _stored_support(columns_support, weights)
+        next_layout = choose_layout(
+            layout,
+            data.shape[0],
+            columns_support,
+            multiplier_mask_left,
+            multiplier_mask_right,
+            keep_memory=self._batch_size(data) is None,
+            weight_bits=weight_bits,
+        )
+        if next_layout != layout or not self.layouts:
+            data = to_layout(data, next_layout)
+        return data
+
+    def _trim(
+        self,
+        data: Data,
+        weights: Optional[MultiDimensionalArray],
+        columns_support: MultiDimensionalArray,
+        multiplier_mask_left: MultiDimensionalArray,
+        multiplier_mask_right: MultiDimensionalArray,
+        k: int,
+    ) -> tuple:
+        """`trim_transactions` before counting the candidates of size `k`
+
+        Identical transactions are merged once, on the frequent items before
+        the second level, as transactions with the same items stay identical
+        on every later level. Later levels only drop short transactions, and
+        only if `trim_pays_off`.
+
+        Returns
+        -------
+        tuple
+            ``(data, weights)``
+
+        """
+        if k > 2:
+            stored_support, weight_bits = _stored_support(columns_support, weights)
+            if not trim_pays_off(
+                data_layout(data),
+                data.shape[0],
+                stored_support,
+                multiplier_mask_left,
+                multiplier_mask_right,
+                weight_bits,
+            ):
+                return data, weights
+        return trim_transactions(data, weights, k, merge=k == 2)
+
+    def _raise_threshold(
+        self,
+        top_support: MultiDimensionalArray,
+        min_support: int,
+        level: MultiDimensionalArray,
+        level_support: MultiDimensionalArray,
+    ) -> tuple:
+        """Raise `min_support` to the `top_k`-th largest support found so far
+
+        Parameters
+        ----------
+        top_support: MultiDimensionalArray :
+            Largest supports of the previous levels.
+        min_support: int :
+
+        level: MultiDimensionalArray :
+            Frequent itemsets of the last counted level.
+        level_support: MultiDimensionalArray :
+
+
+        Returns
+        -------
+        tuple
+            ``(top_support, min_support, keep)``, `keep` are the indices of
+            the itemsets of `level` reaching the new threshold or ``None`` if
+            all of them do.
+
+        """
+        if self.top_k is None:
+            return top_support, min_support, None
+        if level.shape[1] >= self.min_length:
+            top_support, threshold = top_k_threshold(
+                top_support, level_support, self.top_k
+            )
+            min_support = max(min_support, threshold)
+        over_support_mask = level_support >= min_support
+        if bool(over_support_mask.all()):
+            return top_support, min_support, None
+        numpy_or_cupy = get_numpy_or_cupy(level_support)
+        return top_support, min_support, numpy_or_cupy.flatnonzero(over_support_mask)
+
+    def _select_top_k(
+        self, result: list, result_support: list, min_support: int
+    ) -> int:
+        """Keep the `top_k` most frequent itemsets of `result` in place
+
+        Levels were collected while the threshold was still rising, so the
+        final threshold is taken from all of them.
+
+        Returns
+        -------
+        int
+            Final support threshold.
+
+        """
+        if self.top_k is None or not result:
+            return min_support
+        numpy_or_cupy = get_numpy_or_cupy(result_support[0])
+        _, threshold = top_k_threshold(
+            result_support[0][:0],
+            numpy_or_cupy.concatenate(result_support),
+            self.top_k,
+        )
+        min_support = max(min_support, threshold)
+        levels = []
+        for level, level_support in zip(result, result_support):
+            over_support_mask = level_support >= min_support
+            if bool(over_support_mask.any()):
+                levels.append(
+                    (level[over_support_mask], level_support[over_support_mask])
+                )
+        result[:] = [level for level, _ in levels]
+        result_support[:] = [level_support for _, level_support in levels]
+        return min_support
+
+    def _batch_size(self, data: Data) -> Optional[int]:
+        """Number of candidates counted at once on `data`"""
+        batch_sizes = []
+        if self.max_candidates_per_batch is not None:
+            batch_sizes.append(self.max_candidates_per_batch)
+        if self.memory_budget is not None:
+            batch_sizes.append(self.memory_budget // (3 * column_bytes(data)))
+        if not batch_sizes:
+            return None
+        return max(1, min(batch_sizes))
+
+    def _collect_level(
+        self,
+        result: list,
+        result_support: list,
+        level: MultiDimensionalArray,
+        level_support: MultiDimensionalArray,
+        next_level: Optional[MultiDimensionalArray] = None,
+        next_level_support: Optional[MultiDimensionalArray] = None,
+    ):
+        """Append a finished level to the result
+
+        Parameters
+        ----------
+        result: list :
+
+        result_support: list :
+
+        level: MultiDimensionalArray :
+            Frequent itemsets of size `k`.
+        level_support: MultiDimensionalArray :
+
+        next_level: Optional[MultiDimensionalArray] :
+            Frequent itemsets of size ``k + 1``, ``None`` if there are none.
+             (Default value = None)
+        next_level_support: Optional[MultiDimensionalArray] :
+             (Default value = None)
+
+        """
+        if level.shape[1] < self.min_length or level.size == 0:
+            return
+        if self.output != "all" and next_level is not None:
+            keep = ~covered_itemsets(
+                level,
+                level_support,
+                next_level,
+                next_level_support,
+                same_support=self.output == "closed",
+            )
+            level = level[keep]
+            level_support = level_support[keep]
+        result.append(level)
+        result_support.append(level_support)
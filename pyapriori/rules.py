@@ -0,0 +1,292 @@
+"""Association rules derived from frequent itemsets."""
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from pyapriori.utils.itemsets import FrequentItemsets
+from pyapriori.utils.utils import (
+    MultiDimensionalArray,
+    generate_candidates,
+    get_numpy_or_cupy,
+    itemsets_to_dense,
+    itemsets_to_ids,
+    join_candidates,
+    match_itemsets,
+    prune_candidates,
+)
+
+# Itemsets whose rules are evaluated together by default
+BATCH_SIZE = 4096
+
+
+class Rules(NamedTuple):
+    """Batch of association rules ``antecedent -> consequent``
+
+    Attributes
+    ----------
+    antecedents: MultiDimensionalArray :
+        Antecedents in the format of the itemsets passed in, dense boolean
+        rows or sorted item ids right padded with -1.
+    consequents: MultiDimensionalArray :
+        Consequents in the same format as `antecedents`.
+    support: MultiDimensionalArray :
+        Number of transactions containing the antecedent and the consequent.
+    confidence: MultiDimensionalArray :
+        ``support(A u C) / support(A)``
+    lift: MultiDimensionalArray :
+        ``confidence / P(C)``
+    leverage: MultiDimensionalArray :
+        ``P(A u C) - P(A) * P(C)``
+    conviction: MultiDimensionalArray :
+        ``(1 - P(C)) / (1 - confidence)``, ``inf`` for exact rules.
+
+    """
+
+    antecedents: MultiDimensionalArray
+    consequents: MultiDimensionalArray
+    support: MultiDimensionalArray
+    confidence: MultiDimensionalArray
+    lift: MultiDimensionalArray
+    leverage: MultiDimensionalArray
+    conviction: MultiDimensionalArray
+
+
+def _split_rules(
+    batch_itemsets: MultiDimensionalArray, consequent_ids: MultiDimensionalArray
+) -> Tuple[MultiDimensionalArray, MultiDimensionalArray, MultiDimensionalArray]:
+    """Antecedents and consequents of the encoded consequent positions
+
+    Parameters
+    ----------
+    batch_itemsets: MultiDimensionalArray :
+        ``(n_itemsets, length)`` item ids of the itemsets of a batch.
+    consequent_ids: MultiDimensionalArray :
+        ``(n_rules, size)`` ascending ``row * length + position`` of the
+        consequent items in `batch_itemsets`.
+
+    Returns
+    -------
+    tuple
+        ``(rows, antecedents, consequents)`` with the row of every rule in
+        `batch_itemsets` and the item ids of both sides.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(batch_itemsets)
+    length = batch_itemsets.shape[1]
+    size = consequent_ids.shape[1]
+    rows = consequent_ids[:, 0] // length
+    consequent_columns = consequent_ids % length
+    in_antecedent = numpy_or_cupy.ones((len(rows), length), dtype=bool)
+    rules = numpy_or_cupy.arange(len(rows)).reshape(-1, 1)
+    in_antecedent[rules, consequent_columns] = False
+    antecedent_columns = numpy_or_cupy.nonzero(in_antecedent)[1].reshape(
+        -1, length - size
+    )
+    batch_rows = rows.reshape(-1, 1)
+    return (
+        rows,
+        batch_itemsets[batch_rows, antecedent_columns],
+        batch_itemsets[batch_rows, consequent_columns],
+    )
+
+
+def _subsets_support(
+    index: Dict[int, Tuple[MultiDimensionalArray, MultiDimensionalArray]],
+    subsets: MultiDimensionalArray,
+) -> MultiDimensionalArray:
+    """Look up support of `subsets` in the sorted itemsets of their length"""
+    reference, reference_support = index.get(subsets.shape[1], (None, None))
+    matches = None
+    if reference is not None:
+        matches = match_itemsets(
+            reference, subsets.astype(reference.dtype), reference_sorted=True
+        )
+    if matches is None or bool((matches < 0).any()):
+        raise ValueError(
+            "Subsets of the itemsets are missing, rules need all frequent "
+            "itemsets (fit with min_length=1 and output='all')"
+        )
+    return reference_support[matches]
+
+
+def _format_rules(
+    antecedents: MultiDimensionalArray,
+    consequents: MultiDimensionalArray,
+    support: MultiDimensionalArray,
+    antecedent_support: MultiDimensionalArray,
+    consequent_support: MultiDimensionalArray,
+    n_transactions: int,
+    n_items: Optional[int],
+    width: int,
+) -> Rules:
+    """Compute the rule metrics and convert both sides to the output format"""
+    numpy_or_cupy = get_numpy_or_cupy(support)
+    confidence = support / antecedent_support
+    consequent_probability = consequent_support / n_transactions
+    lift = confidence / consequent_probability
+    leverage = (support - antecedent_support * consequent_probability) / n_transactions
+    inexact = confidence < 1
+    conviction = numpy_or_cupy.where(
+        inexact,
+        (1 - consequent_probability) / numpy_or_cupy.where(inexact, 1 - confidence, 1),
+        numpy_or_cupy.inf,
+    )
+    sides = []
+    for side in (antecedents, consequents):
+        if n_items is None:
+            padded = numpy_or_cupy.full(
+                (len(side), width), -1, dtype=numpy_or_cupy.int32
+            )
+            side_width = side.shape[1]
+            padded[:, :side_width] = side
+            sides.append(padded)
+        else:
+            sides.append(itemsets_to_dense(side, n_items))
+    return Rules(sides[0], sides[1], support, confidence, lift, leverage, conviction)
+
+
+def iter_association_rules(
+    itemsets: Optional[MultiDimensionalArray],
+    support: Optional[MultiDimensionalArray],
+    n_transactions: int,
+    min_confidence: float = 0.0,
+    batch_size: Optional[int] = BATCH_SIZE,
+) -> Iterator[Rules]:
+    """Generate association rules in batches
+
+    Support of the antecedents and consequents is looked up in a sorted
+    index of `itemsets`, all rules of a batch of itemsets with the same
+    consequent size are evaluated at once. Confidence is anti-monotone in
+    the consequent, so the consequents of a size are joined from the ones
+    one item smaller that passed `min_confidence` for the same itemset, and
+    a joined consequent is only tried if all its subsets passed.
+
+    Parameters
+    ----------
+    itemsets: Optional[MultiDimensionalArray] :
+        Itemsets returned by `fit` in the ``"dense"``, ``"ids"`` or
+        ``"compact"`` format, the sides of compact itemsets are ids.
+        All subsets of the itemsets must be present, fit with
+        ``min_length=1`` and ``output="all"``.
+    support: Optional[MultiDimensionalArray] :
+        Support returned by `fit`.
+    n_transactions: int :
+        Number of transactions the itemsets were mined from.
+    min_confidence: float :
+         (Default value = 0.0)
+    batch_size: Optional[int] :
+        Maximal number of itemsets whose rules are evaluated together,
+        ``None`` evaluates all itemsets of the same length together.
+         (Default value = BATCH_SIZE)
+
+    Yields
+    ------
+    Rules
+        Rules of a batch of itemsets with the same consequent size. Sides
+        in the ``"ids"`` format are padded to the longest possible side.
+
+    """
+    if itemsets is None or len(itemsets) == 0:
+        return
+    if isinstance(itemsets, FrequentItemsets):
+        itemsets = itemsets.to_ids()
+    numpy_or_cupy = get_numpy_or_cupy(itemsets)
+    support = numpy_or_cupy.asarray(support)
+    n_items = None
+    if itemsets.dtype == bool:
+        n_items = itemsets.shape[1]
+        itemsets = itemsets_to_ids(itemsets)
+    itemsets = itemsets.astype(numpy_or_cupy.int32)
+    width = itemsets.shape[1]
+    lengths = (itemsets >= 0).sum(axis=1)
+    # Sorted itemsets of every length, a lookup only ranks the ones of the
+    # length of its subsets
+    order = numpy_or_cupy.lexsort(itemsets.T[::-1])
+    sorted_itemsets = itemsets[order]
+    sorted_lengths = lengths[order]
+    index = {}
+    for length in range(1, width + 1):
+        mask = sorted_lengths == length
+        if bool(mask.any()):
+            index[length] = (sorted_itemsets[mask, :length], support[order][mask])
+
+    for length in range(2, width + 1):
+        rows = numpy_or_cupy.flatnonzero(lengths == length)
+        if len(rows) == 0:
+            continue
+        step = batch_size or len(rows)
+        for start in range(0, len(rows), step):
+            end = start + step
+            batch = rows[start:end]
+            batch_itemsets = itemsets[batch, :length]
+            batch_support = support[batch]
+            # Consequent items are encoded as ``row * length + position``,
+            # the consequents of every itemset form a sorted run and are
+            # joined level-wise like candidate itemsets.
+            consequent_ids = numpy_or_cupy.arange(
+                len(batch) * length, dtype=numpy_or_cupy.int64
+            ).reshape(-1, 1)
+            groups = consequent_ids[:, 0] // length
+            while len(consequent_ids) > 0:
+                rule_rows, antecedents, consequents = _split_rules(
+                    batch_itemsets, consequent_ids
+                )
+                rules_support = batch_support[rule_rows]
+                antecedent_support = _subsets_support(index, antecedents)
+                keep = rules_support / antecedent_support >= min_confidence
+                if bool(keep.any()):
+                    consequents = consequents[keep]
+                    yield _format_rules(
+                        antecedents[keep],
+                        consequents,
+                        rules_support[keep],
+                        antecedent_support[keep],
+                        _subsets_support(index, consequents),
+                        n_transactions,
+                        n_items,
+                        width - 1,
+                    )
+                if consequent_ids.shape[1] + 1 >= length:
+                    break
+                consequent_ids = consequent_ids[keep]
+                multiplier_mask_left, multiplier_mask_right = prune_candidates(
+                    consequent_ids,
+                    *generate_candidates(consequent_ids, groups[keep]),
+                )
+                consequent_ids = join_candidates(
+                    consequent_ids, multiplier_mask_left, multiplier_mask_right
+                )
+                groups = multiplier_mask_left
+
+
+def association_rules(
+    itemsets: Optional[MultiDimensionalArray],
+    support: Optional[MultiDimensionalArray],
+    n_transactions: int,
+    min_confidence: float = 0.0,
+) -> Optional[Rules]:
+    """Generate all association rules of the frequent itemsets
+
+    Parameters
+    ----------
+    itemsets: Optional[MultiDimensionalArray] :
+        Itemsets returned by `fit`, see `iter_association_rules`.
+    support: Optional[MultiDimensionalArray] :
+        Support returned by `fit`.
+    n_transactions: int :
+        Number of transactions the itemsets were mined from.
+    min_confidence: float :
+         (Default value = 0.0)
+
+    Returns
+    -------
+    Optional[Rules]
+        Batches of `iter_association_rules` concatenated, ``None`` if no rule
+        reaches `min_confidence`.
+
+    """
+    batches = list(
+        iter_association_rules(itemsets, support, n_transactions, min_confidence)
+    )
+    if not batches:
+        return None
+    numpy_or_cupy = get_numpy_or_cupy(batches[0].support)
+    return Rules(*(numpy_or_cupy.concatenate(field) for field in zip(*batches)))
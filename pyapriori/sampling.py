@@ -0,0 +1,457 @@
+"""Sampling (Toivonen) Apriori module."""
+import math
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from pyapriori.pyapriori import (
+    BACKENDS,
+    ITEMSET_FORMATS,
+    PyApriori,
+    _stored_support,
+)
+from pyapriori.utils.adapters import to_matrix
+from pyapriori.utils.utils import (
+    Data,
+    MultiDimensionalArray,
+    absolute_support,
+    as_transactions,
+    choose_layout,
+    column_bytes,
+    data_layout,
+    format_itemsets,
+    generate_candidates,
+    get_numpy_or_cupy,
+    get_support,
+    group_itemsets,
+    itemsets_support,
+    join_candidates,
+    match_itemsets,
+    prefix_support,
+    prune_candidates,
+    to_layout,
+)
+from pyapriori.utils.weights import check_weights, take_rows
+
+
+def hoeffding_sample_size(epsilon: float, delta: float) -> int:
+    """Rows to sample so that a frequency is estimated within `epsilon`
+
+    By the Hoeffding bound the frequency of an itemset in
+    ``ceil(ln(2 / delta) / (2 * epsilon ** 2))`` rows drawn with replacement
+    differs from its frequency in all rows by more than `epsilon` with
+    probability at most `delta`.
+
+    Parameters
+    ----------
+    epsilon: float :
+        Absolute error of the frequency, between 0 and 1.
+    delta: float :
+        Probability of a larger error, between 0 and 1.
+
+    Returns
+    -------
+    int
+
+    """
+    if not 0 < epsilon < 1 or not 0 < delta < 1:
+        raise ValueError(
+            "epsilon and delta must be between 0 and 1, got {} and {}".format(
+                epsilon, delta
+            )
+        )
+    return math.ceil(math.log(2 / delta) / (2 * epsilon**2))
+
+
+def _split_levels(
+    itemsets: Optional[MultiDimensionalArray],
+    support: Optional[MultiDimensionalArray],
+) -> Dict[int, Tuple[MultiDimensionalArray, MultiDimensionalArray]]:
+    """Itemsets in the ``"ids"`` format grouped by length
+
+    Returns
+    -------
+    dict
+        ``(itemsets, support)`` of every length, itemsets as ``(n_itemsets,
+        length)`` item ids in lexicographic order.
+
+    """
+    if itemsets is None:
+        return {}
+    numpy_or_cupy = get_numpy_or_cupy(itemsets)
+    lengths = (itemsets >= 0).sum(axis=1)
+    levels = {}
+    for length in range(1, itemsets.shape[1] + 1):
+        mask = lengths == length
+        level = itemsets[mask, :length]
+        order = numpy_or_cupy.lexsort(level.T[::-1])
+        levels[length] = (level[order], support[mask][order])
+    return levels
+
+
+class PySamplingApriori:
+    """Approximate Toivonen sampling miner with the interface of `PyApriori`
+
+    A sample of `hoeffding_sample_size` rows is drawn with replacement, so
+    that the frequency of an itemset in the sample is within `epsilon` of its
+    frequency in all transactions with probability at least ``1 - delta``.
+    The sample is mined at `min_support` lowered by this error, so that the
+    itemsets found in the sample are very likely to contain every frequent
+    itemset.
+
+    Without `verify` the sample supports are scaled to the number of
+    transactions and the itemsets with an estimated support of at least
+    `min_support` are returned. With `verify` the itemsets found in the
+    sample and their negative border (the candidates joined from them that
+    were not found) are counted on all transactions. If no itemset of the
+    border is frequent, the frequent itemsets among the counted ones are
+    exactly the result of `PyApriori.fit`. Otherwise the sample missed a
+    frequent itemset, which happens with a probability of about `delta`,
+    and the transactions are mined with `PyApriori`.
+
+    Parameters
+    ----------
+    min_support: Union[int, float] :
+        Number of transactions, or a float between 0 and 1 giving the
+        fraction of the transactions.
+         (Default value = 2)
+    min_length: int :
+         (Default value = 2)
+    itemset_format: str :
+        Representation of the itemsets returned by `fit`, as in `PyApriori`.
+         (Default value = "dense")
+    epsilon: float :
+        Absolute error of the sample frequencies.
+         (Default value = 0.01)
+    delta: float :
+        Probability that a sample frequency misses by more than `epsilon`.
+         (Default value = 0.05)
+    verify: bool :
+        Count the itemsets of the sample and their negative border on all
+        transactions, which returns exact supports.
+         (Default value = False)
+    random_state: Optional[int] :
+        Seed of the sample.
+         (Default value = None)
+    backend: str :
+        Backend of the `PyApriori` miners.
+         (Default value = "default")
+    n_jobs: int :
+        Number of threads counting support of host data.
+         (Default value = 1)
+    memory_budget: Optional[int] :
+        Memory budget of the `PyApriori` miners and of the verification,
+        see `PyApriori`.
+         (Default value = None)
+
+    Attributes
+    ----------
+    sample_size: int :
+        Number of rows drawn by the last `fit`, the number of transactions
+        if they are mined without sampling.
+    sample_min_support: int :
+        Lowered support threshold the sample of the last `fit` was mined
+        with.
+    exact_support: MultiDimensionalArray :
+        Boolean mask of the itemsets returned by the last `fit` whose
+        support was counted on all transactions, the others are estimates
+        from the sample.
+    support_error: float :
+        Bound of the error of the estimated supports of the last `fit` in
+        transactions, ``epsilon * n_transactions``, 0 if all are exact.
+    border_misses: int :
+        Frequent itemsets of the negative border found by the verification
+        of the last `fit`, a positive number means the transactions were
+        mined again with `PyApriori`.
+
+    """
+
+    def __init__(
+        self,
+        min_support: Union[int, float] = 2,
+        min_length: int = 2,
+        itemset_format: str = "dense",
+        epsilon: float = 0.01,
+        delta: float = 0.05,
+        verify: bool = False,
+        random_state: Optional[int] = None,
+        backend: str = "default",
+        n_jobs: int = 1,
+        memory_budget: Optional[int] = None,
+    ):
+        if itemset_format not in ITEMSET_FORMATS:
+            raise ValueError(
+                "Unknown itemset_format {!r}, expected one of {}".format(
+                    itemset_format, ITEMSET_FORMATS
+                )
+            )
+        if backend not in BACKENDS:
+            raise ValueError(
+                "Unknown backend {!r}, expected one of {}".format(backend, BACKENDS)
+            )
+        hoeffding_sample_size(epsilon, delta)
+        self.min_support = min_support
+        self.min_length = min_length
+        self.itemset_format = itemset_format
+        self.epsilon = epsilon
+        self.delta = delta
+        self.verify = verify
+        self.random_state = random_state
+        self.backend = backend
+        self.n_jobs = n_jobs
+        self.memory_budget = memory_budget
+        self.sample_size = None
+        self.sample_min_support = None
+        self.exact_support = None
+        self.support_error = None
+        self.border_misses = 0
+
+    def fit(self, data: Data, weights: Optional[MultiDimensionalArray] = None) -> tuple:
+        """
+
+        Parameters
+        ----------
+        data: Data :
+            Transactions in any input accepted by `PyApriori.fit`.
+        weights: Optional[MultiDimensionalArray] :
+            Number of occurrences of every transaction, as in `PyApriori.fit`.
+            Rows are sampled with probability proportional to their weight.
+             (Default value = None)
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)`` in the format of `PyApriori.fit`,
+            supports estimated from the sample are rounded to integers (see
+            `exact_support`). Itemsets are ordered by length, then by their
+            sorted item ids.
+
+        """
+        data, labels = to_matrix(data)
+        data = as_transactions(data)
+        numpy_or_cupy = get_numpy_or_cupy(data)
+        n_rows, n_items = data.shape
+        weights = check_weights(weights, n_rows, numpy_or_cupy)
+        n_transactions = n_rows if weights is None else int(weights.sum())
+        min_support = absolute_support(self.min_support, n_transactions)
+
+        self.border_misses = 0
+        self.sample_size = hoeffding_sample_size(self.epsilon, self.delta)
+        exact = True
+        if self.sample_size >= n_rows:
+            # The whole data is cheaper to mine than the sample
+            self.sample_size = n_rows
+            self.sample_min_support = min_support
+            blocks = self._exact(data, weights, min_support)
+        else:
+            levels = self._mine_sample(data, weights, n_transactions, min_support)
+            if self.verify:
+                blocks = self._verify(data, weights, levels, min_support)
+                if blocks is None:
+                    blocks = self._exact(data, weights, min_support)
+            else:
+                blocks = self._estimate(levels, n_transactions, min_support)
+                exact = False
+
+        items = numpy_or_cupy.arange(n_items, dtype=numpy_or_cupy.int32)
+        levels, levels_support = group_itemsets(blocks, items, self.min_length)
+        self.exact_support = numpy_or_cupy.full(
+            sum(len(level) for level in levels), exact, dtype=bool
+        )
+        self.support_error = 0.0 if exact else self.epsilon * n_transactions
+        return format_itemsets(
+            levels, levels_support, items, n_items, self.itemset_format, labels
+        )
+
+    def _apriori(self, min_support: int) -> PyApriori:
+        """Exact miner of all frequent itemsets as item ids"""
+        return PyApriori(
+            min_support,
+            1,
+            backend=self.backend,
+            itemset_format="ids",
+            n_jobs=self.n_jobs,
+            memory_budget=self.memory_budget,
+        )
+
+    def _exact(
+        self,
+        data: Data,
+        weights: Optional[MultiDimensionalArray],
+        min_support: int,
+    ) -> List[Tuple[MultiDimensionalArray, MultiDimensionalArray]]:
+        """Itemsets of `PyApriori.fit` as blocks of `group_itemsets`"""
+        itemsets, support = self._apriori(min_support).fit(data, weights=weights)
+        return list(_split_levels(itemsets, support).values())
+
+    def _mine_sample(
+        self,
+        data: Data,
+        weights: Optional[MultiDimensionalArray],
+        n_transactions: int,
+        min_support: int,
+    ) -> Dict[int, Tuple[MultiDimensionalArray, MultiDimensionalArray]]:
+        """Itemsets frequent in a sample at the lowered threshold"""
+        numpy_or_cupy = get_numpy_or_cupy(data)
+        probabilities = None
+        if weights is not None:
+            host_weights = weights.get() if hasattr(weights, "get") else weights
+            probabilities = host_weights / n_transactions
+        random_state = np.random.RandomState(self.random_state)
+        rows = random_state.choice(data.shape[0], self.sample_size, p=probabilities)
+        # Rows drawn several times are kept once, weighted by their draws
+        rows, draws = np.unique(rows, return_counts=True)
+        sample = take_rows(data, numpy_or_cupy.asarray(rows))
+
+        lowered = min_support / n_transactions - math.sqrt(
+            math.log(1 / self.delta) / (2 * self.sample_size)
+        )
+        self.sample_min_support = max(1, math.ceil(lowered * self.sample_size))
+        itemsets, support = self._apriori(self.sample_min_support).fit(
+            sample, weights=numpy_or_cupy.asarray(draws)
+        )
+        return _split_levels(itemsets, support)
+
+    def _estimate(
+        self,
+        levels: Dict[int, Tuple[MultiDimensionalArray, MultiDimensionalArray]],
+        n_transactions: int,
+        min_support: int,
+    ) -> List[Tuple[MultiDimensionalArray, MultiDimensionalArray]]:
+        """Itemsets of the sample with an estimated support over `min_support`"""
+        blocks = []
+        for itemsets, support in levels.values():
+            numpy_or_cupy = get_numpy_or_cupy(itemsets)
+            estimate = numpy_or_cupy.rint(
+                support * (n_transactions / self.sample_size)
+            ).astype(numpy_or_cupy.int64)
+            over_support_mask = estimate >= min_support
+            blocks.append((itemsets[over_support_mask], estimate[over_support_mask]))
+        return blocks
+
+    def _verify(
+        self,
+        data: Data,
+        weights: Optional[MultiDimensionalArray],
+        levels: Dict[int, Tuple[MultiDimensionalArray, MultiDimensionalArray]],
+        min_support: int,
+    ) -> Optional[List[Tuple[MultiDimensionalArray, MultiDimensionalArray]]]:
+        """Count the itemsets of the sample and their negative border
+
+        The candidates joined from the sample itemsets of size ``k - 1`` are
+        the sample itemsets of size `k` and the border of size `k`, so every
+        level is counted at once. The columns of the sample itemsets are
+        carried to the next level as in `PyApriori.fit`, with a
+        `memory_budget` they are recomputed from their prefixes as with
+        `low_memory`.
+
+        Returns
+        -------
+        Optional[list]
+            Frequent itemsets as blocks of `group_itemsets`, ``None`` if an
+            itemset of the border is frequent.
+
+        """
+        numpy_or_cupy = get_numpy_or_cupy(data)
+        cache_size = 1024
+        if self.memory_budget is not None:
+            cache_size = max(1, self.memory_budget // (3 * column_bytes(data)))
+        columns_support = get_support(data, numpy_or_cupy, self.n_jobs, weights)
+        frequent = numpy_or_cupy.flatnonzero(columns_support >= min_support)
+        empty = numpy_or_cupy.zeros((0, 1), dtype=numpy_or_cupy.int32)
+        level = levels.get(1, (empty, None))[0]
+        self.border_misses = len(frequent) - int(
+            numpy_or_cupy.isin(frequent, level.ravel()).sum()
+        )
+        if self.border_misses > 0:
+            return None
+        blocks = [(frequent.reshape(-1, 1), columns_support[frequent])]
+
+        k = 2
+        multiplier_mask_left = None
+        columns = None
+        while len(level) > 1:
+            multiplier_mask_left, multiplier_mask_right = generate_candidates(
+                level, multiplier_mask_left
+            )
+            multiplier_mask_left, multiplier_mask_right = prune_candidates(
+                level, multiplier_mask_left, multiplier_mask_right
+            )
+            if len(multiplier_mask_left) == 0:
+                break
+            if k == 2:
+                data = self._verification_layout(
+                    data,
+                    columns_support[level[:, 0]],
+                    multiplier_mask_left,
+                    multiplier_mask_right,
+                    weights,
+                )
+                if self.memory_budget is None:
+                    columns = data[:, level[:, 0]]
+            candidates = join_candidates(
+                level, multiplier_mask_left, multiplier_mask_right
+            )
+            if columns is None:
+                support = prefix_support(
+                    data,
+                    level,
+                    multiplier_mask_left,
+                    multiplier_mask_right,
+                    cache_size,
+                    self.n_jobs,
+                    weights,
+                )
+            else:
+                columns, support = itemsets_support(
+                    columns,
+                    multiplier_mask_left,
+                    multiplier_mask_right,
+                    self.n_jobs,
+                    weights,
+                )
+            sample_level = levels.get(k, (candidates[:0], None))[0]
+            in_sample = (
+                match_itemsets(sample_level, candidates, reference_sorted=True) >= 0
+            )
+            over_support_mask = support >= min_support
+            self.border_misses = int((over_support_mask & ~in_sample).sum())
+            if self.border_misses > 0:
+                return None
+            blocks.append((candidates[over_support_mask], support[over_support_mask]))
+            level = candidates[in_sample]
+            multiplier_mask_left = multiplier_mask_left[in_sample]
+            if columns is not None:
+                columns = columns[:, numpy_or_cupy.flatnonzero(in_sample)]
+            k += 1
+        return blocks
+
+    def _verification_layout(
+        self,
+        data: Data,
+        items_support: MultiDimensionalArray,
+        multiplier_mask_left: MultiDimensionalArray,
+        multiplier_mask_right: MultiDimensionalArray,
+        weights: Optional[MultiDimensionalArray],
+    ) -> Data:
+        """`data` in the layout the verification is counted in
+
+        The layout is chosen once for the candidates of size 2, as
+        `PyApriori` does with `low_memory`.
+
+        """
+        layout = data_layout(data)
+        if self.backend == "bitset":
+            layout = "bitset"
+        elif self.backend == "auto":
+            items_support, weight_bits = _stored_support(items_support, weights)
+            layout = choose_layout(
+                layout,
+                data.shape[0],
+                items_support,
+                multiplier_mask_left,
+                multiplier_mask_right,
+                keep_memory=self.memory_budget is None,
+                weight_bits=weight_bits,
+            )
+        return to_layout(data, layout)
@@ -4,5 +4,51 @@ from pyapriori.utils.utils import (
     itemsets_support,
     min_support_set,
     Data,
+    get_support,
+    to_bitset,
+    data_layout,
+    to_layout,
+    choose_layout,
+    trim_pays_off,
+    join_candidates,
+    itemsets_to_dense,
+    itemsets_to_ids,
+    pad_itemsets,
+    match_itemsets,
+    prune_candidates,
+    as_transactions,
+    frequent_items,
+    align_columns,
+    iter_chunks,
+    intersect_columns,
+    count_itemsets,
+    format_itemsets,
+    to_host_csr,
+    group_itemsets,
+    covered_itemsets,
+    column_bytes,
+    absolute_support,
+    top_k_threshold,
+    concatenate_columns,
+    batched_support_set,
+    prefix_support,
+)
+from pyapriori.utils.backend import (
     get_numpy_or_cupy,
+    is_sparse,
+    register_array_module,
+)
+from pyapriori.utils.bitset import BitsetMatrix
+from pyapriori.utils.itemsets import FrequentItemsets
+from pyapriori.utils.fimi import read_fimi, iter_fimi
+from pyapriori.utils.adapters import from_pandas, from_arrow, to_matrix
+from pyapriori.utils.profiling import LevelProfiler, LevelStats, profile_stage
+from pyapriori.utils.weights import (
+    weighted_support,
+    row_lengths,
+    row_keys,
+    take_rows,
+    trim_transactions,
+    deduplicate_transactions,
+    check_weights,
 )
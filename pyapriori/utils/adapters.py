@@ -0,0 +1,156 @@
+"""Adapters from pandas and Arrow baskets to transaction matrices.
+
+pandas and pyarrow are optional. Like the array module dispatch, an input
+is only checked against them if the caller already imported the library.
+"""
+
+import sys
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+
+
+def _is_instance(data: Any, module_name: str, *class_names: str) -> bool:
+    """Whether `data` is an instance of a class of an imported module"""
+    module = sys.modules.get(module_name)
+    return module is not None and isinstance(
+        data, tuple(getattr(module, name) for name in class_names)
+    )
+
+
+def from_pandas(frame: Any) -> Tuple[Any, np.ndarray]:
+    """Transaction matrix of a one-hot pandas DataFrame
+
+    Parameters
+    ----------
+    frame: pandas.DataFrame :
+        One column per item, truthy values mark the items of a row. Sparse
+        columns must have a falsy fill value.
+
+    Returns
+    -------
+    tuple
+        ``(data, labels)``. Sparse frames become a `csc_matrix` built from
+        the sparse index of every column, dense frames a boolean array, which
+        is a view of the frame if it is stored as one boolean block.
+        `labels` are the column names.
+
+    """
+    labels = np.asarray(frame.columns, dtype=object)
+    dtypes = frame.dtypes
+    sparse = [hasattr(dtype, "fill_value") for dtype in dtypes]
+    if not any(sparse):
+        return frame.to_numpy(dtype=bool, copy=False), labels
+    if not all(sparse):
+        raise ValueError("DataFrame mixes sparse and dense columns")
+
+    indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+    indices = []
+    for column, (_, values) in enumerate(frame.items()):
+        array = values.array
+        if array.fill_value:
+            raise ValueError(
+                "Sparse column {!r} has a truthy fill value".format(labels[column])
+            )
+        rows = array.sp_index.indices
+        set_values = array.sp_values.astype(bool, copy=False)
+        if not set_values.all():
+            rows = rows[set_values]
+        indices.append(rows)
+        indptr[column + 1] = indptr[column] + len(rows)
+    indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32)
+    data = csc_matrix(
+        (np.ones(len(indices), dtype=bool), indices, indptr),
+        shape=frame.shape,
+        copy=False,
+    )
+    data.has_sorted_indices = True
+    return data, labels
+
+
+def from_arrow(
+    baskets: Any, n_items: Optional[int] = None
+) -> Tuple[csr_matrix, Optional[np.ndarray]]:
+    """Transaction matrix of an Arrow list column
+
+    The list offsets and values are used as ``indptr`` and ``indices`` of
+    the CSR matrix without a copy when the column is a single chunk without
+    nulls or slicing offset and the items of every list are sorted and
+    distinct.
+
+    Parameters
+    ----------
+    baskets: pyarrow.ListArray :
+        ``list<int>`` column of item ids or a list column of any other item
+        type (for example strings), whose items are dictionary encoded. A
+        ``ChunkedArray`` is combined first.
+    n_items: Optional[int] :
+        Number of columns for integer items, defaults to the largest item id
+        plus one.
+         (Default value = None)
+
+    Returns
+    -------
+    tuple
+        ``(data, labels)``, `labels` is the item of every column for
+        dictionary encoded items, ``None`` for integer items.
+
+    """
+    import pyarrow as pa
+
+    if isinstance(baskets, pa.ChunkedArray):
+        baskets = baskets.combine_chunks()
+    if baskets.null_count > 0:
+        baskets = baskets.fill_null(pa.scalar([], type=baskets.type))
+    offsets = baskets.offsets.to_numpy()
+    values = baskets.values
+    first, last = int(offsets[0]), int(offsets[-1])
+    if first > 0 or last < len(values):
+        values = values.slice(first, last - first)
+        offsets = offsets - first
+
+    if values.null_count > 0:
+        raise ValueError("Baskets contain null items")
+    labels = None
+    if pa.types.is_integer(values.type):
+        indices = values.to_numpy()
+    else:
+        encoded = values.dictionary_encode()
+        indices = encoded.indices.to_numpy()
+        labels = encoded.dictionary.to_numpy(zero_copy_only=False)
+        n_items = len(labels)
+    if n_items is None:
+        n_items = int(indices.max()) + 1 if len(indices) > 0 else 0
+
+    data = csr_matrix(
+        (np.ones(len(indices), dtype=bool), indices, offsets),
+        shape=(len(baskets), n_items),
+        copy=False,
+    )
+    if not data.has_canonical_format:
+        data = data.copy()
+        data.sum_duplicates()
+    return data, labels
+
+
+def to_matrix(data: Any) -> Tuple[Any, Optional[np.ndarray]]:
+    """Convert pandas and Arrow baskets to a transaction matrix
+
+    Parameters
+    ----------
+    data: Any :
+        `Data`, a one-hot pandas DataFrame or an Arrow list column.
+
+    Returns
+    -------
+    tuple
+        ``(data, labels)``, `labels` name the columns of `data` or are
+        ``None`` if the input has no item names.
+
+    """
+    if _is_instance(data, "pandas", "DataFrame"):
+        return from_pandas(data)
+    if _is_instance(data, "pyarrow", "Array", "ChunkedArray"):
+        return from_arrow(data)
+    return data, None
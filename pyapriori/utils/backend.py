@@ -0,0 +1,78 @@
+"""Lazy dispatch between the numpy and cupy array modules.
+
+cupy is an optional dependency and importing it initializes CUDA, so it is
+never imported here. A cupy array can only exist once its owner imported
+cupy, so the dispatch only looks at modules already in ``sys.modules``.
+"""
+
+import sys
+from types import ModuleType
+from typing import Any, Callable, Dict
+
+import numpy as np
+from scipy.sparse import issparse
+
+from pyapriori.utils.bitset import BitsetMatrix
+
+# Array module name -> check whether an object is an array or sparse matrix
+# of that module, consulted only once the module has been imported
+ARRAY_MODULES: Dict[str, Callable[[Any], bool]] = {}
+
+
+def register_array_module(name: str, is_array: Callable[[Any], bool]):
+    """Register an array module with the numpy interface
+
+    Parameters
+    ----------
+    name: str :
+        Importable module name, for example ``"cupy"``.
+    is_array: Callable[[Any], bool] :
+        Returns whether an object belongs to the module. Called only after
+        the module has been imported.
+
+    """
+    ARRAY_MODULES[name] = is_array
+
+
+def _is_cupy_array(data: Any) -> bool:
+    """Whether `data` is a cupy array or cupy sparse matrix"""
+    if isinstance(data, sys.modules["cupy"].ndarray):
+        return True
+    cupy_sparse = sys.modules.get("cupyx.scipy.sparse")
+    return cupy_sparse is not None and cupy_sparse.issparse(data)
+
+
+register_array_module("cupy", _is_cupy_array)
+
+
+def get_numpy_or_cupy(data: Any) -> ModuleType:
+    """Array module owning `data`
+
+    Parameters
+    ----------
+    data: Data :
+        Array, sparse matrix or `BitsetMatrix`.
+
+    Returns
+    -------
+    ModuleType
+        numpy for host data, otherwise the registered module the data
+        belongs to.
+
+    """
+    if isinstance(data, BitsetMatrix):
+        data = data.words
+    if isinstance(data, np.ndarray) or issparse(data):
+        return np
+    for name, is_array in ARRAY_MODULES.items():
+        module = sys.modules.get(name)
+        if module is not None and is_array(data):
+            return module
+    return np
+
+
+def is_sparse(data: Any) -> bool:
+    """Whether `data` is a scipy or cupy sparse matrix"""
+    return issparse(data) or (
+        get_numpy_or_cupy(data) is not np and hasattr(data, "tocsr")
+    )
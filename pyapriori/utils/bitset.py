@@ -0,0 +1,153 @@
+"""Bit-packed vertical layout of the transaction matrix."""
+from types import ModuleType
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+from scipy.sparse import issparse
+
+if TYPE_CHECKING:
+    from pyapriori.utils.utils import Data, MultiDimensionalArray
+
+WORD_BYTES = 8
+
+# Number of set bits in every possible byte value
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(
+    words: "MultiDimensionalArray", numpy_or_cupy: ModuleType
+) -> "MultiDimensionalArray":
+    """Count set bits of every element of `words`
+
+    Parameters
+    ----------
+    words: MultiDimensionalArray :
+        Array of unsigned integers.
+    numpy_or_cupy: ModuleType :
+        Module that owns `words`.
+
+    Returns
+    -------
+    MultiDimensionalArray
+        Array of the same shape as `words` with the bit counts.
+
+    """
+    if hasattr(numpy_or_cupy, "bitwise_count"):
+        return numpy_or_cupy.bitwise_count(words)
+    table = numpy_or_cupy.asarray(_BYTE_POPCOUNT)
+    words_bytes = words.view(numpy_or_cupy.uint8).reshape(
+        words.shape + (words.itemsize,)
+    )
+    return table[words_bytes].sum(axis=-1, dtype=numpy_or_cupy.uint8)
+
+
+class BitsetMatrix:
+    """Transaction matrix stored as one packed uint64 tidset per column
+
+    Each row of `words` is the bitset of transactions containing the column,
+    so a column occupies ``ceil(n_rows / 64)`` words instead of `n_rows`
+    bytes. The class mimics the subset of the sparse matrix interface used by
+    the support counting functions: column selection with ``data[:, mask]``,
+    intersection with ``multiply``, support with ``sum(axis=0)`` and
+    unpacking with ``toarray``.
+
+    Parameters
+    ----------
+    words: MultiDimensionalArray :
+        ``(n_columns, n_words)`` uint64 array.
+    n_rows: int :
+        Number of transactions.
+
+    """
+
+    def __init__(self, words: "MultiDimensionalArray", n_rows: int):
+        self.words = words
+        self.n_rows = n_rows
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Shape of the unpacked matrix"""
+        return self.n_rows, self.words.shape[0]
+
+    def __getitem__(self, key: tuple) -> "BitsetMatrix":
+        rows, columns = key
+        if rows != slice(None):
+            raise IndexError("BitsetMatrix supports column selection only")
+        return BitsetMatrix(self.words[columns], self.n_rows)
+
+    def multiply(self, other: "BitsetMatrix") -> "BitsetMatrix":
+        """Intersect column tidsets with bitwise AND"""
+        return BitsetMatrix(self.words & other.words, self.n_rows)
+
+    def toarray(self) -> "MultiDimensionalArray":
+        """Unpack the tidsets into a Fortran ordered boolean matrix"""
+        from pyapriori.utils.backend import get_numpy_or_cupy
+
+        numpy_or_cupy = get_numpy_or_cupy(self.words)
+        bits = numpy_or_cupy.unpackbits(
+            self.words.view(numpy_or_cupy.uint8), axis=1, bitorder="little"
+        )
+        n_rows = self.n_rows
+        return bits[:, :n_rows].T.astype(numpy_or_cupy.bool_)
+
+    def sum(self, axis: int = 0) -> "MultiDimensionalArray":
+        """Count transactions of every column with popcount"""
+        if axis != 0:
+            raise ValueError("BitsetMatrix supports column sums only")
+        from pyapriori.utils.backend import get_numpy_or_cupy
+
+        numpy_or_cupy = get_numpy_or_cupy(self.words)
+        return popcount(self.words, numpy_or_cupy).sum(
+            axis=1, dtype=numpy_or_cupy.int64
+        )
+
+
+def _bytes_to_words(
+    column_bytes: "MultiDimensionalArray", n_rows: int, numpy_or_cupy: ModuleType
+) -> BitsetMatrix:
+    """Pad ``(n_columns, n_bytes)`` uint8 array and view it as uint64 words"""
+    n_columns, n_bytes = column_bytes.shape
+    n_words = -(-n_bytes // WORD_BYTES)
+    padded = numpy_or_cupy.zeros((n_columns, n_words * WORD_BYTES), numpy_or_cupy.uint8)
+    padded[:, :n_bytes] = column_bytes
+    return BitsetMatrix(padded.view(numpy_or_cupy.uint64), n_rows)
+
+
+def pack_columns(data: "Data", numpy_or_cupy: ModuleType) -> BitsetMatrix:
+    """Pack columns of a transaction matrix into uint64 bitsets
+
+    Parameters
+    ----------
+    data: Data :
+        Transaction matrix (numpy, scipy sparse, cupy or cupy sparse).
+    numpy_or_cupy: ModuleType :
+        Module that owns `data`.
+
+    Returns
+    -------
+    BitsetMatrix
+
+    """
+    n_rows, n_columns = data.shape
+    if issparse(data):
+        data = data.tocsc()
+        data.eliminate_zeros()
+        data.sum_duplicates()
+        n_bytes = -(-n_rows // 8)
+        columns = np.repeat(np.arange(n_columns, dtype=np.int64), np.diff(data.indptr))
+        rows = data.indices.astype(np.int64)
+        keys = columns * n_bytes + (rows >> 3)
+        values = np.left_shift(1, rows & 7).astype(np.uint8)
+        column_bytes = np.zeros((n_columns, n_bytes), dtype=np.uint8)
+        if keys.size > 0:
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            column_bytes.ravel()[keys[starts]] = np.bitwise_or.reduceat(values, starts)
+        return _bytes_to_words(column_bytes, n_rows, np)
+    if hasattr(data, "toarray"):  # cupy sparse
+        data = data.toarray()
+    column_bytes = numpy_or_cupy.packbits(
+        data.astype(numpy_or_cupy.bool_), axis=0, bitorder="little"
+    )
+    return _bytes_to_words(
+        numpy_or_cupy.ascontiguousarray(column_bytes.T), n_rows, numpy_or_cupy
+    )
@@ -0,0 +1,108 @@
+"""Depth-first Eclat mining over bit-packed tidsets."""
+from types import ModuleType
+from typing import List, Tuple
+
+from pyapriori.utils.bitset import popcount
+from pyapriori.utils.utils import MultiDimensionalArray, get_numpy_or_cupy
+
+Blocks = List[Tuple[MultiDimensionalArray, MultiDimensionalArray]]
+
+
+def mine_eclat(
+    members: MultiDimensionalArray,
+    sets: MultiDimensionalArray,
+    support: MultiDimensionalArray,
+    min_support: int,
+    diffsets: bool = True,
+) -> Blocks:
+    """Mine frequent itemsets depth-first with Eclat
+
+    Every member ``X`` of an equivalence class is extended with the members
+    following it. With tidsets the extension ``PXY`` has tidset ``t(PX) &
+    t(PY)``. With diffsets (dEclat) it has diffset ``d(PY) - d(PX)`` and
+    support ``sup(PX) - |d(PXY)|``; the first extension of plain tidsets uses
+    ``d(XY) = t(X) - t(Y)``. Only the classes on the current recursion path
+    are held in memory.
+
+    Parameters
+    ----------
+    members: MultiDimensionalArray :
+        Item position of every single itemset, ascending.
+    sets: MultiDimensionalArray :
+        ``(n_members, n_words)`` packed tidsets of the single itemsets.
+    support: MultiDimensionalArray :
+        Support of every single itemset.
+    min_support: int :
+
+    diffsets: bool :
+        Switch to diffsets below the first level.
+         (Default value = True)
+
+    Returns
+    -------
+    Blocks
+        Blocks of ``(itemsets, support)``, itemsets as ``(n_itemsets, k)``
+        item positions.
+
+    """
+    result = []
+    _mine_class(
+        get_numpy_or_cupy(sets),
+        members,
+        sets,
+        support,
+        min_support,
+        diffsets,
+        (),
+        False,
+        result,
+    )
+    return result
+
+
+def _mine_class(
+    numpy_or_cupy: ModuleType,
+    members: MultiDimensionalArray,
+    sets: MultiDimensionalArray,
+    support: MultiDimensionalArray,
+    min_support: int,
+    diffsets: bool,
+    prefix: Tuple[int, ...],
+    is_diffset: bool,
+    result: Blocks,
+):
+    """Mine the equivalence class of itemsets sharing `prefix`"""
+    n_members = len(members)
+    if n_members == 0:
+        return
+    itemsets = numpy_or_cupy.empty((n_members, len(prefix) + 1), dtype=members.dtype)
+    itemsets[:, :-1] = numpy_or_cupy.asarray(prefix, dtype=members.dtype)
+    itemsets[:, -1] = members
+    result.append((itemsets, support))
+
+    for member in range(n_members - 1):
+        rest = member + 1
+        if is_diffset:
+            new_sets = sets[rest:] & ~sets[member]
+        elif diffsets:
+            new_sets = sets[member] & ~sets[rest:]
+        else:
+            new_sets = sets[member] & sets[rest:]
+        counts = popcount(new_sets, numpy_or_cupy).sum(
+            axis=1, dtype=numpy_or_cupy.int64
+        )
+        new_support = support[member] - counts if diffsets else counts
+        over_support_mask = new_support >= min_support
+        if not bool(over_support_mask.any()):
+            continue
+        _mine_class(
+            numpy_or_cupy,
+            members[rest:][over_support_mask],
+            new_sets[over_support_mask],
+            new_support[over_support_mask],
+            min_support,
+            diffsets,
+            prefix + (int(members[member]),),
+            diffsets,
+            result,
+        )
@@ -0,0 +1,239 @@
+"""Reading of transactions in the FIMI ``.dat`` format."""
+import os
+import tempfile
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+Path = Union[str, os.PathLike]
+
+# Bytes of the file parsed at once
+BLOCK_SIZE = 1 << 24
+
+# Bytes allowed in FIMI data: digits and whitespace
+_VALID_BYTES = np.zeros(256, dtype=bool)
+_VALID_BYTES[[ord(character) for character in "0123456789 \t\r\n"]] = True
+
+_POWERS_OF_TEN = 10 ** np.arange(18, dtype=np.int64)
+
+
+def _parse_block(block: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse complete FIMI lines with vectorized numpy operations
+
+    Parameters
+    ----------
+    block: bytes :
+        Lines of whitespace separated item ids.
+
+    Returns
+    -------
+    tuple
+        ``(lengths, items)``, the number of distinct items of every non-empty
+        line and the int64 item ids of all lines, ascending within a line.
+
+    """
+    buffer = np.frombuffer(block, dtype=np.uint8)
+    valid = _VALID_BYTES[buffer]
+    if not valid.all():
+        raise ValueError(
+            "Invalid character {!r} in FIMI data".format(chr(buffer[np.argmin(valid)]))
+        )
+    digit_positions = np.flatnonzero((buffer >= ord("0")) & (buffer <= ord("9")))
+    if len(digit_positions) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Every run of digits is one item id
+    starts = np.flatnonzero(np.r_[True, np.diff(digit_positions) > 1])
+    ends = np.r_[starts[1:], len(digit_positions)] - 1
+    exponent = np.repeat(digit_positions[ends], ends - starts + 1) - digit_positions
+    if exponent.max() >= len(_POWERS_OF_TEN):
+        raise ValueError("Item id in FIMI data is too large")
+    digits = (buffer[digit_positions] - ord("0")).astype(np.int64)
+    items = np.add.reduceat(digits * _POWERS_OF_TEN[exponent], starts)
+    lines = np.searchsorted(
+        np.flatnonzero(buffer == ord("\n")), digit_positions[starts]
+    )
+
+    # Sort items within lines and drop repeated items
+    if not np.all((items[1:] > items[:-1]) | (lines[1:] != lines[:-1])):
+        n_keys = int(items.max()) + 1
+        if n_keys * (int(lines[-1]) + 1) < np.iinfo(np.int64).max:
+            order = np.argsort(lines * n_keys + items, kind="stable")
+        else:
+            order = np.lexsort((items, lines))
+        items = items[order]
+        lines = lines[order]
+        keep = np.r_[True, (items[1:] != items[:-1]) | (lines[1:] != lines[:-1])]
+        items = items[keep]
+        lines = lines[keep]
+    line_starts = np.flatnonzero(np.r_[True, lines[1:] != lines[:-1]])
+    return np.diff(np.r_[line_starts, len(lines)]), items
+
+
+def _iter_blocks(path: Path, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Read the file in blocks of about `block_size` bytes split on newlines"""
+    with open(path, "rb") as file:
+        remainder = b""
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            block = remainder + block
+            end = block.rfind(b"\n") + 1
+            remainder = block[end:]
+            if end > 0:
+                yield block[:end]
+        if remainder:
+            yield remainder
+
+
+def _empty_array(
+    directory: Optional[Path], name: str, length: int, dtype: np.dtype
+) -> np.ndarray:
+    """Memory-mapped array, a ``.npy`` file in `directory` or a temporary file"""
+    if length == 0:
+        return np.zeros(0, dtype=dtype)
+    if directory is None:
+        return np.memmap(tempfile.TemporaryFile(), dtype=dtype, shape=(length,))
+    return np.lib.format.open_memmap(
+        os.path.join(directory, name + ".npy"), mode="w+", dtype=dtype, shape=(length,)
+    )
+
+
+def _lines_to_csr(lines: Iterable[str], n_items: int = None) -> csr_matrix:
+    """Build a boolean CSR matrix from FIMI lines"""
+    lengths, items = _parse_block("".join(lines).encode())
+    if n_items is None:
+        n_items = int(items.max()) + 1 if items.size > 0 else 0
+    return csr_matrix(
+        (np.ones(len(items), dtype=bool), items, np.r_[0, np.cumsum(lengths)]),
+        shape=(len(lengths), n_items),
+    )
+
+
+def read_fimi(
+    path: Path,
+    n_items: int = None,
+    remap: bool = False,
+    directory: Optional[Path] = None,
+    block_size: int = BLOCK_SIZE,
+) -> Union[csr_matrix, Tuple[csr_matrix, np.ndarray]]:
+    """Read a FIMI ``.dat`` file
+
+    Every non-empty line is one transaction of whitespace separated item ids.
+    The file is parsed in blocks twice: the first pass sizes the CSR arrays
+    and collects the items, the second one fills ``indptr`` and ``indices``
+    allocated as memory-mapped arrays, so files larger than the memory can
+    be loaded. The matrix wraps the memory maps without a copy.
+
+    Parameters
+    ----------
+    path: Path :
+
+    n_items: int :
+        Number of columns, defaults to the largest item id plus one. Ignored
+        with `remap`.
+         (Default value = None)
+    remap: bool :
+        Renumber the items present in the file to ``0 .. n_distinct - 1``
+        in ascending id order, so sparse or huge ids do not create empty
+        columns.
+         (Default value = False)
+    directory: Optional[Path] :
+        Directory for ``indptr.npy``, ``indices.npy`` and ``data.npy``,
+        temporary files deleted with the matrix are used by default.
+         (Default value = None)
+    block_size: int :
+        Bytes parsed at once.
+         (Default value = BLOCK_SIZE)
+
+    Returns
+    -------
+    Union[csr_matrix, Tuple[csr_matrix, np.ndarray]]
+        Boolean transaction matrix, with `remap` also the original id of
+        every column.
+
+    """
+    # First pass, sizes of the arrays and the items present
+    n_rows = 0
+    nnz = 0
+    max_item = -1
+    items_present = np.zeros(0, dtype=np.int64)
+    for block in _iter_blocks(path, block_size):
+        lengths, items = _parse_block(block)
+        n_rows += len(lengths)
+        nnz += len(items)
+        if remap:
+            items_present = np.union1d(items_present, items)
+        elif items.size > 0:
+            max_item = max(max_item, int(items.max()))
+    if remap:
+        n_items = len(items_present)
+    elif n_items is None:
+        n_items = max_item + 1
+    elif max_item >= n_items:
+        raise ValueError("Item id {} does not fit {} columns".format(max_item, n_items))
+
+    index_dtype = np.int32 if max(nnz, n_items) < np.iinfo(np.int32).max else np.int64
+    indptr = _empty_array(directory, "indptr", n_rows + 1, index_dtype)
+    indices = _empty_array(directory, "indices", nnz, index_dtype)
+    data = _empty_array(directory, "data", nnz, np.bool_)
+    indptr[0] = 0
+    data[:] = True
+
+    # Second pass, fill the arrays block by block
+    row = 0
+    position = 0
+    for block in _iter_blocks(path, block_size):
+        lengths, items = _parse_block(block)
+        if remap:
+            items = np.searchsorted(items_present, items)
+        next_row = row + len(lengths)
+        first_row = row + 1
+        end_row = next_row + 1
+        next_position = position + len(items)
+        indptr[first_row:end_row] = position + np.cumsum(lengths)
+        indices[position:next_position] = items
+        row = next_row
+        position = next_position
+
+    data = csr_matrix((data, indices, indptr), shape=(n_rows, n_items), copy=False)
+    data.has_sorted_indices = True
+    if remap:
+        return data, items_present
+    return data
+
+
+def iter_fimi(
+    path: Path, chunk_size: int = 100000, n_items: int = None
+) -> Iterator[csr_matrix]:
+    """Read a FIMI ``.dat`` file in chunks of `chunk_size` transactions
+
+    Parameters
+    ----------
+    path: Path :
+
+    chunk_size: int :
+         (Default value = 100000)
+    n_items: int :
+        Number of columns, defaults to the largest item id of the chunk plus
+        one.
+         (Default value = None)
+
+    Returns
+    -------
+    Iterator[csr_matrix]
+
+    """
+    with open(path) as file:
+        lines = []
+        for line in file:
+            if not line.strip():
+                continue
+            lines.append(line)
+            if len(lines) == chunk_size:
+                yield _lines_to_csr(lines, n_items)
+                lines = []
+        if lines:
+            yield _lines_to_csr(lines, n_items)
@@ -0,0 +1,276 @@
+"""FP-tree stored in flat node arrays."""
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Items of the conditional pattern bases built at once
+MAX_BASE_SIZE = 1 << 20
+
+
+class FPTree(NamedTuple):
+    """FP-tree with one array entry per node
+
+    Nodes are numbered so that a parent always precedes its children, the
+    root is implicit and has index -1. The arrays may hold a forest of
+    several trees, every node carries the index of its tree.
+
+    Attributes
+    ----------
+    parent: np.ndarray :
+        Index of the parent node.
+    item: np.ndarray :
+        Item rank of the node, rank 0 is the most frequent item.
+    count: np.ndarray :
+        Weighted number of transactions passing through the node.
+    depth: np.ndarray :
+        Number of ancestors of the node, excluding the root.
+    tree: np.ndarray :
+        Index of the tree of the node.
+
+    """
+
+    parent: np.ndarray
+    item: np.ndarray
+    count: np.ndarray
+    depth: np.ndarray
+    tree: np.ndarray
+
+
+def build_fptree(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    n_items: int,
+    trees: Optional[np.ndarray] = None,
+) -> FPTree:
+    """Build an FP-tree from weighted transactions
+
+    The tree is built one depth at a time for all transactions at once:
+    nodes at depth `d` are the distinct pairs of (node at depth ``d - 1``,
+    ``d``-th item) over the transactions that are long enough.
+
+    Parameters
+    ----------
+    indptr: np.ndarray :
+        CSR row pointer of the transactions.
+    indices: np.ndarray :
+        Item ranks, ascending within every transaction.
+    weights: np.ndarray :
+        Weight of every transaction.
+    n_items: int :
+        Upper bound of the item ranks.
+    trees: Optional[np.ndarray] :
+        Tree every transaction is inserted into, ``None`` builds a single
+        tree.
+         (Default value = None)
+
+    Returns
+    -------
+    FPTree
+
+    """
+    lengths = np.diff(indptr)
+    if trees is None:
+        trees = np.zeros(len(lengths), dtype=np.int64)
+    n_trees = int(trees.max()) + 1 if len(trees) > 0 else 1
+    # Nodes are keyed by their parent, the roots of the trees are the
+    # negative keys ``tree - n_trees``
+    node_of_row = trees - n_trees
+    parent: List[np.ndarray] = []
+    item: List[np.ndarray] = []
+    count: List[np.ndarray] = []
+    depth: List[np.ndarray] = []
+    tree: List[np.ndarray] = []
+    n_nodes = 0
+    for level in range(int(lengths.max()) if len(lengths) > 0 else 0):
+        rows = np.flatnonzero(lengths > level)
+        keys = (node_of_row[rows] + n_trees) * n_items + indices[indptr[rows] + level]
+        unique_keys, first, inverse = np.unique(
+            keys, return_index=True, return_inverse=True
+        )
+        parent.append(np.maximum(unique_keys // n_items - n_trees, -1))
+        item.append(unique_keys % n_items)
+        count.append(
+            np.bincount(inverse, weights=weights[rows], minlength=len(unique_keys))
+        )
+        depth.append(np.full(len(unique_keys), level))
+        tree.append(trees[rows[first]])
+        node_of_row[rows] = n_nodes + inverse
+        n_nodes += len(unique_keys)
+    if n_nodes == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return FPTree(empty, empty, empty, empty, empty)
+    return FPTree(
+        np.concatenate(parent),
+        np.concatenate(item),
+        np.concatenate(count).astype(np.int64),
+        np.concatenate(depth),
+        np.concatenate(tree),
+    )
+
+
+def conditional_pattern_base(
+    tree: FPTree, nodes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Prefix paths of `nodes` as weighted transactions
+
+    Parameters
+    ----------
+    tree: FPTree :
+
+    nodes: np.ndarray :
+        Nodes of one item.
+
+    Returns
+    -------
+    tuple
+        ``(indptr, indices, weights)`` of the paths from the root to the
+        parents of `nodes`, weighted by the node counts.
+
+    """
+    lengths = tree.depth[nodes]
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    # Walk up to the root, filling every path from its end
+    current = tree.parent[nodes]
+    position = indptr[1:] - 1
+    active = current >= 0
+    while active.any():
+        indices[position[active]] = tree.item[current[active]]
+        position = position - 1
+        current = np.where(active, tree.parent[np.maximum(current, 0)], -1)
+        active = current >= 0
+    return indptr, indices, tree.count[nodes]
+
+
+def _frequent_items(
+    tree: FPTree,
+    n_items: int,
+    min_support: int,
+    suffixes: np.ndarray,
+    result: List[Tuple[np.ndarray, np.ndarray]],
+) -> List[Tuple[FPTree, np.ndarray, np.ndarray, np.ndarray]]:
+    """Frequent items of every tree of a forest and their pattern bases
+
+    The frequent ``(tree, item)`` pairs of the header tables are appended
+    to `result` with the suffix of their tree. Every pair becomes a
+    conditional tree, the pairs are split into groups whose conditional
+    pattern bases hold at most `MAX_BASE_SIZE` items.
+
+    Parameters
+    ----------
+    tree: FPTree :
+        Forest of conditional trees.
+    n_items: int :
+        Upper bound of the item ranks.
+    min_support: int :
+
+    suffixes: np.ndarray :
+        ``(n_trees, k)`` items of every conditional tree of `tree`.
+    result: List[Tuple[np.ndarray, np.ndarray]] :
+        List the itemsets are appended to.
+
+    Returns
+    -------
+    list
+        ``(tree, nodes, node_trees, suffixes)`` for every group, the nodes
+        of the frequent pairs of the group with the index of their
+        conditional tree in the group and the items of these trees.
+
+    """
+    pairs = tree.tree * n_items + tree.item
+    unique_pairs, pair_of_node = np.unique(pairs, return_inverse=True)
+    support = np.bincount(pair_of_node, weights=tree.count, minlength=len(unique_pairs))
+    frequent = support >= min_support
+    if not frequent.any():
+        return []
+    frequent_pairs = unique_pairs[frequent]
+    itemsets = np.column_stack(
+        (frequent_pairs % n_items, suffixes[frequent_pairs // n_items])
+    )
+    result.append((itemsets, support[frequent].astype(np.int64)))
+
+    # Nodes with a non-empty prefix path, grouped by their frequent pair
+    nodes = np.flatnonzero(frequent[pair_of_node] & (tree.depth > 0))
+    node_pair = (np.cumsum(frequent) - 1)[pair_of_node[nodes]]
+    order = np.argsort(node_pair, kind="stable")
+    nodes, node_pair = nodes[order], node_pair[order]
+    base_size = np.bincount(
+        node_pair, weights=tree.depth[nodes], minlength=len(itemsets)
+    )
+    group = (np.cumsum(base_size) - base_size) // MAX_BASE_SIZE
+    bounds = np.flatnonzero(np.diff(group, prepend=-1, append=-1))
+    groups = []
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        start, stop = np.searchsorted(node_pair, [first, last])
+        if start < stop:
+            groups.append(
+                (
+                    tree,
+                    nodes[start:stop],
+                    node_pair[start:stop] - first,
+                    itemsets[first:last],
+                )
+            )
+    return groups
+
+
+def _conditional_trees(
+    tree: FPTree,
+    nodes: np.ndarray,
+    node_trees: np.ndarray,
+    n_items: int,
+    min_support: int,
+) -> FPTree:
+    """Forest of the conditional trees of a group of `_frequent_items`"""
+    indptr, indices, weights = conditional_pattern_base(tree, nodes)
+
+    # Drop items infrequent in the conditional pattern base of their tree
+    rows = np.repeat(np.arange(len(weights)), np.diff(indptr))
+    keys = node_trees[rows] * n_items + indices
+    _, key_index = np.unique(keys, return_inverse=True)
+    keep = (np.bincount(key_index, weights=weights[rows]) >= min_support)[key_index]
+    lengths = np.bincount(rows[keep], minlength=len(weights))
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    return build_fptree(indptr, indices[keep], weights, n_items, node_trees)
+
+
+def mine_fptree(
+    tree: FPTree, n_items: int, min_support: int
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Mine frequent itemsets of an FP-tree with FP-Growth
+
+    Instead of recursing into the conditional tree of every item, the
+    conditional trees of all frequent items of a forest are built and mined
+    together as one forest. Groups of pattern bases wait on a stack, so at
+    most one forest per itemset length is held at once.
+
+    Parameters
+    ----------
+    tree: FPTree :
+
+    n_items: int :
+        Upper bound of the item ranks.
+    min_support: int :
+
+
+    Returns
+    -------
+    List[Tuple[np.ndarray, np.ndarray]]
+        Blocks of ``(itemsets, support)``, itemsets as ``(n_itemsets, k)``
+        item ranks.
+
+    """
+    result = []
+    stack = _frequent_items(
+        tree, n_items, min_support, np.zeros((1, 0), dtype=np.int64), result
+    )
+    while stack:
+        tree, nodes, node_trees, suffixes = stack.pop()
+        conditional_tree = _conditional_trees(
+            tree, nodes, node_trees, n_items, min_support
+        )
+        stack.extend(
+            _frequent_items(conditional_tree, n_items, min_support, suffixes, result)
+        )
+    return result
@@ -0,0 +1,275 @@
+"""Compact container of mined itemsets."""
+import os
+import zipfile
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from pyapriori.utils.backend import get_numpy_or_cupy
+
+_ARRAYS = ("offsets", "item_ids", "support")
+
+
+def _to_host(array: Any) -> np.ndarray:
+    """numpy array of a numpy or cupy `array`"""
+    return array.get() if hasattr(array, "get") else np.asarray(array)
+
+
+def _load_npz_member(path: str, member: zipfile.ZipInfo) -> np.ndarray:
+    """Memory map an uncompressed ``.npy`` member of an ``.npz`` archive"""
+    with open(path, "rb") as file:
+        # Local file header: 30 fixed bytes, then the name and extra field
+        file.seek(member.header_offset + 26)
+        name_length, extra_length = np.frombuffer(file.read(4), dtype="<u2")
+        file.seek(member.header_offset + 30 + int(name_length) + int(extra_length))
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+    if dtype.hasobject:
+        raise ValueError("Member {} holds Python objects".format(member.filename))
+    if 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+class FrequentItemsets:
+    """Itemsets stored as CSR rows of item ids
+
+    The items of itemset ``i`` are ``item_ids[offsets[i]:offsets[i + 1]]``
+    in ascending order. Itemsets are grouped by length, so all itemsets of
+    one length are a contiguous block of `item_ids`. Other representations
+    are only built when requested.
+
+    Parameters
+    ----------
+    offsets: MultiDimensionalArray :
+        ``n_itemsets + 1`` int64 offsets into `item_ids`.
+    item_ids: MultiDimensionalArray :
+        int32 item ids (column indices of the transactions).
+    support: MultiDimensionalArray :
+        Support of every itemset, uint32 or uint64.
+    n_items: int :
+        Number of columns of the transactions.
+    labels: Optional[np.ndarray] :
+        Name of every column, ``None`` uses the column index.
+         (Default value = None)
+
+    """
+
+    def __init__(
+        self,
+        offsets: Any,
+        item_ids: Any,
+        support: Any,
+        n_items: int,
+        labels: Optional[np.ndarray] = None,
+    ):
+        self.offsets = offsets
+        self.item_ids = item_ids
+        self.support = support
+        self.n_items = n_items
+        self.labels = labels
+
+    @classmethod
+    def from_levels(
+        cls,
+        levels: List[Any],
+        levels_support: List[Any],
+        items: Any,
+        n_items: int,
+        labels: Optional[np.ndarray] = None,
+    ) -> "FrequentItemsets":
+        """Build the container from levels of `fit`
+
+        Parameters
+        ----------
+        levels: List[MultiDimensionalArray] :
+            ``(n_itemsets, k)`` positions of the items in `items`, levels
+            ordered by `k`.
+        levels_support: List[MultiDimensionalArray] :
+
+        items: MultiDimensionalArray :
+            Item id of every position.
+        n_items: int :
+
+        labels: Optional[np.ndarray] :
+             (Default value = None)
+
+        Returns
+        -------
+        FrequentItemsets
+
+        """
+        numpy_or_cupy = get_numpy_or_cupy(items)
+        item_ids = numpy_or_cupy.concatenate(
+            [numpy_or_cupy.sort(items[level], axis=1).ravel() for level in levels]
+        ).astype(numpy_or_cupy.int32)
+        lengths = numpy_or_cupy.concatenate(
+            [
+                numpy_or_cupy.full(
+                    len(level), level.shape[1], dtype=numpy_or_cupy.int64
+                )
+                for level in levels
+            ]
+        )
+        offsets = numpy_or_cupy.zeros(len(lengths) + 1, dtype=numpy_or_cupy.int64)
+        numpy_or_cupy.cumsum(lengths, out=offsets[1:])
+        support = numpy_or_cupy.concatenate(levels_support)
+        fits_uint32 = len(support) == 0 or int(support.max()) < 2**32
+        support = support.astype(
+            numpy_or_cupy.uint32 if fits_uint32 else numpy_or_cupy.uint64
+        )
+        return cls(offsets, item_ids, support, n_items, labels)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __repr__(self) -> str:
+        return "FrequentItemsets(n_itemsets={}, n_items={})".format(
+            len(self), self.n_items
+        )
+
+    def __iter__(self) -> Iterator[Tuple[frozenset, int]]:
+        return zip(self.to_sets(), _to_host(self.support).tolist())
+
+    @property
+    def lengths(self) -> Any:
+        """Number of items of every itemset"""
+        numpy_or_cupy = get_numpy_or_cupy(self.offsets)
+        return numpy_or_cupy.diff(self.offsets)
+
+    def level(self, length: int) -> Tuple[Any, Any]:
+        """Itemsets with `length` items as a view of the item ids
+
+        Parameters
+        ----------
+        length: int :
+
+
+        Returns
+        -------
+        tuple
+            ``(itemsets, support)``, itemsets as a ``(n_itemsets, length)``
+            view of `item_ids`.
+
+        """
+        numpy_or_cupy = get_numpy_or_cupy(self.offsets)
+        lengths = self.lengths
+        start, end = (
+            int(index)
+            for index in numpy_or_cupy.searchsorted(
+                lengths, numpy_or_cupy.asarray([length, length + 1])
+            )
+        )
+        first, last = int(self.offsets[start]), int(self.offsets[end])
+        return self.item_ids[first:last].reshape(-1, length), self.support[start:end]
+
+    def to_ids(self) -> Any:
+        """Itemsets as sorted item ids right padded with -1, the ``"ids"`` format"""
+        numpy_or_cupy = get_numpy_or_cupy(self.offsets)
+        lengths = self.lengths
+        width = int(lengths.max()) if len(lengths) > 0 else 0
+        ids = numpy_or_cupy.full((len(self), width), -1, dtype=numpy_or_cupy.int32)
+        rows = numpy_or_cupy.repeat(numpy_or_cupy.arange(len(self)), lengths)
+        columns = numpy_or_cupy.arange(len(self.item_ids)) - self.offsets[rows]
+        ids[rows, columns] = self.item_ids
+        return ids
+
+    def to_dense(self) -> Any:
+        """Itemsets as boolean rows, the ``"dense"`` format"""
+        numpy_or_cupy = get_numpy_or_cupy(self.offsets)
+        dense = numpy_or_cupy.zeros((len(self), self.n_items), dtype=bool)
+        rows = numpy_or_cupy.repeat(numpy_or_cupy.arange(len(self)), self.lengths)
+        dense[rows, self.item_ids] = True
+        return dense
+
+    def to_sets(self) -> List[frozenset]:
+        """Itemsets as frozensets of labels (item ids without labels)"""
+        offsets = _to_host(self.offsets).tolist()
+        items = _to_host(self.item_ids)
+        if self.labels is not None:
+            items = np.asarray(self.labels, dtype=object)[items]
+        items = items.tolist()
+        return [frozenset(items[start:end]) for start, end in zip(offsets, offsets[1:])]
+
+    def to_pandas(self) -> Any:
+        """DataFrame with an ``itemsets`` column of frozensets and ``support``"""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {"itemsets": self.to_sets(), "support": _to_host(self.support)}
+        )
+
+    def save(self, path: str):
+        """Write the buffers to an uncompressed ``.npz`` file
+
+        Labels are stored as strings.
+
+        Parameters
+        ----------
+        path: str :
+
+
+        """
+        arrays = {name: _to_host(getattr(self, name)) for name in _ARRAYS}
+        arrays["n_items"] = np.asarray(self.n_items, dtype=np.int64)
+        if self.labels is not None:
+            arrays["labels"] = np.asarray(self.labels).astype(str)
+        with open(path, "wb") as file:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "FrequentItemsets":
+        """Read a container written by `save`
+
+        Parameters
+        ----------
+        path: str :
+
+        mmap: bool :
+            Memory map the buffers instead of reading them, which needs no
+            copy because `save` does not compress them.
+             (Default value = True)
+
+        Returns
+        -------
+        FrequentItemsets
+
+        """
+        if mmap:
+            with zipfile.ZipFile(path) as archive:
+                members = {
+                    os.path.splitext(member.filename)[0]: member
+                    for member in archive.infolist()
+                }
+            if all(
+                member.compress_type == zipfile.ZIP_STORED
+                for member in members.values()
+            ):
+                arrays = {
+                    name: _load_npz_member(path, member)
+                    for name, member in members.items()
+                }
+            else:
+                mmap = False
+        if not mmap:
+            with np.load(path) as archive:
+                arrays = {name: archive[name] for name in archive.files}
+        labels = arrays.get("labels")
+        return cls(
+            arrays["offsets"],
+            arrays["item_ids"],
+            arrays["support"],
+            int(arrays["n_items"]),
+            None if labels is None else np.asarray(labels, dtype=object),
+        )
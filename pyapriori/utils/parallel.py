@@ -0,0 +1,220 @@
+"""Support counting split over row blocks of the transaction matrix."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import issparse, vstack
+
+from pyapriori.utils.bitset import WORD_BYTES, BitsetMatrix, popcount
+from pyapriori.utils.weights import weighted_support
+
+if TYPE_CHECKING:
+    from pyapriori.utils.utils import Data, MultiDimensionalArray
+
+WORD_BITS = WORD_BYTES * 8
+
+
+def effective_n_jobs(n_jobs: int = 1) -> int:
+    """Number of workers for `n_jobs`, negative values count from the CPUs
+
+    Parameters
+    ----------
+    n_jobs: int :
+        ``-1`` uses all CPUs, ``-2`` all but one and so on.
+         (Default value = 1)
+
+    Returns
+    -------
+    int
+
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def row_blocks(data: "Data", n_jobs: int) -> List[Tuple[int, int]]:
+    """Split rows of `data` into at most `n_jobs` contiguous blocks
+
+    Blocks of a `BitsetMatrix` are counted in words so that every block
+    starts on a word boundary.
+
+    Parameters
+    ----------
+    data: Data :
+
+    n_jobs: int :
+
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        ``(start, stop)`` of every non-empty block, a single empty block if
+        `data` has no rows.
+
+    """
+    if isinstance(data, BitsetMatrix):
+        n_units = data.words.shape[1]
+    else:
+        n_units = data.shape[0]
+    bounds = np.linspace(0, n_units, effective_n_jobs(n_jobs) + 1).astype(int)
+    blocks = [
+        (start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+    ]
+    return blocks or [(0, n_units)]
+
+
+def row_block(data: "Data", start: int, stop: int) -> "Data":
+    """Rows `start` to `stop` of `data` as returned by `row_blocks`"""
+    if isinstance(data, BitsetMatrix):
+        n_rows = min(stop * WORD_BITS, data.n_rows) - start * WORD_BITS
+        return BitsetMatrix(data.words[:, start:stop], n_rows)
+    return data[start:stop]
+
+
+def row_block_weights(
+    data: "Data",
+    weights: Optional["MultiDimensionalArray"],
+    start: int,
+    stop: int,
+) -> Optional["MultiDimensionalArray"]:
+    """Weights of the rows of `row_block`, ``None`` without weights"""
+    if weights is None:
+        return None
+    if isinstance(data, BitsetMatrix):
+        start, stop = start * WORD_BITS, min(stop * WORD_BITS, data.n_rows)
+    return weights[start:stop]
+
+
+def map_row_blocks(
+    function: Callable[..., "MultiDimensionalArray"],
+    data: "Data",
+    n_jobs: int,
+    weights: Optional["MultiDimensionalArray"] = None,
+) -> "MultiDimensionalArray":
+    """Sum `function` applied to row blocks of `data` in a thread pool
+
+    Workers share `data` (blocks are views for dense and bitset layouts), no
+    copy of the transactions is sent to them. Partial results are summed in
+    block order.
+
+    Parameters
+    ----------
+    function: Callable[..., MultiDimensionalArray] :
+        Function returning per-column counts of a block, called with the
+        weights of the block as second argument if `weights` are given.
+    data: Data :
+
+    n_jobs: int :
+
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row.
+         (Default value = None)
+
+    Returns
+    -------
+    MultiDimensionalArray
+
+    """
+    blocks = row_blocks(data, n_jobs)
+
+    def work(start: int, stop: int) -> "MultiDimensionalArray":
+        block = row_block(data, start, stop)
+        if weights is None:
+            return function(block)
+        return function(block, row_block_weights(data, weights, start, stop))
+
+    with ThreadPoolExecutor(max_workers=len(blocks)) as executor:
+        partial = list(executor.map(lambda block: work(*block), blocks))
+    return sum(partial[1:], partial[0])
+
+
+def parallel_itemsets_support(
+    data: "Data",
+    multiplier_mask_left: "MultiDimensionalArray",
+    multiplier_mask_right: "MultiDimensionalArray",
+    n_jobs: int,
+    weights: Optional["MultiDimensionalArray"] = None,
+) -> Tuple["Data", "MultiDimensionalArray"]:
+    """Intersect candidate columns and count their support in row blocks
+
+    Dense and bitset workers write their block straight into a shared output
+    array, sparse blocks are stacked at the end.
+
+    Parameters
+    ----------
+    data: Data :
+
+    multiplier_mask_left: MultiDimensionalArray :
+
+    multiplier_mask_right: MultiDimensionalArray :
+
+    n_jobs: int :
+
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row.
+         (Default value = None)
+
+    Returns
+    -------
+    tuple
+        ``(data, support)`` as returned by `itemsets_support`.
+
+    """
+    blocks = row_blocks(data, n_jobs)
+    n_candidates = len(multiplier_mask_left)
+
+    if isinstance(data, BitsetMatrix):
+        words = np.empty((n_candidates, data.words.shape[1]), dtype=np.uint64)
+
+        def work(start: int, stop: int) -> "MultiDimensionalArray":
+            block = words[:, start:stop]
+            np.bitwise_and(
+                data.words[multiplier_mask_left, start:stop],
+                data.words[multiplier_mask_right, start:stop],
+                out=block,
+            )
+            if weights is not None:
+                return weighted_support(
+                    BitsetMatrix(block, data.n_rows),
+                    row_block_weights(data, weights, start, stop),
+                )
+            return popcount(block, np).sum(axis=1, dtype=np.int64)
+
+        result = BitsetMatrix(words, data.n_rows)
+    elif issparse(data):
+        parts = {}
+
+        def work(start: int, stop: int) -> "MultiDimensionalArray":
+            block = data[start:stop]
+            parts[start] = block[:, multiplier_mask_left].multiply(
+                block[:, multiplier_mask_right]
+            )
+            if weights is not None:
+                return weighted_support(parts[start], weights[start:stop])
+            return np.asarray(parts[start].sum(axis=0)).ravel()
+
+        result = None
+    else:
+        # Column selection of a row major matrix is column major
+        result = np.empty((data.shape[0], n_candidates), dtype=data.dtype, order="F")
+
+        def work(start: int, stop: int) -> "MultiDimensionalArray":
+            block = data[start:stop]
+            np.multiply(
+                block[:, multiplier_mask_left],
+                block[:, multiplier_mask_right],
+                out=result[start:stop],
+            )
+            if weights is not None:
+                return weighted_support(result[start:stop], weights[start:stop])
+            return result[start:stop].sum(axis=0)
+
+    with ThreadPoolExecutor(max_workers=len(blocks)) as executor:
+        partial = list(executor.map(lambda block: work(*block), blocks))
+    if result is None:
+        result = vstack([parts[start] for start, _ in blocks], format=data.format)
+    return result, sum(partial[1:], partial[0])
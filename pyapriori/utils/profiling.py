@@ -0,0 +1,215 @@
+"""Per-level statistics of the level-wise miners."""
+import time
+import tracemalloc
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Callable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+
+class LevelStats(NamedTuple):
+    """Statistics of the candidates of size `k`
+
+    Times are wall clock seconds, device work is synchronized before a
+    stage ends.
+
+    Attributes
+    ----------
+    k: int :
+        Size of the candidates.
+    n_generated: int :
+        Candidates joined by `generate_candidates`.
+    n_pruned: int :
+        Candidates dropped by the Apriori subset check.
+    n_frequent: int :
+        Candidates kept by `min_support_set`.
+    generate_time: float :
+        Time of `generate_candidates` and the subset check.
+    support_time: float :
+        Time of `itemsets_support`.
+    min_support_time: float :
+        Time of `min_support_set`.
+    trim_time: float :
+        Time of dropping and merging transactions with
+        ``trim_transactions``.
+    layout_time: float :
+        Time of converting the transactions to another layout with
+        ``backend="auto"``.
+    peak_host_memory: int :
+        Peak bytes of host memory allocated while the level was counted, as
+        traced by `tracemalloc`.
+    peak_device_memory: Optional[int] :
+        Peak bytes held by the cupy memory pool, sampled at the end of every
+        stage of the level, ``None`` for host data. The pool keeps freed
+        blocks until they are released, so a sample covers the allocations
+        of the stage.
+    density: float :
+        Fraction of set entries in the columns of the size ``k - 1``
+        itemsets the candidates are counted from.
+
+    """
+
+    k: int
+    n_generated: int
+    n_pruned: int
+    n_frequent: int
+    generate_time: float
+    support_time: float
+    min_support_time: float
+    trim_time: float
+    layout_time: float
+    peak_host_memory: int
+    peak_device_memory: Optional[int]
+    density: float
+
+
+class _NullStage:
+    """Context manager doing nothing, used when profiling is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class LevelProfiler:
+    """Collect `LevelStats` of the levels of one fit
+
+    Parameters
+    ----------
+    numpy_or_cupy: ModuleType :
+        Array module of the transactions, device work is synchronized
+        before a stage is timed.
+    callback: Optional[Callable[[LevelStats], None]] :
+        Called with the statistics of every finished level.
+         (Default value = None)
+
+    Attributes
+    ----------
+    levels: list :
+        `LevelStats` of the finished levels.
+
+    """
+
+    def __init__(
+        self,
+        numpy_or_cupy: ModuleType,
+        callback: Optional[Callable[[LevelStats], None]] = None,
+    ):
+        self.numpy_or_cupy = numpy_or_cupy
+        self.callback = callback
+        self.levels = []
+        self._times = {}
+        self._k = None
+        self._density = 0.0
+        self._owns_tracing = False
+        self._peak_device_memory = None
+
+    def start_level(self, k: int, density: float):
+        """Start measuring the level of size `k`
+
+        Parameters
+        ----------
+        k: int :
+
+        density: float :
+            Density of the matrix the level is counted from.
+
+        """
+        self._k = k
+        self._density = density
+        self._times = {}
+        self._peak_device_memory = None
+        # Host memory is traced only while a level is counted
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def close(self):
+        """Stop tracing host memory started by `start_level`
+
+        Called by `end_level`, and by `fit` when a level is left unfinished
+        by an error, so tracing does not stay on for the process.
+
+        """
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to the stage `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.numpy_or_cupy is not np:
+                self.numpy_or_cupy.cuda.Device().synchronize()
+            self._times[name] = self._times.get(name, 0.0) + time.perf_counter() - start
+            self._sample_device_memory()
+
+    def _sample_device_memory(self):
+        """Update the peak with the bytes now held by the cupy memory pool"""
+        if self.numpy_or_cupy is np:
+            return
+        total_bytes = self.numpy_or_cupy.get_default_memory_pool().total_bytes()
+        self._peak_device_memory = max(self._peak_device_memory or 0, total_bytes)
+
+    def end_level(self, n_generated: int, n_pruned: int, n_frequent: int):
+        """Record the statistics of the current level
+
+        Parameters
+        ----------
+        n_generated: int :
+
+        n_pruned: int :
+
+        n_frequent: int :
+
+        """
+        self._sample_device_memory()
+        stats = LevelStats(
+            k=self._k,
+            n_generated=n_generated,
+            n_pruned=n_pruned,
+            n_frequent=n_frequent,
+            generate_time=self._times.get("generate_candidates", 0.0),
+            support_time=self._times.get("itemsets_support", 0.0),
+            min_support_time=self._times.get("min_support_set", 0.0),
+            trim_time=self._times.get("trim", 0.0),
+            layout_time=self._times.get("layout", 0.0),
+            peak_host_memory=tracemalloc.get_traced_memory()[1],
+            peak_device_memory=self._peak_device_memory,
+            density=self._density,
+        )
+        self.close()
+        self.levels.append(stats)
+        if self.callback is not None:
+            self.callback(stats)
+
+
+def profile_stage(profiler: Optional[LevelProfiler], name: str):
+    """Time stage `name` with `profiler`, a no-op if `profiler` is ``None``
+
+    Parameters
+    ----------
+    profiler: Optional[LevelProfiler] :
+
+    name: str :
+
+
+    Returns
+    -------
+    Context manager
+
+    """
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name)
@@ -1,18 +1,49 @@
+import math
+import os
 from types import ModuleType
-from itertools import combinations
-from typing import Union, Tuple, List
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+    Tuple,
+    List,
+)
 
-import cupy as cp
 import numpy as np
-from cupyx.scipy.sparse import csr_matrix as cupy_csr_matrix
 from scipy.sparse import csc_matrix
 from scipy.sparse import csr_matrix
 
-Data = Union[np.ndarray, cp.ndarray, csr_matrix, csc_matrix, cupy_csr_matrix]
-MultiDimensionalArray = Union[np.ndarray, cp.ndarray]
-
-
-def get_support(data: Data, numpy_or_cupy: ModuleType) -> MultiDimensionalArray:
+from pyapriori.utils.backend import get_numpy_or_cupy, is_sparse
+from pyapriori.utils.bitset import BitsetMatrix, pack_columns
+from pyapriori.utils.fimi import read_fimi
+from pyapriori.utils.itemsets import FrequentItemsets
+from pyapriori.utils.parallel import (
+    effective_n_jobs,
+    map_row_blocks,
+    parallel_itemsets_support,
+)
+from pyapriori.utils.profiling import LevelProfiler, profile_stage
+from pyapriori.utils.weights import weighted_support
+
+if TYPE_CHECKING:
+    import cupy as cp
+    from cupyx.scipy.sparse import csr_matrix as cupy_csr_matrix
+
+Data = Union[
+    np.ndarray, "cp.ndarray", csr_matrix, csc_matrix, "cupy_csr_matrix", BitsetMatrix
+]
+MultiDimensionalArray = Union[np.ndarray, "cp.ndarray"]
+
+
+def get_support(
+    data: Data,
+    numpy_or_cupy: ModuleType,
+    n_jobs: int = 1,
+    weights: Optional[MultiDimensionalArray] = None,
+) -> MultiDimensionalArray:
     """Get support
 
     Parameters
@@ -23,42 +54,81 @@ def get_support(data: Data, numpy_or_cupy: ModuleType) -> MultiDimensionalArray:
 
     'cupy') :
 
+    n_jobs: int :
+        Number of threads summing row blocks of host data.
+         (Default value = 1)
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, the support of a column is the sum of the
+        weights of its rows. ``None`` counts every row once.
+         (Default value = None)
 
     Returns
     -------
 
     """
-    if isinstance(data, (csr_matrix, csc_matrix, cupy_csr_matrix)):
+    if _use_threads(numpy_or_cupy, n_jobs):
+        return map_row_blocks(
+            lambda block, block_weights=None: get_support(
+                block, numpy_or_cupy, weights=block_weights
+            ),
+            data,
+            n_jobs,
+            weights,
+        )
+    if weights is not None:
+        return weighted_support(data, weights)
+    if is_sparse(data) or isinstance(data, BitsetMatrix):
         return numpy_or_cupy.array(data.sum(axis=0)).ravel()
     return data.sum(axis=0)
 
 
-def frequent_single_itemsets(
-    data: Data, min_support: int = 0
-) -> Tuple[MultiDimensionalArray, MultiDimensionalArray, Data]:
-    """
+def _use_threads(numpy_or_cupy: ModuleType, n_jobs: int) -> bool:
+    """Whether host data is split between several threads"""
+    return numpy_or_cupy is np and effective_n_jobs(n_jobs) > 1
+
+
+def as_transactions(data: Data) -> Data:
+    """Cast `data` to the dtype used for support counting
 
     Parameters
     ----------
     data: Data :
 
-    min_support: int :
-         (Default value = 0)
 
     Returns
     -------
-    type
-
+    Data
+        Boolean matrix, float32 for cupy sparse matrices which have no boolean
+        dtype.
 
     """
     numpy_or_cupy = get_numpy_or_cupy(data)
+    if isinstance(data, BitsetMatrix):
+        return data
+    if numpy_or_cupy is not np and is_sparse(data):
+        return data.astype(numpy_or_cupy.float32)
+    return data.astype(numpy_or_cupy.bool_)
 
-    if isinstance(data, (cupy_csr_matrix)):
-        data = data.astype(numpy_or_cupy.float32)
-    else:
-        data = data.astype(numpy_or_cupy.bool_)
 
-    columns_support = get_support(data, numpy_or_cupy)
+def frequent_items(
+    columns_support: MultiDimensionalArray, min_support: int = 0
+) -> Tuple[MultiDimensionalArray, MultiDimensionalArray]:
+    """Select items with minimal support ordered by ascending support
+
+    Parameters
+    ----------
+    columns_support: MultiDimensionalArray :
+        Support of every item.
+    min_support: int :
+         (Default value = 0)
+
+    Returns
+    -------
+    tuple
+        ``(item_ids, support)`` of the frequent items.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(columns_support)
 
     # Reduce by support
     indices = numpy_or_cupy.arange(max(columns_support.shape))
@@ -70,93 +140,838 @@ def frequent_single_itemsets(
     support_sorted_mask = numpy_or_cupy.argsort(reduced_columns_support)
     reduced_indices_sorted = reduced_indices[support_sorted_mask]
     reduced_columns_support_sorted = reduced_columns_support[support_sorted_mask]
+    return reduced_indices_sorted, reduced_columns_support_sorted
+
+
+def absolute_support(min_support: Union[int, float], n_transactions: int) -> int:
+    """Minimal support count of `min_support`
+
+    Parameters
+    ----------
+    min_support: Union[int, float] :
+        Number of transactions, or a float between 0 and 1 giving the
+        fraction of `n_transactions`, rounded up.
+    n_transactions: int :
+
+
+    Returns
+    -------
+    int
+
+    """
+    if isinstance(min_support, (float, np.floating)):
+        if not 0.0 <= min_support <= 1.0:
+            raise ValueError(
+                "Fractional min_support must be between 0 and 1, got {}".format(
+                    min_support
+                )
+            )
+        # Rounding first keeps e.g. 0.3 * 10 from becoming 4
+        return int(math.ceil(round(min_support * n_transactions, 9)))
+    return int(min_support)
+
+
+def top_k_threshold(
+    top_support: MultiDimensionalArray, support: MultiDimensionalArray, k: int
+) -> Tuple[MultiDimensionalArray, int]:
+    """Merge `support` into the `k` largest supports found so far
+
+    Parameters
+    ----------
+    top_support: MultiDimensionalArray :
+        At most `k` largest supports of the itemsets found before.
+    support: MultiDimensionalArray :
+        Supports of newly found itemsets.
+    k: int :
+
+
+    Returns
+    -------
+    tuple
+        ``(top_support, threshold)``, the `k` largest supports and the
+        smallest of them, which an itemset needs to be among the `k` most
+        frequent. The threshold is 0 while fewer than `k` itemsets are known.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(support)
+    top_support = numpy_or_cupy.concatenate(
+        (numpy_or_cupy.asarray(top_support, dtype=support.dtype), support)
+    )
+    if len(top_support) > k:
+        start = len(top_support) - k
+        top_support = numpy_or_cupy.partition(top_support, start)[start:]
+    threshold = int(top_support.min()) if len(top_support) >= k else 0
+    return top_support, threshold
+
+
+def align_columns(data: Data, n_items: int) -> Data:
+    """Widen `data` with empty columns to `n_items` columns
+
+    Parameters
+    ----------
+    data: Data :
+
+    n_items: int :
+
+
+    Returns
+    -------
+    Data
+        Matrix of the same type sharing the buffers of sparse `data`.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    n_rows, n_columns = data.shape
+    if n_columns == n_items:
+        return data
+    if n_columns > n_items:
+        raise ValueError(
+            "Data has {} columns, expected at most {}".format(n_columns, n_items)
+        )
+    if is_sparse(data) and data.format == "csr":
+        return type(data)(
+            (data.data, data.indices, data.indptr), shape=(n_rows, n_items)
+        )
+    if isinstance(data, csc_matrix):
+        indptr = np.concatenate(
+            (data.indptr, np.full(n_items - n_columns, data.indptr[-1]))
+        )
+        return csc_matrix((data.data, data.indices, indptr), shape=(n_rows, n_items))
+    padding = numpy_or_cupy.zeros((n_rows, n_items - n_columns), dtype=data.dtype)
+    return numpy_or_cupy.concatenate((data, padding), axis=1)
+
+
+def iter_chunks(chunks: Union[Iterable, Callable[[], Iterable]]) -> Iterator[Data]:
+    """Iterate over transaction chunks
+
+    Parameters
+    ----------
+    chunks: Union[Iterable, Callable[[], Iterable]] :
+        Re-iterable collection or a callable returning a new iterator on
+        every call. Items are matrices accepted as `Data` or paths to FIMI
+        ``.dat`` files.
+
+    Returns
+    -------
+    Iterator[Data]
+
+    """
+    if callable(chunks):
+        chunks = chunks()
+    elif iter(chunks) is chunks:
+        raise TypeError(
+            "Chunks are scanned once per level, pass a re-iterable collection "
+            "or a callable returning an iterator"
+        )
+    for chunk in chunks:
+        if isinstance(chunk, (str, os.PathLike)):
+            chunk = read_fimi(chunk)
+        yield chunk
+
+
+def frequent_single_itemsets(
+    data: Data,
+    min_support: int = 0,
+    itemset_format: str = "dense",
+    n_jobs: int = 1,
+    weights: Optional[MultiDimensionalArray] = None,
+) -> Tuple[MultiDimensionalArray, MultiDimensionalArray, Data]:
+    """
+
+    Parameters
+    ----------
+    data: Data :
+
+    min_support: int :
+         (Default value = 0)
+    itemset_format: str :
+        ``"dense"`` returns every itemset as a boolean row as wide as the
+        number of items, ``"ids"`` returns a ``(n_itemsets, 1)`` int32 array
+        of item ids without building the dense identity matrix.
+         (Default value = "dense")
+    n_jobs: int :
+        Number of threads counting row blocks of host data.
+         (Default value = 1)
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, see `get_support`.
+         (Default value = None)
+
+    Returns
+    -------
+    type
+
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+
+    data = as_transactions(data)
+    columns_support = get_support(data, numpy_or_cupy, n_jobs, weights)
+    reduced_indices_sorted, reduced_columns_support_sorted = frequent_items(
+        columns_support, min_support
+    )
+
+    # Reduce data
+    reduced_data = data[:, reduced_indices_sorted]
+
+    if itemset_format == "ids":
+        itemsets = reduced_indices_sorted.astype(numpy_or_cupy.int32).reshape(-1, 1)
+        return itemsets, reduced_columns_support_sorted, reduced_data
 
     # Indices Matrix
-    matrix_size = len(over_support_mask)
+    matrix_size = len(columns_support)
     indices_matrix = numpy_or_cupy.zeros((matrix_size, matrix_size))
     numpy_or_cupy.fill_diagonal(indices_matrix, 1)
     indices_matrix = indices_matrix[reduced_indices_sorted].astype(bool)
 
-    # Reduce data
-    data = data[:, reduced_indices_sorted]
+    return indices_matrix, reduced_columns_support_sorted, reduced_data
+
+
+def to_bitset(data: Data) -> BitsetMatrix:
+    """Convert `data` to the bit-packed vertical layout
 
-    return indices_matrix, reduced_columns_support_sorted, data
+    Parameters
+    ----------
+    data: Data :
 
 
-def get_numpy_or_cupy(data: Data) -> ModuleType:
+    Returns
+    -------
+    BitsetMatrix
+        Columns of `data` packed into uint64 tidsets.
+
     """
+    if isinstance(data, BitsetMatrix):
+        return data
+    return pack_columns(data, get_numpy_or_cupy(data))
+
+
+# Layouts `PyApriori` switches between with ``backend="auto"``
+LAYOUTS = ("dense", "sparse", "bitset")
+# Relative time per byte of candidate columns copied, intersected and summed
+# by `itemsets_support` in every layout, and per byte read and written when
+# the data is converted, measured on host data
+LAYOUT_COSTS = {"dense": 1.0, "sparse": 4.0, "bitset": 1.0}
+CONVERSION_COST = 4.0
+# Relative time to count the set columns of the rows per entry of a dense or
+# bitset matrix and per stored entry of a sparse one, in the same units
+ROW_LENGTH_COSTS = {"dense": 2.5, "sparse": 24.0, "bitset": 5.0}
+MAX_TRIM_SHARE = 0.25
+
+
+def data_layout(data: Data) -> str:
+    """Layout of `data`, one of `LAYOUTS`"""
+    if isinstance(data, BitsetMatrix):
+        return "bitset"
+    if is_sparse(data):
+        return "sparse"
+    return "dense"
+
+
+def to_layout(data: Data, layout: str) -> Data:
+    """Convert `data` to a column oriented `layout`
 
     Parameters
     ----------
-    data: Data) -> types.ModuleType('numpy' :
+    data: Data :
+
+    layout: str :
+        ``"dense"`` Fortran ordered boolean matrix, ``"sparse"`` CSC matrix
+        (float32 for cupy) or ``"bitset"`` `BitsetMatrix`.
 
-    'cupy' :
+    Returns
+    -------
+    Data
 
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    if layout == "bitset":
+        return to_bitset(data)
+    if isinstance(data, BitsetMatrix):
+        data = data.toarray()
+    if layout == "dense":
+        if is_sparse(data):
+            data = data.toarray(order="F")
+        return numpy_or_cupy.asfortranarray(data.astype(numpy_or_cupy.bool_))
+    if layout != "sparse":
+        raise ValueError(
+            "Unknown layout {!r}, expected one of {}".format(layout, LAYOUTS)
+        )
+    if is_sparse(data):
+        return as_transactions(data.tocsc())
+    if numpy_or_cupy is np:
+        return csc_matrix(data.astype(bool))
+    from cupyx.scipy.sparse import csc_matrix as cupy_csc_matrix
+
+    return cupy_csc_matrix(data.astype(numpy_or_cupy.float32))
+
+
+def _level_bytes(
+    n_rows: int,
+    columns_support: MultiDimensionalArray,
+    multiplier_mask_left: MultiDimensionalArray,
+    multiplier_mask_right: MultiDimensionalArray,
+) -> dict:
+    """Bytes stored, copied and written to count a level in every layout
 
     Returns
     -------
+    dict
+        ``(stored, copied, written)`` bytes of every layout: the columns of
+        the data, the parent columns copied by `itemsets_support` and the
+        intersections it writes.
 
     """
-    if isinstance(data, (cupy_csr_matrix, cp.ndarray)):
-        return cp
-    return np
+    numpy_or_cupy = get_numpy_or_cupy(columns_support)
+    # Index and value of a sparse entry, cupy sparse matrices are float32
+    entry_bytes = 4 + (1 if numpy_or_cupy is np else 4)
+    n_columns = len(columns_support)
+    n_candidates = len(multiplier_mask_left)
+    columns_support = columns_support.astype(numpy_or_cupy.float64)
+    left_support = columns_support[multiplier_mask_left]
+    right_support = columns_support[multiplier_mask_right]
+    written_entries = float((left_support * right_support).sum()) / max(n_rows, 1)
+    level_bytes = {
+        "sparse": (
+            float(columns_support.sum()) * entry_bytes,
+            float(left_support.sum() + right_support.sum()) * entry_bytes,
+            written_entries * entry_bytes,
+        )
+    }
+    for name, column_size in (("dense", n_rows), ("bitset", -(-n_rows // 64) * 8)):
+        level_bytes[name] = (
+            column_size * n_columns,
+            2 * n_candidates * column_size,
+            n_candidates * column_size,
+        )
+    return level_bytes
+
+
+def _counting_cost(name: str, level_bytes: tuple, weight_bits: int) -> float:
+    """Weighted bytes `itemsets_support` moves in layout `name`"""
+    _, copied, written = level_bytes
+    if name == "bitset":
+        written *= weight_bits
+    return LAYOUT_COSTS[name] * 2 * (copied + written)
+
+
+def choose_layout(
+    layout: str,
+    n_rows: int,
+    columns_support: MultiDimensionalArray,
+    multiplier_mask_left: MultiDimensionalArray,
+    multiplier_mask_right: MultiDimensionalArray,
+    keep_memory: bool = False,
+    weight_bits: int = 1,
+) -> str:
+    """Cheapest layout to count the next level in
+
+    `itemsets_support` copies both parent columns of every candidate, then
+    writes and sums their intersection. A column takes ``n_rows`` bytes in
+    the dense layout and ``ceil(n_rows / 64)`` words as a bitset. A sparse
+    column stores one entry per supporting transaction, an intersection is
+    estimated to hold ``support(left) * support(right) / n_rows`` entries.
+    Bytes are weighted by `LAYOUT_COSTS`. Leaving the current layout adds
+    `CONVERSION_COST` per byte of the columns before and after the
+    conversion, so the layout only changes if the level pays for it.
+
+    Parameters
+    ----------
+    layout: str :
+        Current layout of the columns.
+    n_rows: int :
+
+    columns_support: MultiDimensionalArray :
+        Support of the columns of the data, the frequent itemsets of the
+        previous level.
+    multiplier_mask_left: MultiDimensionalArray :
+
+    multiplier_mask_right: MultiDimensionalArray :
+
+    keep_memory: bool :
+        Skip layouts whose candidate columns take more bytes than in
+        `layout`, for levels that are not counted in batches.
+         (Default value = False)
+    weight_bits: int :
+        Bits of the largest row weight, weighted bitset columns are summed
+        once per bit (see `weighted_support`).
+         (Default value = 1)
+
+    Returns
+    -------
+    str
+        One of `LAYOUTS`, `layout` on ties.
+
+    """
+    level_bytes = _level_bytes(
+        n_rows, columns_support, multiplier_mask_left, multiplier_mask_right
+    )
+
+    def cost(name: str) -> float:
+        total = _counting_cost(name, level_bytes[name], weight_bits)
+        if name != layout:
+            total += CONVERSION_COST * (level_bytes[layout][0] + level_bytes[name][0])
+        return total
+
+    layouts = LAYOUTS
+    if keep_memory:
+        memory = sum(level_bytes[layout][1:])
+        layouts = [name for name in LAYOUTS if sum(level_bytes[name][1:]) <= memory]
+    return min(layouts, key=lambda name: (cost(name), name != layout))
+
+
+def trim_pays_off(
+    layout: str,
+    n_rows: int,
+    columns_support: MultiDimensionalArray,
+    multiplier_mask_left: MultiDimensionalArray,
+    multiplier_mask_right: MultiDimensionalArray,
+    weight_bits: int = 1,
+) -> bool:
+    """Whether `trim_transactions` is cheap compared to counting the level
+
+    Reading the row lengths costs `ROW_LENGTH_COSTS` per entry of a dense
+    or bitset matrix and per stored entry of a sparse one. Trimming is
+    worth trying if that is at most `MAX_TRIM_SHARE` of the counting cost
+    estimated as in `choose_layout`.
+
+    Parameters
+    ----------
+    layout: str :
+
+    n_rows: int :
+
+    columns_support: MultiDimensionalArray :
+
+    multiplier_mask_left: MultiDimensionalArray :
+
+    multiplier_mask_right: MultiDimensionalArray :
+
+    weight_bits: int :
+         (Default value = 1)
+
+    Returns
+    -------
+    bool
+
+    """
+    level_bytes = _level_bytes(
+        n_rows, columns_support, multiplier_mask_left, multiplier_mask_right
+    )
+    if layout == "sparse":
+        n_entries = float(columns_support.sum())
+    else:
+        n_entries = float(n_rows) * len(columns_support)
+    trim_cost = ROW_LENGTH_COSTS[layout] * n_entries
+    counting_cost = _counting_cost(layout, level_bytes[layout], weight_bits)
+    return trim_cost <= MAX_TRIM_SHARE * counting_cost
 
 
 def generate_candidates(
     previous_candidates: MultiDimensionalArray,
-    previous_multiplier_mask: List[int] = None,
-) -> Tuple[List[int], List[int]]:
+    previous_multiplier_mask: MultiDimensionalArray = None,
+) -> Tuple[MultiDimensionalArray, MultiDimensionalArray]:
     """Generate candidate set from `previous_candidates` with size `k`
 
+    Candidates sharing a prefix form a contiguous group (rows with the same
+    value of `previous_multiplier_mask`). Every pair ``i < j`` inside a group
+    is joined. Pairs are enumerated with array arithmetic only: row ``i`` of
+    a group of size ``c`` starting at ``start`` contributes ``c - 1 - (i -
+    start)`` pairs, so the left index of each pair is found by searching the
+    pair offsets and the right index follows from the position inside the
+    run of pairs.
+
     Parameters
     ----------
     previous_candidates: np.ndarray :
 
-    previous_multiplier_mask: List[int] :
+    previous_multiplier_mask: MultiDimensionalArray :
+        Left multiplier mask of `previous_candidates`, ``None`` for
+        candidates of size 1.
          (Default value = None)
 
     Returns
     -------
+    tuple
+        int32 arrays ``(multiplier_mask_left, multiplier_mask_right)``.
 
     """
+    numpy_or_cupy = get_numpy_or_cupy(previous_candidates)
+    empty = numpy_or_cupy.zeros(0, dtype=numpy_or_cupy.int32)
 
     # number of previous candidates
     d = previous_candidates.shape[0]
 
     # If no previous candidates then return empty arrays
     if d <= 1:
-        return [], []
+        return empty, empty
 
     if previous_multiplier_mask is None:  # Generate candidates with size 2
-        perm = combinations(range(0, d), 2)
-        multiplier_mask_left, multiplier_mask_right = map(list, zip(*perm))
+        group_size = numpy_or_cupy.full(d, d, dtype=numpy_or_cupy.int64)
+        group_start = numpy_or_cupy.zeros(d, dtype=numpy_or_cupy.int64)
     else:  # Generate candidates with size > 2
-        count_arr = np.bincount(previous_multiplier_mask)
-        no_zeros_mask = count_arr > 0
-        count_arr = count_arr[no_zeros_mask]
-        cum_n = np.cumsum(count_arr)
-        cum_n = np.concatenate((np.array([0]), cum_n))
-        cum_n = cum_n[:-1].copy()
-        multiplier_mask_left = []
-        multiplier_mask_right = []
-        if len(count_arr) == 0:
-            return [], []
-        for i, count in enumerate(count_arr):
-            if count == 1:
-                continue
-            offset = cum_n[i]
-            perm = combinations(range(offset, offset + count), 2)
-            multiplier_mask_left_part, multiplier_mask_right_part = map(
-                list, zip(*perm)
-            )
-            multiplier_mask_left += multiplier_mask_left_part
-            multiplier_mask_right += multiplier_mask_right_part
+        previous_multiplier_mask = numpy_or_cupy.asarray(previous_multiplier_mask)
+        count_arr = numpy_or_cupy.bincount(previous_multiplier_mask)
+        cum_n = numpy_or_cupy.cumsum(count_arr) - count_arr
+        group_size = count_arr[previous_multiplier_mask]
+        group_start = cum_n[previous_multiplier_mask]
+
+    rows = numpy_or_cupy.arange(d, dtype=numpy_or_cupy.int64)
+    pair_count = group_size - 1 - (rows - group_start)
+    pair_offset = numpy_or_cupy.cumsum(pair_count) - pair_count
+    n_pairs = int(pair_count.sum())
+    if n_pairs == 0:
+        return empty, empty
+
+    pairs = numpy_or_cupy.arange(n_pairs, dtype=numpy_or_cupy.int64)
+    multiplier_mask_left = (
+        numpy_or_cupy.searchsorted(pair_offset, pairs, side="right") - 1
+    )
+    multiplier_mask_right = (
+        multiplier_mask_left + 1 + pairs - pair_offset[multiplier_mask_left]
+    )
+    return (
+        multiplier_mask_left.astype(numpy_or_cupy.int32),
+        multiplier_mask_right.astype(numpy_or_cupy.int32),
+    )
+
+
+def match_itemsets(
+    reference: MultiDimensionalArray,
+    queries: MultiDimensionalArray,
+    reference_sorted: bool = False,
+) -> MultiDimensionalArray:
+    """Find rows of `queries` in `reference`
+
+    The reference is used as a sorted index: rows are searched column by
+    column with ``searchsorted`` on keys combining the rank of the prefix
+    already matched with the item of the current column.
+
+    Parameters
+    ----------
+    reference: MultiDimensionalArray :
+        ``(n_reference, k)`` integer item ids, -1 is allowed as padding.
+    queries: MultiDimensionalArray :
+        ``(n_queries, k)`` integer item ids in the same item order.
+    reference_sorted: bool :
+        Rows of `reference` are already in lexicographic order.
+         (Default value = False)
+
+    Returns
+    -------
+    MultiDimensionalArray
+        Index of the matching `reference` row for every query, -1 if the
+        query is not in `reference`.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(reference)
+    n_reference = reference.shape[0]
+    n_queries = queries.shape[0]
+    if n_reference == 0 or n_queries == 0:
+        return numpy_or_cupy.full(n_queries, -1, dtype=numpy_or_cupy.int64)
+    order = None
+    if not reference_sorted:
+        order = numpy_or_cupy.lexsort(reference.T[::-1])
+        reference = reference[order]
+    base = max(int(reference.max()), int(queries.max())) + 2
+
+    reference_rank = numpy_or_cupy.zeros(n_reference, dtype=numpy_or_cupy.int64)
+    query_rank = numpy_or_cupy.zeros(n_queries, dtype=numpy_or_cupy.int64)
+    found = numpy_or_cupy.ones(n_queries, dtype=bool)
+    position = None
+    for column in range(reference.shape[1]):
+        reference_key = reference_rank * base + reference[:, column] + 1
+        query_key = query_rank * base + queries[:, column] + 1
+        position = numpy_or_cupy.searchsorted(reference_key, query_key)
+        position = numpy_or_cupy.minimum(position, n_reference - 1)
+        found &= reference_key[position] == query_key
+
+        # Rank of the prefix ending with this column
+        changed = numpy_or_cupy.ones(n_reference, dtype=numpy_or_cupy.int64)
+        changed[1:] = reference_key[1:] != reference_key[:-1]
+        reference_rank = numpy_or_cupy.cumsum(changed) - 1
+        query_rank = reference_rank[position]
+
+    if order is not None:
+        position = order[position]
+    return numpy_or_cupy.where(found, position, -1)
+
+
+def prune_candidates(
+    previous_candidates: MultiDimensionalArray,
+    multiplier_mask_left: MultiDimensionalArray,
+    multiplier_mask_right: MultiDimensionalArray,
+) -> Tuple[MultiDimensionalArray, MultiDimensionalArray]:
+    """Drop candidates with an infrequent subset (Apriori property)
+
+    A joined candidate of size `k` is frequent only if all of its ``k - 1``
+    subsets are in `previous_candidates`. The two subsets it was joined from
+    are frequent by construction, the remaining ``k - 2`` are looked up in a
+    sorted index of `previous_candidates`.
+
+    Parameters
+    ----------
+    previous_candidates: MultiDimensionalArray :
+        ``(n_candidates, k - 1)`` integer itemsets with ascending item ids in
+        every row and rows in lexicographic order, as produced by the
+        level-wise join.
+    multiplier_mask_left: MultiDimensionalArray :
+
+    multiplier_mask_right: MultiDimensionalArray :
+
+
+    Returns
+    -------
+    tuple
+        Filtered ``(multiplier_mask_left, multiplier_mask_right)``.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(previous_candidates)
+    size = previous_candidates.shape[1] + 1
+    if size <= 2 or len(multiplier_mask_left) == 0:
+        return multiplier_mask_left, multiplier_mask_right
+    multiplier_mask_left = numpy_or_cupy.asarray(multiplier_mask_left)
+    multiplier_mask_right = numpy_or_cupy.asarray(multiplier_mask_right)
+    candidates = join_candidates(
+        previous_candidates, multiplier_mask_left, multiplier_mask_right
+    )
+    # All subsets not used by the join, stacked for a single index lookup
+    subsets = numpy_or_cupy.concatenate(
+        [
+            numpy_or_cupy.delete(candidates, removed, axis=1)
+            for removed in range(size - 2)
+        ],
+        axis=0,
+    )
+    matches = match_itemsets(previous_candidates, subsets, reference_sorted=True)
+    keep = (matches >= 0).reshape(size - 2, -1).all(axis=0)
+    return multiplier_mask_left[keep], multiplier_mask_right[keep]
+
+
+def covered_itemsets(
+    itemsets: MultiDimensionalArray,
+    itemsets_support: MultiDimensionalArray,
+    supersets: MultiDimensionalArray,
+    supersets_support: MultiDimensionalArray,
+    same_support: bool = False,
+) -> MultiDimensionalArray:
+    """Flag itemsets contained in one of the next level itemsets
+
+    An itemset is maximal if no frequent superset exists and closed if no
+    superset has the same support. By the Apriori property it is enough to
+    check the supersets with one more item, so every subset of `supersets`
+    is looked up in `itemsets` with a single batched search.
+
+    Parameters
+    ----------
+    itemsets: MultiDimensionalArray :
+        ``(n_itemsets, k)`` integer itemsets with ascending item ids in every
+        row and rows in lexicographic order.
+    itemsets_support: MultiDimensionalArray :
+
+    supersets: MultiDimensionalArray :
+        ``(n_supersets, k + 1)`` frequent integer itemsets.
+    supersets_support: MultiDimensionalArray :
+
+    same_support: bool :
+        Only count supersets with the same support as the itemset (closed
+        check) instead of any superset (maximal check).
+         (Default value = False)
+
+    Returns
+    -------
+    MultiDimensionalArray
+        Boolean mask of the itemsets with a (same support) superset.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(itemsets)
+    covered = numpy_or_cupy.zeros(len(itemsets), dtype=bool)
+    size = supersets.shape[1]
+    if len(supersets) == 0:
+        return covered
+    subsets = numpy_or_cupy.concatenate(
+        [numpy_or_cupy.delete(supersets, removed, axis=1) for removed in range(size)],
+        axis=0,
+    )
+    matches = match_itemsets(itemsets, subsets, reference_sorted=True)
+    matched = matches >= 0
+    if same_support:
+        subsets_support = numpy_or_cupy.tile(supersets_support, size)
+        matched &= itemsets_support[matches] == subsets_support
+    covered[matches[matched]] = True
+    return covered
+
+
+def intersect_columns(left: Data, right: Data) -> Data:
+    """Intersect columns of two matrices of the same shape
+
+    Parameters
+    ----------
+    left: Data :
+
+    right: Data :
+
+
+    Returns
+    -------
+    Data
+
+    """
+    if is_sparse(left) or isinstance(left, BitsetMatrix):
+        return left.multiply(right)
+    return left * right
+
+
+def count_itemsets(
+    data: Data,
+    itemsets: MultiDimensionalArray,
+    n_jobs: int = 1,
+    weights: Optional[MultiDimensionalArray] = None,
+    batch_size: Optional[int] = None,
+) -> MultiDimensionalArray:
+    """Count support of `itemsets` from single item columns
+
+    Parameters
+    ----------
+    data: Data :
+        Transactions with one column per item.
+    itemsets: MultiDimensionalArray :
+        ``(n_itemsets, k)`` column indices of `data`.
+    n_jobs: int :
+        Number of threads counting row blocks of host data.
+         (Default value = 1)
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, see `get_support`.
+         (Default value = None)
+    batch_size: Optional[int] :
+        Itemsets whose columns are intersected at once, ``None`` intersects
+        all of them at once.
+         (Default value = None)
+
+    Returns
+    -------
+    MultiDimensionalArray
+        Support of every itemset.
 
-    return multiplier_mask_left, multiplier_mask_right
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    if batch_size is not None and batch_size < len(itemsets):
+        support = []
+        for start in range(0, len(itemsets), batch_size):
+            stop = start + batch_size
+            support.append(count_itemsets(data, itemsets[start:stop], n_jobs, weights))
+        return numpy_or_cupy.concatenate(support)
+    if _use_threads(numpy_or_cupy, n_jobs):
+        return map_row_blocks(
+            lambda block, block_weights=None: count_itemsets(
+                block, itemsets, weights=block_weights
+            ),
+            data,
+            n_jobs,
+            weights,
+        )
+    columns = data[:, itemsets[:, 0]]
+    for position in range(1, itemsets.shape[1]):
+        columns = intersect_columns(columns, data[:, itemsets[:, position]])
+    return get_support(columns, numpy_or_cupy, weights=weights)
+
+
+def prefix_support(
+    data: Data,
+    previous_candidates: MultiDimensionalArray,
+    multiplier_mask_left: MultiDimensionalArray,
+    multiplier_mask_right: MultiDimensionalArray,
+    cache_size: int = 1024,
+    n_jobs: int = 1,
+    weights: Optional[MultiDimensionalArray] = None,
+) -> MultiDimensionalArray:
+    """Count support of joined candidates from single item columns
+
+    A candidate is its left parent (the shared prefix) extended by the last
+    item of the right parent. Instead of carrying the columns of the whole
+    previous level, the prefix intersections are recomputed from `data` for
+    `cache_size` parents at a time and reused by all candidates of those
+    parents, which are counted in slices of `cache_size`.
+
+    Parameters
+    ----------
+    data: Data :
+        Transactions with one column per item.
+    previous_candidates: MultiDimensionalArray :
+        ``(n_candidates, k - 1)`` column indices of `data`.
+    multiplier_mask_left: MultiDimensionalArray :
+        Non-decreasing, as produced by `generate_candidates`.
+    multiplier_mask_right: MultiDimensionalArray :
+
+    cache_size: int :
+        Number of prefix and candidate columns held at once.
+         (Default value = 1024)
+    n_jobs: int :
+        Number of threads counting row blocks of host data.
+         (Default value = 1)
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, the support of a column is the sum of the
+        weights of its rows. ``None`` counts every row once.
+         (Default value = None)
+
+    Returns
+    -------
+    MultiDimensionalArray
+        Support of every candidate.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    if _use_threads(numpy_or_cupy, n_jobs):
+        return map_row_blocks(
+            lambda block, block_weights=None: prefix_support(
+                block,
+                previous_candidates,
+                multiplier_mask_left,
+                multiplier_mask_right,
+                cache_size,
+                weights=block_weights,
+            ),
+            data,
+            n_jobs,
+            weights,
+        )
+    if is_sparse(data) and data.format == "csr":
+        data = data.tocsc()
+    multiplier_mask_left = numpy_or_cupy.asarray(multiplier_mask_left)
+    last_items = previous_candidates[numpy_or_cupy.asarray(multiplier_mask_right), -1]
+    support = numpy_or_cupy.zeros(len(multiplier_mask_left), dtype=numpy_or_cupy.int64)
+    parents = numpy_or_cupy.unique(multiplier_mask_left)
+    for parents_start in range(0, len(parents), cache_size):
+        parents_end = parents_start + cache_size
+        batch_parents = parents[parents_start:parents_end]
+        prefix_items = previous_candidates[batch_parents]
+        prefixes = data[:, prefix_items[:, 0]]
+        for position in range(1, prefix_items.shape[1]):
+            prefixes = intersect_columns(prefixes, data[:, prefix_items[:, position]])
+        first = int(numpy_or_cupy.searchsorted(multiplier_mask_left, batch_parents[0]))
+        last = int(
+            numpy_or_cupy.searchsorted(
+                multiplier_mask_left, batch_parents[-1], side="right"
+            )
+        )
+        for start in range(first, last, cache_size):
+            end = min(start + cache_size, last)
+            local = numpy_or_cupy.searchsorted(
+                batch_parents, multiplier_mask_left[start:end]
+            )
+            support[start:end] = get_support(
+                intersect_columns(prefixes[:, local], data[:, last_items[start:end]]),
+                numpy_or_cupy,
+                weights=weights,
+            )
+    return support
 
 
 def itemsets_support(
-    data: Data, multiplier_mask_left: List[int], multiplier_mask_right: List[int]
+    data: Data,
+    multiplier_mask_left: List[int],
+    multiplier_mask_right: List[int],
+    n_jobs: int = 1,
+    weights: Optional[MultiDimensionalArray] = None,
 ) -> Tuple[Data, MultiDimensionalArray]:
     """Get support for `itemsets` and return sets with minimal `support
 
@@ -168,25 +983,280 @@ def itemsets_support(
 
     multiplier_mask_right: List[int] :
 
+    n_jobs: int :
+        Number of threads counting row blocks of host data. The supports are
+        integer sums, so they match the single threaded result exactly.
+         (Default value = 1)
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, the support of a column is the sum of the
+        weights of its rows. ``None`` counts every row once.
+         (Default value = None)
 
     Returns
     -------
 
     """
     numpy_or_cupy = get_numpy_or_cupy(data)
-    if numpy_or_cupy == cp:
-        mempool = cp.get_default_memory_pool()
+    if numpy_or_cupy is not np:
+        mempool = numpy_or_cupy.get_default_memory_pool()
         mempool.free_all_blocks()
 
-    if isinstance(data, (csr_matrix, csc_matrix, cupy_csr_matrix)):
-        data = data[:, multiplier_mask_left].multiply(data[:, multiplier_mask_right])
-    else:
-        data = data[:, multiplier_mask_left] * data[:, multiplier_mask_right]
+    if _use_threads(numpy_or_cupy, n_jobs):
+        return parallel_itemsets_support(
+            data, multiplier_mask_left, multiplier_mask_right, n_jobs, weights
+        )
 
-    data_support = get_support(data, numpy_or_cupy)
+    data = intersect_columns(
+        data[:, multiplier_mask_left], data[:, multiplier_mask_right]
+    )
+
+    data_support = get_support(data, numpy_or_cupy, weights=weights)
     return data, data_support
 
 
+def join_candidates(
+    previous_candidates: MultiDimensionalArray,
+    multiplier_mask_left: List[int],
+    multiplier_mask_right: List[int],
+) -> MultiDimensionalArray:
+    """Join pairs of `previous_candidates` sharing the same prefix
+
+    Parameters
+    ----------
+    previous_candidates: MultiDimensionalArray :
+        Dense boolean rows or ``(n_candidates, k - 1)`` integer item ids.
+    multiplier_mask_left: List[int] :
+
+    multiplier_mask_right: List[int] :
+
+
+    Returns
+    -------
+    MultiDimensionalArray
+        Joined candidates in the representation of `previous_candidates`.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(previous_candidates)
+    if previous_candidates.dtype.kind in "iu":
+        return numpy_or_cupy.concatenate(
+            (
+                previous_candidates[multiplier_mask_left, :],
+                previous_candidates[multiplier_mask_right, -1:],
+            ),
+            axis=1,
+        )
+    return (
+        previous_candidates[multiplier_mask_left, :]
+        + previous_candidates[multiplier_mask_right, :]
+    )
+
+
+def itemsets_to_dense(
+    itemsets: MultiDimensionalArray, n_items: int
+) -> MultiDimensionalArray:
+    """Convert ``(n_itemsets, k)`` item ids to dense boolean rows
+
+    Parameters
+    ----------
+    itemsets: MultiDimensionalArray :
+        Item ids, negative ids are treated as padding.
+    n_items: int :
+        Width of the dense rows.
+
+    Returns
+    -------
+    MultiDimensionalArray
+        ``(n_itemsets, n_items)`` boolean array.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(itemsets)
+    dense = numpy_or_cupy.zeros((itemsets.shape[0], n_items + 1), dtype=bool)
+    rows = numpy_or_cupy.arange(itemsets.shape[0]).reshape(-1, 1)
+    dense[rows, numpy_or_cupy.where(itemsets < 0, n_items, itemsets)] = True
+    return dense[:, :n_items]
+
+
+def itemsets_to_ids(itemsets: MultiDimensionalArray) -> MultiDimensionalArray:
+    """Convert dense boolean rows to sorted item ids padded with -1
+
+    Parameters
+    ----------
+    itemsets: MultiDimensionalArray :
+        ``(n_itemsets, n_items)`` boolean array.
+
+    Returns
+    -------
+    MultiDimensionalArray
+        ``(n_itemsets, max_k)`` int32 array, the inverse of
+        `itemsets_to_dense`.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(itemsets)
+    itemsets = itemsets.astype(bool)
+    lengths = itemsets.sum(axis=1)
+    width = int(lengths.max()) if len(itemsets) > 0 else 0
+    ids = numpy_or_cupy.full((len(itemsets), width), -1, dtype=numpy_or_cupy.int32)
+    rows, columns = numpy_or_cupy.nonzero(itemsets)
+    starts = numpy_or_cupy.cumsum(lengths) - lengths
+    positions = numpy_or_cupy.arange(len(rows)) - starts[rows]
+    ids[rows, positions] = columns
+    return ids
+
+
+def pad_itemsets(levels: List[MultiDimensionalArray]) -> MultiDimensionalArray:
+    """Stack item ids of different lengths into one array padded with -1
+
+    Parameters
+    ----------
+    levels: List[MultiDimensionalArray] :
+        ``(n_itemsets, k)`` item id arrays.
+
+    Returns
+    -------
+    MultiDimensionalArray
+        ``(n_itemsets, max_k)`` int32 array, shorter itemsets are right padded
+        with -1.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(levels[0])
+    width = max(level.shape[1] for level in levels)
+    padded = numpy_or_cupy.full(
+        (sum(level.shape[0] for level in levels), width), -1, dtype=numpy_or_cupy.int32
+    )
+    start = 0
+    for level in levels:
+        end = start + level.shape[0]
+        length = level.shape[1]
+        padded[start:end, :length] = level
+        start = end
+    return padded
+
+
+def format_itemsets(
+    levels: List[MultiDimensionalArray],
+    levels_support: List[MultiDimensionalArray],
+    items: MultiDimensionalArray,
+    n_items: int,
+    itemset_format: str = "dense",
+    labels: Optional[np.ndarray] = None,
+) -> tuple:
+    """Convert itemsets of every level to the result format of `fit`
+
+    Parameters
+    ----------
+    levels: List[MultiDimensionalArray] :
+        ``(n_itemsets, k)`` positions of the items in `items`.
+    levels_support: List[MultiDimensionalArray] :
+        Support of the itemsets of every level.
+    items: MultiDimensionalArray :
+        Item id of every position.
+    n_items: int :
+        Number of columns of the transactions.
+    itemset_format: str :
+        ``"dense"`` boolean rows, ``"ids"`` sorted item ids padded with -1,
+        ``"labels"``, the item ids replaced by `labels` in a host object
+        array padded with ``None``, or ``"compact"``, a `FrequentItemsets`.
+         (Default value = "dense")
+    labels: Optional[np.ndarray] :
+        Name of every column, defaults to the column index.
+         (Default value = None)
+
+    Returns
+    -------
+    tuple
+        ``(itemsets, support)``, both ``None`` if `levels` is empty.
+
+    """
+    if not levels:
+        return None, None
+    if itemset_format == "compact":
+        itemsets = FrequentItemsets.from_levels(
+            levels, levels_support, items, n_items, labels
+        )
+        return itemsets, itemsets.support
+    numpy_or_cupy = get_numpy_or_cupy(items)
+    itemsets = pad_itemsets(
+        [numpy_or_cupy.sort(items[level], axis=1) for level in levels]
+    )
+    if itemset_format == "dense":
+        itemsets = itemsets_to_dense(itemsets, n_items)
+    elif itemset_format == "labels":
+        if numpy_or_cupy is not np:
+            itemsets = itemsets.get()
+        if labels is None:
+            labels = np.arange(n_items)
+        # Padding -1 selects the appended None
+        itemsets = np.append(np.asarray(labels, dtype=object), None)[itemsets]
+    return itemsets, numpy_or_cupy.concatenate(levels_support)
+
+
+def group_itemsets(
+    blocks: List[Tuple[MultiDimensionalArray, MultiDimensionalArray]],
+    items: MultiDimensionalArray,
+    min_length: int = 1,
+) -> Tuple[List[MultiDimensionalArray], List[MultiDimensionalArray]]:
+    """Group itemsets mined in arbitrary order into levels
+
+    Parameters
+    ----------
+    blocks: List[Tuple[MultiDimensionalArray, MultiDimensionalArray]] :
+        ``(itemsets, support)`` pairs, itemsets as ``(n_itemsets, k)``
+        positions of the items in `items`.
+    items: MultiDimensionalArray :
+        Item id of every position.
+    min_length: int :
+        Shorter itemsets are dropped.
+         (Default value = 1)
+
+    Returns
+    -------
+    tuple
+        ``(levels, levels_support)`` for `format_itemsets`, levels ordered by
+        length and itemsets by their sorted item ids.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(items)
+    by_length = {}
+    for itemsets, support in blocks:
+        if itemsets.shape[1] >= min_length and len(itemsets) > 0:
+            by_length.setdefault(itemsets.shape[1], []).append((itemsets, support))
+    levels = []
+    levels_support = []
+    for length in sorted(by_length):
+        itemsets, support = zip(*by_length[length])
+        positions = numpy_or_cupy.concatenate(
+            [numpy_or_cupy.asarray(block) for block in itemsets]
+        ).astype(numpy_or_cupy.int32)
+        support = numpy_or_cupy.concatenate(
+            [numpy_or_cupy.asarray(block) for block in support]
+        ).astype(numpy_or_cupy.int64)
+        ids = numpy_or_cupy.sort(items[positions], axis=1)
+        order = numpy_or_cupy.lexsort(ids.T[::-1])
+        levels.append(positions[order])
+        levels_support.append(support[order])
+    return levels, levels_support
+
+
+def to_host_csr(data: Data) -> csr_matrix:
+    """Copy `data` to a scipy CSR matrix in host memory
+
+    Parameters
+    ----------
+    data: Data :
+
+
+    Returns
+    -------
+    csr_matrix
+
+    """
+    if isinstance(data, BitsetMatrix):
+        raise TypeError("BitsetMatrix cannot be converted to CSR")
+    if get_numpy_or_cupy(data) is not np:
+        data = data.get()
+    return csr_matrix(data)
+
+
 def min_support_set(
     previous_candidates: np.ndarray,
     candidates_support: MultiDimensionalArray,
@@ -194,7 +1264,7 @@ def min_support_set(
     multiplier_mask_left: List[int],
     multiplier_mask_right: List[int],
     min_support: int = 0,
-) -> Tuple[MultiDimensionalArray, MultiDimensionalArray, List[int], Data]:
+) -> Tuple[MultiDimensionalArray, MultiDimensionalArray, MultiDimensionalArray, Data]:
     """
 
     Parameters
@@ -224,15 +1294,178 @@ def min_support_set(
 
     data = data[:, over_support_mask]
     candidates_support = candidates_support[over_support_mask]
-    multiplier_mask_left = numpy_or_cupy.array(multiplier_mask_left)[
+    multiplier_mask_left = numpy_or_cupy.asarray(multiplier_mask_left)[
         over_support_mask
-    ].tolist()
-    multiplier_mask_right = numpy_or_cupy.array(multiplier_mask_right)[
+    ]
+    multiplier_mask_right = numpy_or_cupy.asarray(multiplier_mask_right)[
         over_support_mask
-    ].tolist()
+    ]
 
-    candidates = (
-        previous_candidates[multiplier_mask_left, :]
-        + previous_candidates[multiplier_mask_right, :]
+    candidates = join_candidates(
+        previous_candidates, multiplier_mask_left, multiplier_mask_right
     )
     return candidates, candidates_support, multiplier_mask_left, data
+
+
+def column_bytes(data: Data) -> int:
+    """Estimate the memory of one column of `data` in bytes
+
+    Parameters
+    ----------
+    data: Data :
+
+
+    Returns
+    -------
+    int
+        Bytes of a dense or bitset column, average bytes of the stored
+        entries of a sparse column.
+
+    """
+    if isinstance(data, BitsetMatrix):
+        return data.words.shape[1] * data.words.itemsize
+    if is_sparse(data):
+        entry_bytes = data.data.itemsize + data.indices.itemsize
+        return max(1, -(-data.nnz * entry_bytes // max(data.shape[1], 1)))
+    return max(1, data.shape[0] * data.dtype.itemsize)
+
+
+def concatenate_columns(blocks: List[Data]) -> Data:
+    """Stack column blocks of the same layout side by side
+
+    Dense and bitset blocks are copied into a preallocated result one at a
+    time and removed from `blocks`, so each block can be freed as soon as it
+    is copied if the caller holds no other reference to it.
+
+    Parameters
+    ----------
+    blocks: List[Data] :
+        Emptied by the call.
+
+    Returns
+    -------
+    Data
+
+    """
+    first = blocks[0]
+    if len(blocks) == 1:
+        return blocks.pop()
+    numpy_or_cupy = get_numpy_or_cupy(first)
+    if is_sparse(first):
+        if numpy_or_cupy is np:
+            from scipy.sparse import hstack
+        else:
+            from cupyx.scipy.sparse import hstack
+        result = hstack(blocks, format=first.format)
+        blocks.clear()
+        return result
+    if isinstance(first, BitsetMatrix):
+        n_columns = sum(block.words.shape[0] for block in blocks)
+        result = BitsetMatrix(
+            numpy_or_cupy.empty(
+                (n_columns, first.words.shape[1]), dtype=first.words.dtype
+            ),
+            first.n_rows,
+        )
+        target = result.words
+    else:
+        n_columns = sum(block.shape[1] for block in blocks)
+        result = numpy_or_cupy.empty(
+            (first.shape[0], n_columns), dtype=first.dtype, order="F"
+        )
+        target = result.T
+    del first
+    start = 0
+    while blocks:
+        block = blocks.pop(0)
+        block = block.words if isinstance(block, BitsetMatrix) else block.T
+        end = start + len(block)
+        target[start:end] = block
+        start = end
+    return result
+
+
+def batched_support_set(
+    previous_candidates: MultiDimensionalArray,
+    data: Data,
+    multiplier_mask_left: MultiDimensionalArray,
+    multiplier_mask_right: MultiDimensionalArray,
+    min_support: int = 0,
+    batch_size: Optional[int] = None,
+    n_jobs: int = 1,
+    profiler: Optional[LevelProfiler] = None,
+    weights: Optional[MultiDimensionalArray] = None,
+) -> Tuple[MultiDimensionalArray, MultiDimensionalArray, MultiDimensionalArray, Data]:
+    """Count and filter the candidates of a level in slices
+
+    `itemsets_support` materializes the left and right columns and their
+    intersection for every candidate it gets. Here the candidates are split
+    into slices of `batch_size`, each slice is counted and filtered by
+    `min_support_set` before the next one is allocated, so only the frequent
+    columns are kept between slices. The result equals one unbatched call.
+
+    Parameters
+    ----------
+    previous_candidates: MultiDimensionalArray :
+
+    data: Data :
+
+    multiplier_mask_left: MultiDimensionalArray :
+
+    multiplier_mask_right: MultiDimensionalArray :
+
+    min_support: int :
+         (Default value = 0)
+    batch_size: Optional[int] :
+        Candidates counted at once, ``None`` counts all of them together.
+         (Default value = None)
+    n_jobs: int :
+         (Default value = 1)
+    profiler: Optional[LevelProfiler] :
+        Times the ``"itemsets_support"`` and ``"min_support_set"`` stages.
+         (Default value = None)
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, see `itemsets_support`.
+         (Default value = None)
+
+    Returns
+    -------
+    tuple
+        ``(candidates, candidates_support, multiplier_mask_left, data)`` as
+        returned by `min_support_set`.
+
+    """
+    n_candidates = len(multiplier_mask_left)
+    if batch_size is None or n_candidates <= batch_size:
+        batch_size = max(n_candidates, 1)
+    if batch_size < n_candidates and is_sparse(data) and data.format == "csr":
+        # Column slices of CSR scan all entries, CSC reads only the slice
+        data = data.tocsc()
+    candidates = []
+    candidates_support = []
+    left_parts = []
+    data_parts = []
+    for start in range(0, max(n_candidates, 1), batch_size):
+        end = start + batch_size
+        left = multiplier_mask_left[start:end]
+        right = multiplier_mask_right[start:end]
+        with profile_stage(profiler, "itemsets_support"):
+            part_data, part_support = itemsets_support(
+                data, left, right, n_jobs, weights
+            )
+        with profile_stage(profiler, "min_support_set"):
+            part = min_support_set(
+                previous_candidates, part_support, part_data, left, right, min_support
+            )
+        candidates.append(part[0])
+        candidates_support.append(part[1])
+        left_parts.append(part[2])
+        data_parts.append(part[3])
+        del part, part_data
+    numpy_or_cupy = get_numpy_or_cupy(previous_candidates)
+    return (
+        numpy_or_cupy.concatenate(candidates),
+        numpy_or_cupy.concatenate(candidates_support),
+        numpy_or_cupy.concatenate(left_parts),
+        concatenate_columns(data_parts),
+    )
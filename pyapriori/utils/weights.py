@@ -0,0 +1,331 @@
+"""Weighted transactions: weighted support and transaction trimming."""
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+import numpy as np
+
+from pyapriori.utils.backend import get_numpy_or_cupy, is_sparse
+from pyapriori.utils.bitset import BitsetMatrix, pack_columns, popcount
+
+if TYPE_CHECKING:
+    from pyapriori.utils.utils import Data, MultiDimensionalArray
+
+# Bytes of a bitset chunk unpacked at once to read rows
+_UNPACK_BYTES = 2**26
+
+
+def weighted_support(
+    data: "Data", weights: "MultiDimensionalArray"
+) -> "MultiDimensionalArray":
+    """Sum `weights` of the rows containing every column
+
+    Bitset columns are counted once per bit of the weights: the rows with
+    bit `b` set form a bitset plane and ``popcount(column & plane) << b`` is
+    summed over the planes. Only the words in which a plane has set bits
+    are read, so rows weighing more than one are best kept together.
+
+    Parameters
+    ----------
+    data: Data :
+
+    weights: MultiDimensionalArray :
+        Non-negative integer weight of every row.
+
+    Returns
+    -------
+    MultiDimensionalArray
+        int64 weighted support of every column.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    weights = numpy_or_cupy.asarray(weights, dtype=numpy_or_cupy.int64)
+    if isinstance(data, BitsetMatrix):
+        return _weighted_popcount(data.words, weights, numpy_or_cupy)
+    if is_sparse(data) and numpy_or_cupy is not np:
+        # cupy sparse matrices are float32, which is exact for small counts only
+        support = data.T.astype(numpy_or_cupy.float64) @ weights.astype(
+            numpy_or_cupy.float64
+        )
+        return numpy_or_cupy.rint(support).astype(numpy_or_cupy.int64)
+    return numpy_or_cupy.asarray(data.T @ weights).ravel()
+
+
+def _weighted_popcount(
+    words: "MultiDimensionalArray",
+    weights: "MultiDimensionalArray",
+    numpy_or_cupy,
+) -> "MultiDimensionalArray":
+    """Weighted support of bitset `words` summed over bit planes"""
+    support = numpy_or_cupy.zeros(words.shape[0], dtype=numpy_or_cupy.int64)
+    if len(weights) == 0:
+        return support
+    base = int(weights.min())
+    if base > 0:
+        # Every row counts `base` times, the planes hold the excess weight
+        support += base * popcount(words, numpy_or_cupy).sum(
+            axis=1, dtype=numpy_or_cupy.int64
+        )
+        weights = weights - base
+    n_planes = int(weights.max()).bit_length()
+    shifts = numpy_or_cupy.arange(n_planes, dtype=numpy_or_cupy.int64)
+    planes = pack_columns(
+        ((weights.reshape(-1, 1) >> shifts) & 1).astype(numpy_or_cupy.bool_),
+        numpy_or_cupy,
+    ).words
+    for shift in range(n_planes):
+        used = numpy_or_cupy.flatnonzero(planes[shift])
+        if len(used) == 0:
+            continue
+        first, last = int(used[0]), int(used[-1]) + 1
+        if last - first == len(used):
+            plane_words = words[:, first:last] & planes[shift, first:last]
+        else:
+            plane_words = words[:, used] & planes[shift, used]
+        support += (
+            popcount(plane_words, numpy_or_cupy).sum(axis=1, dtype=numpy_or_cupy.int64)
+            << shift
+        )
+    return support
+
+
+def _column_chunks(data: "Data"):
+    """Dense boolean ``(columns, chunk)`` pairs covering the columns of `data`"""
+    n_rows, n_columns = data.shape
+    step = max(1, _UNPACK_BYTES // max(n_rows, 1))
+    for start in range(0, n_columns, step):
+        stop = min(start + step, n_columns)
+        if isinstance(data, BitsetMatrix):
+            chunk = BitsetMatrix(data.words[start:stop], n_rows).toarray()
+        else:
+            chunk = data[:, start:stop]
+        yield slice(start, stop), chunk
+
+
+def take_rows(data: "Data", rows: "MultiDimensionalArray") -> "Data":
+    """Rows `rows` of `data` in the layout of `data`
+
+    Parameters
+    ----------
+    data: Data :
+
+    rows: MultiDimensionalArray :
+        Row indices.
+
+    Returns
+    -------
+    Data
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    if isinstance(data, BitsetMatrix):
+        n_words = -(-len(rows) // 64)
+        words = numpy_or_cupy.empty((data.shape[1], n_words), dtype=data.words.dtype)
+        for columns, chunk in _column_chunks(data):
+            # Rows of the transposed chunk are contiguous tidsets
+            words[columns] = pack_columns(chunk.T[:, rows].T, numpy_or_cupy).words
+        return BitsetMatrix(words, len(rows))
+    if is_sparse(data):
+        if numpy_or_cupy is np:
+            return data[rows]
+        return data.tocsr()[rows].asformat(data.format)
+    if data.flags.f_contiguous and not data.flags.c_contiguous:
+        return numpy_or_cupy.asfortranarray(data[rows])
+    return data[rows]
+
+
+def row_lengths(data: "Data") -> "MultiDimensionalArray":
+    """Number of set columns of every row
+
+    Parameters
+    ----------
+    data: Data :
+
+
+    Returns
+    -------
+    MultiDimensionalArray
+        int64 length of every row.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    n_rows = data.shape[0]
+    if is_sparse(data):
+        if data.format == "csr":
+            return numpy_or_cupy.diff(data.indptr).astype(numpy_or_cupy.int64)
+        return numpy_or_cupy.bincount(data.tocsc().indices, minlength=n_rows).astype(
+            numpy_or_cupy.int64
+        )
+    lengths = numpy_or_cupy.zeros(n_rows, dtype=numpy_or_cupy.int64)
+    for _, chunk in _column_chunks(data):
+        lengths += chunk.sum(axis=1)
+    return lengths
+
+
+def row_keys(data: "Data") -> "MultiDimensionalArray":
+    """Hash of the set columns of every row
+
+    Every column gets two random 64-bit values and the key of a row is the
+    pair of their sums (modulo ``2**64``) over the set columns. Two different
+    rows share a key with probability ``2**-128``.
+
+    Parameters
+    ----------
+    data: Data :
+
+
+    Returns
+    -------
+    MultiDimensionalArray
+        ``(n_rows, 2)`` uint64 keys.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    n_rows, n_columns = data.shape
+    hashes = numpy_or_cupy.asarray(
+        np.random.RandomState(0)
+        .randint(np.iinfo(np.int64).min, np.iinfo(np.int64).max, (n_columns, 2))
+        .view(np.uint64)
+    )
+    if is_sparse(data):
+        data = data.tocsr()
+        if numpy_or_cupy is np:
+            return data @ hashes
+        # cupy sparse matrices are float32, sum the hashes of the entries
+        rows = numpy_or_cupy.repeat(
+            numpy_or_cupy.arange(n_rows), numpy_or_cupy.diff(data.indptr)
+        )
+        keys = numpy_or_cupy.zeros((n_rows, 2), dtype=numpy_or_cupy.uint64)
+        numpy_or_cupy.add.at(keys, rows, hashes[data.indices])
+        return keys
+    keys = numpy_or_cupy.zeros((n_rows, 2), dtype=numpy_or_cupy.uint64)
+    for columns, chunk in _column_chunks(data):
+        keys += chunk.astype(numpy_or_cupy.uint64) @ hashes[columns]
+    return keys
+
+
+def trim_transactions(
+    data: "Data",
+    weights: Optional["MultiDimensionalArray"],
+    min_items: int,
+    merge: bool = True,
+) -> Tuple["Data", Optional["MultiDimensionalArray"]]:
+    """Drop rows that cannot hold a candidate and merge identical rows
+
+    A row with fewer than `min_items` set columns supports no candidate of
+    the next level. Rows with the same columns are replaced by their first
+    occurrence weighted by the sum of their weights.
+
+    Parameters
+    ----------
+    data: Data :
+        Columns of the frequent itemsets of the last level.
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, ``None`` weighs every row once.
+    min_items: int :
+        Number of columns a row needs to stay.
+    merge: bool :
+        Merge identical rows, which hashes every row.
+         (Default value = True)
+
+    Returns
+    -------
+    tuple
+        ``(data, weights)``, `data` unchanged and `weights` as passed if no
+        row is dropped or merged.
+
+    """
+    numpy_or_cupy = get_numpy_or_cupy(data)
+    n_rows = data.shape[0]
+    kept = numpy_or_cupy.flatnonzero(row_lengths(data) >= min_items)
+    if weights is None:
+        weights = numpy_or_cupy.ones(n_rows, dtype=numpy_or_cupy.int64)
+        unweighted = True
+    else:
+        unweighted = False
+    if not merge:
+        if len(kept) == n_rows:
+            return data, None if unweighted else weights
+        return take_rows(data, kept), weights[kept]
+    kept_data = data if len(kept) == n_rows else take_rows(data, kept)
+    _, first, inverse = np.unique(
+        _to_host(row_keys(kept_data)),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    if len(first) == n_rows:
+        return data, None if unweighted else weights
+    if len(first) == len(kept):
+        return kept_data, weights[kept]
+    inverse = numpy_or_cupy.asarray(inverse.ravel())
+    merged_weights = numpy_or_cupy.zeros(len(first), dtype=numpy_or_cupy.int64)
+    numpy_or_cupy.add.at(merged_weights, inverse, weights[kept])
+    # Heavier rows first, so the bit planes of `weighted_support` are short
+    order = numpy_or_cupy.argsort(-merged_weights, kind="stable")
+    first = numpy_or_cupy.asarray(first)
+    return take_rows(kept_data, first[order]), merged_weights[order]
+
+
+def deduplicate_transactions(
+    data: "Data", weights: Optional["MultiDimensionalArray"] = None
+) -> Tuple["Data", Optional["MultiDimensionalArray"]]:
+    """Unique rows of `data` and the number (total weight) of each
+
+    Parameters
+    ----------
+    data: Data :
+
+    weights: Optional[MultiDimensionalArray] :
+        Weight of every row, ``None`` weighs every row once.
+         (Default value = None)
+
+    Returns
+    -------
+    tuple
+        ``(data, weights)`` as returned by `trim_transactions`, heavier rows
+        first.
+
+    """
+    return trim_transactions(data, weights, 0)
+
+
+def check_weights(
+    weights: Optional[Any], n_rows: int, numpy_or_cupy: ModuleType
+) -> Optional["MultiDimensionalArray"]:
+    """Validate row weights and move them to the module of the data
+
+    Parameters
+    ----------
+    weights: Optional[Any] :
+        Array-like of non-negative integers, one per row.
+    n_rows: int :
+
+    numpy_or_cupy: ModuleType :
+        Module of the transactions.
+
+    Returns
+    -------
+    Optional[MultiDimensionalArray]
+        int64 weights, ``None`` if `weights` is ``None``.
+
+    """
+    if weights is None:
+        return None
+    weights = numpy_or_cupy.asarray(weights).ravel()
+    if weights.dtype.kind not in "biu":
+        raise ValueError("weights must be integers, got dtype {}".format(weights.dtype))
+    if len(weights) != n_rows:
+        raise ValueError(
+            "Expected {} weights, one per transaction, got {}".format(
+                n_rows, len(weights)
+            )
+        )
+    weights = weights.astype(numpy_or_cupy.int64)
+    if len(weights) > 0 and int(weights.min()) < 0:
+        raise ValueError("weights must be non-negative")
+    return weights
+
+
+def _to_host(array: "MultiDimensionalArray") -> np.ndarray:
+    """numpy array of a numpy or cupy `array`"""
+    return array.get() if hasattr(array, "get") else np.asarray(array)
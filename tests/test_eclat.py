@@ -0,0 +1,75 @@
+"""Tests for `pyapriori.eclat` module."""
+import unittest
+
+import cupy as cp
+import numpy as np
+from cupyx.scipy.sparse import csr_matrix as cupy_csr_matrix
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import PyApriori, PyEclat
+from pyapriori.utils.utils import get_numpy_or_cupy
+
+
+class TestPyEclat(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_pyeclat(self, type_array):
+        transactions = [
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, False, True, False, False],
+            [True, False, False, False, True, True],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+        ]
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+        py_eclat = PyEclat(2, 2)
+        itemsets, support = py_eclat.fit(data_transactions)
+
+        expected_itemsets = numpy_or_cupy.array(
+            [
+                [True, True, False, False, False, False],
+                [True, False, True, False, False, False],
+                [False, True, True, False, False, False],
+                [True, True, True, False, False, False],
+            ]
+        )
+        numpy_or_cupy.testing.assert_array_equal(expected_itemsets, itemsets)
+
+        expected_support = numpy_or_cupy.array([6, 5, 5, 5])
+        numpy_or_cupy.testing.assert_array_equal(expected_support, support)
+
+    @parameterized.expand(
+        [
+            (0.2, 1, True),
+            (0.5, 2, True),
+            (0.8, 3, True),
+            (0.5, 1, False),
+        ]
+    )
+    def test_pyeclat_pyapriori(self, density, min_length, diffsets):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(200, 10) < density
+
+        itemsets, support = PyApriori(10, min_length, itemset_format="ids").fit(
+            transactions
+        )
+        eclat_itemsets, eclat_support = PyEclat(
+            10, min_length, itemset_format="ids", diffsets=diffsets
+        ).fit(transactions)
+
+        self.assertEqual(
+            dict(zip(map(tuple, itemsets.tolist()), support.tolist())),
+            dict(zip(map(tuple, eclat_itemsets.tolist()), eclat_support.tolist())),
+        )
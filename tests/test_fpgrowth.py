@@ -0,0 +1,74 @@
+"""Tests for `pyapriori.fpgrowth` module."""
+import unittest
+
+import cupy as cp
+import numpy as np
+from cupyx.scipy.sparse import csr_matrix as cupy_csr_matrix
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import PyApriori, PyFPGrowth
+from pyapriori.utils.utils import get_numpy_or_cupy
+
+
+class TestPyFPGrowth(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_pyfpgrowth(self, type_array):
+        transactions = [
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, False, True, False, False],
+            [True, False, False, False, True, True],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+        ]
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+        py_fpgrowth = PyFPGrowth(2, 2)
+        itemsets, support = py_fpgrowth.fit(data_transactions)
+
+        expected_itemsets = numpy_or_cupy.array(
+            [
+                [True, True, False, False, False, False],
+                [True, False, True, False, False, False],
+                [False, True, True, False, False, False],
+                [True, True, True, False, False, False],
+            ]
+        )
+        numpy_or_cupy.testing.assert_array_equal(expected_itemsets, itemsets)
+
+        expected_support = numpy_or_cupy.array([6, 5, 5, 5])
+        numpy_or_cupy.testing.assert_array_equal(expected_support, support)
+
+    @parameterized.expand([(0.2, 1), (0.5, 2), (0.8, 3)])
+    def test_pyfpgrowth_pyapriori(self, density, min_length):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(200, 10) < density
+
+        itemsets, support = PyApriori(10, min_length, itemset_format="ids").fit(
+            transactions
+        )
+        fp_itemsets, fp_support = PyFPGrowth(10, min_length, itemset_format="ids").fit(
+            transactions
+        )
+
+        self.assertEqual(
+            dict(zip(map(tuple, itemsets.tolist()), support.tolist())),
+            dict(zip(map(tuple, fp_itemsets.tolist()), fp_support.tolist())),
+        )
+
+    def test_pyfpgrowth_empty(self):
+        itemsets, support = PyFPGrowth(5, 1).fit(np.eye(3, dtype=bool))
+
+        self.assertIsNone(itemsets)
+        self.assertIsNone(support)
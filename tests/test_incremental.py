@@ -0,0 +1,74 @@
+"""Tests for `pyapriori.incremental` module."""
+import unittest
+
+import cupy as cp
+import numpy as np
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import PyApriori, PyIncrementalApriori
+from pyapriori.utils.utils import get_numpy_or_cupy
+
+
+class TestPyIncrementalApriori(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+        ]
+    )
+    def test_update_equals_fit(self, type_array):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(200, 8) < np.linspace(0.2, 0.7, 8)
+        miner = PyIncrementalApriori(30, 1, itemset_format="ids")
+        miner.fit(type_array(transactions[:120]))
+
+        for start, end in ((120, 150), (150, 151), (151, 200)):
+            itemsets, support = miner.update(type_array(transactions[start:end]))
+
+            expected_itemsets, expected_support = PyApriori(
+                30, 1, itemset_format="ids"
+            ).fit(type_array(transactions[:end]))
+            numpy_or_cupy = get_numpy_or_cupy(expected_support)
+            numpy_or_cupy.testing.assert_array_equal(expected_itemsets, itemsets)
+            numpy_or_cupy.testing.assert_array_equal(expected_support, support)
+
+    def test_update_rescans_border_crossings(self):
+        transactions = np.array(
+            [
+                [True, True, False],
+                [True, True, False],
+                [True, False, True],
+            ]
+        )
+        miner = PyIncrementalApriori(2, 2, itemset_format="ids")
+        itemsets, support = miner.fit(transactions)
+        np.testing.assert_array_equal([[0, 1]], itemsets)
+        self.assertEqual({2: 1}, miner.rescanned_candidates)
+
+        itemsets, support = miner.update(np.array([[False, True, True]]))
+
+        # {1, 2} and {0, 2} become candidates once item 2 is frequent
+        self.assertEqual({2: 2}, miner.rescanned_candidates)
+        np.testing.assert_array_equal([[0, 1]], itemsets)
+        np.testing.assert_array_equal([2], support)
+
+    def test_update_new_items(self):
+        miner = PyIncrementalApriori(2, 2, itemset_format="ids")
+        self.assertEqual((None, None), miner.fit(np.array([[True, True]])))
+
+        itemsets, support = miner.update(np.array([[True, True, True]]))
+
+        np.testing.assert_array_equal([[0, 1]], itemsets)
+        np.testing.assert_array_equal([2], support)
+
+    def test_unknown_itemset_format(self):
+        with self.assertRaises(ValueError):
+            PyIncrementalApriori(itemset_format="sets")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for `pyapriori.partition` module."""
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import cupy as cp
+import numpy as np
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import PyApriori, PyPartitionApriori
+from pyapriori.utils.utils import get_numpy_or_cupy
+
+
+def _as_dict(itemsets, support):
+    if hasattr(itemsets, "get"):
+        itemsets, support = itemsets.get(), support.get()
+    return dict(zip(map(tuple, itemsets.tolist()), support.tolist()))
+
+
+class TestPyPartitionApriori(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (np.array, "bitset"),
+        ]
+    )
+    def test_partition_equals_fit(self, type_array, backend="default"):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(300, 10) < np.linspace(0.1, 0.6, 10)
+        data_transactions = type_array(transactions)
+
+        itemsets, support = PyApriori(25, 1, itemset_format="ids").fit(
+            data_transactions
+        )
+        for n_partitions in (1, 3, 7):
+            miner = PyPartitionApriori(
+                25, 1, itemset_format="ids", n_partitions=n_partitions, backend=backend
+            )
+            partition_itemsets, partition_support = miner.fit(data_transactions)
+
+            self.assertEqual(
+                _as_dict(itemsets, support),
+                _as_dict(partition_itemsets, partition_support),
+            )
+            self.assertGreaterEqual(
+                sum(miner.n_candidates.values()),
+                sum(length > 1 for length in (itemsets >= 0).sum(axis=1).tolist()),
+            )
+
+    @parameterized.expand([(ThreadPoolExecutor,), (ProcessPoolExecutor,)])
+    def test_partition_executor(self, executor_type):
+        random_state = np.random.RandomState(1)
+        transactions = csr_matrix(random_state.rand(400, 12) < 0.3)
+
+        expected = PyApriori(0.05, 2, itemset_format="ids").fit(transactions)
+        with executor_type(max_workers=2) as executor:
+            itemsets, support = PyPartitionApriori(
+                0.05, 2, itemset_format="ids", n_partitions=4, executor=executor
+            ).fit(transactions)
+
+        self.assertEqual(_as_dict(*expected), _as_dict(itemsets, support))
+
+    def test_partition_process_pool(self):
+        transactions = np.random.RandomState(2).rand(200, 8) < 0.4
+
+        expected = PyApriori(20, 2, itemset_format="ids").fit(transactions)
+        itemsets, support = PyPartitionApriori(
+            20, 2, itemset_format="ids", n_jobs=2
+        ).fit(transactions)
+
+        self.assertEqual(_as_dict(*expected), _as_dict(itemsets, support))
+
+    def test_partition_weights(self):
+        random_state = np.random.RandomState(3)
+        transactions = random_state.rand(100, 8) < 0.4
+        weights = random_state.randint(0, 5, 100)
+
+        expected = PyApriori(30, 1, itemset_format="ids").fit(
+            np.repeat(transactions, weights, axis=0)
+        )
+        itemsets, support = PyPartitionApriori(
+            30, 1, itemset_format="ids", n_partitions=3
+        ).fit(transactions, weights=weights)
+
+        self.assertEqual(_as_dict(*expected), _as_dict(itemsets, support))
+
+    def test_partition_zero_weight_partition(self):
+        random_state = np.random.RandomState(4)
+        transactions = random_state.rand(40, 18) < 0.3
+        weights = random_state.randint(1, 4, 40)
+        weights[:10] = 0
+
+        expected = PyApriori(3, 2, itemset_format="ids").fit(
+            transactions, weights=weights
+        )
+        miner = PyPartitionApriori(3, 2, itemset_format="ids", n_partitions=4)
+        itemsets, support = miner.fit(transactions, weights=weights)
+
+        self.assertEqual(_as_dict(*expected), _as_dict(itemsets, support))
+        # The empty partition is mined at a threshold of one, not zero, and
+        # adds no candidates instead of all 2**18 itemsets
+        self.assertLess(sum(miner.n_candidates.values()), 2**12)
+
+    def test_partition_dense_format(self):
+        transactions = np.array(
+            [
+                [True, True, True, False],
+                [True, True, False, False],
+                [True, True, True, False],
+                [False, False, True, True],
+            ]
+        )
+
+        itemsets, support = PyPartitionApriori(2, 2, n_partitions=2).fit(transactions)
+
+        numpy_or_cupy = get_numpy_or_cupy(itemsets)
+        numpy_or_cupy.testing.assert_array_equal(
+            [
+                [True, True, False, False],
+                [True, False, True, False],
+                [False, True, True, False],
+                [True, True, True, False],
+            ],
+            itemsets,
+        )
+        numpy_or_cupy.testing.assert_array_equal([3, 2, 2, 2], support)
+
+    def test_partition_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            PyPartitionApriori(backend="gpu")
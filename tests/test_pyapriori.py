@@ -2,7 +2,11 @@
 
 """Tests for `pyapriori` package."""
 
+import os
+import tempfile
+import tracemalloc
 import unittest
+from unittest import mock
 
 import cupy as cp
 import numpy as np
@@ -11,9 +15,14 @@ from parameterized import parameterized
 from scipy.sparse import csc_matrix
 from scipy.sparse import csr_matrix
 
-from pyapriori import PyApriori
+from pyapriori import FrequentItemsets, PyApriori
 from pyapriori.utils.utils import get_numpy_or_cupy
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
 
 class TestPyApriori(unittest.TestCase):
     @parameterized.expand(
@@ -52,3 +61,555 @@ class TestPyApriori(unittest.TestCase):
 
         expected_support = numpy_or_cupy.array([5, 5, 6, 5])
         numpy_or_cupy.testing.assert_array_equal(expected_support, support)
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_pyapriori_ids(self, type_array):
+        transactions = [
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, False, True, False, False],
+            [True, False, False, False, True, True],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+        ]
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+        py_apriori = PyApriori(2, 1, itemset_format="ids")
+        itemsets, support = py_apriori.fit(data_transactions)
+
+        expected_itemsets = numpy_or_cupy.array(
+            [
+                [2, -1, -1],
+                [1, -1, -1],
+                [0, -1, -1],
+                [1, 2, -1],
+                [0, 2, -1],
+                [0, 1, -1],
+                [0, 1, 2],
+            ]
+        )
+        numpy_or_cupy.testing.assert_array_equal(expected_itemsets, itemsets)
+
+        expected_support = numpy_or_cupy.array([5, 6, 7, 5, 5, 6, 5])
+        numpy_or_cupy.testing.assert_array_equal(expected_support, support)
+
+    def test_pyapriori_pruned_candidates(self):
+        transactions = np.array(
+            [
+                [True, True, False],
+                [True, True, False],
+                [True, False, True],
+                [True, False, True],
+                [False, True, False],
+                [False, True, False],
+                [False, True, False],
+                [False, False, True],
+                [False, False, True],
+                [False, False, True],
+                [False, False, True],
+            ]
+        )
+        py_apriori = PyApriori(2, 2)
+        itemsets, support = py_apriori.fit(transactions)
+
+        # {0, 1, 2} is dropped before counting because {1, 2} is infrequent
+        self.assertEqual({2: 0, 3: 1}, py_apriori.pruned_candidates)
+        np.testing.assert_array_equal(
+            [[True, True, False], [True, False, True]], itemsets
+        )
+        np.testing.assert_array_equal([2, 2], support)
+
+    @parameterized.expand([({},), ({"low_memory": True},)])
+    def test_pyapriori_profile(self, options):
+        transactions = np.array(
+            [
+                [True, True, False],
+                [True, True, False],
+                [True, False, True],
+                [True, False, True],
+                [False, True, False],
+                [False, True, False],
+                [False, True, False],
+                [False, False, True],
+                [False, False, True],
+                [False, False, True],
+                [False, False, True],
+            ]
+        )
+        reported = []
+        py_apriori = PyApriori(2, 2, callback=reported.append, **options)
+        py_apriori.fit(transactions)
+
+        self.assertEqual(reported, py_apriori.level_stats)
+        self.assertEqual(
+            [(2, 3, 0, 2), (3, 1, 1, 0)],
+            [
+                (stats.k, stats.n_generated, stats.n_pruned, stats.n_frequent)
+                for stats in reported
+            ],
+        )
+        self.assertAlmostEqual(15 / 33, reported[0].density)
+        self.assertGreater(reported[0].support_time, 0)
+        self.assertGreater(reported[0].peak_host_memory, 0)
+        self.assertIsNone(reported[0].peak_device_memory)
+
+        py_apriori = PyApriori(2, 2, **options)
+        py_apriori.fit(transactions)
+        self.assertEqual([], py_apriori.level_stats)
+
+    @parameterized.expand(
+        [
+            ({"trim_transactions": True}, "trim_time", "layout_time"),
+            ({"backend": "auto"}, "layout_time", "trim_time"),
+        ]
+    )
+    def test_pyapriori_profile_stages(self, options, timed, untimed):
+        transactions = np.random.RandomState(0).rand(200, 10) < 0.5
+
+        py_apriori = PyApriori(20, 2, profile=True, **options)
+        py_apriori.fit(transactions)
+
+        stats = py_apriori.level_stats[0]
+        self.assertGreater(getattr(stats, timed), 0)
+        self.assertEqual(0.0, getattr(stats, untimed))
+
+    def test_pyapriori_profile_error(self):
+        transactions = np.random.RandomState(0).rand(20, 5) < 0.5
+
+        with mock.patch(
+            "pyapriori.pyapriori.batched_support_set", side_effect=MemoryError
+        ):
+            with self.assertRaises(MemoryError):
+                PyApriori(2, 2, profile=True).fit(transactions)
+
+        self.assertFalse(tracemalloc.is_tracing())
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_pyapriori_bitset(self, type_array):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(150, 8) < 0.5
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+
+        itemsets, support = PyApriori(20, 1).fit(data_transactions)
+        bitset_itemsets, bitset_support = PyApriori(20, 1, backend="bitset").fit(
+            data_transactions
+        )
+
+        numpy_or_cupy.testing.assert_array_equal(itemsets, bitset_itemsets)
+        numpy_or_cupy.testing.assert_array_equal(support, bitset_support)
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_pyapriori_fit_stream(self, type_array):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(100, 8) < 0.5
+        transactions[90:, -1] = False
+        numpy_or_cupy = get_numpy_or_cupy(type_array(transactions))
+        # The last chunk is narrower, item 7 never occurs in it
+        chunks = [
+            type_array(transactions[:40]),
+            type_array(transactions[40:90]),
+            type_array(transactions[90:, :7]),
+        ]
+
+        itemsets, support = PyApriori(15, 1).fit(type_array(transactions))
+        stream_itemsets, stream_support = PyApriori(15, 1).fit_stream(chunks)
+
+        numpy_or_cupy.testing.assert_array_equal(itemsets, stream_itemsets)
+        numpy_or_cupy.testing.assert_array_equal(support, stream_support)
+
+    def test_pyapriori_fit_stream_files(self):
+        transactions = [[0, 1, 2], [0, 1, 2], [0, 1], [0, 2], [1, 2, 3]]
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i, chunk in enumerate((transactions[:2], transactions[2:])):
+                path = os.path.join(directory, "chunk{}.dat".format(i))
+                with open(path, "w") as file:
+                    file.writelines(" ".join(map(str, row)) + "\n" for row in chunk)
+                paths.append(path)
+
+            itemsets, support = PyApriori(3, 2, itemset_format="ids").fit_stream(paths)
+
+        np.testing.assert_array_equal([[0, 1], [0, 2], [1, 2]], itemsets)
+        np.testing.assert_array_equal([3, 3, 3], support)
+
+    def test_pyapriori_fit_stream_iterator(self):
+        chunks = iter([np.ones((2, 2), dtype=bool)])
+
+        with self.assertRaises(TypeError):
+            PyApriori(1, 1).fit_stream(chunks)
+
+    @parameterized.expand(
+        [
+            (np.array, "default"),
+            (csr_matrix, "default"),
+            (csc_matrix, "default"),
+            (np.array, "bitset"),
+        ]
+    )
+    def test_pyapriori_n_jobs(self, type_array, backend):
+        random_state = np.random.RandomState(0)
+        data_transactions = type_array(random_state.rand(150, 8) < 0.5)
+
+        itemsets, support = PyApriori(20, 1, backend=backend).fit(data_transactions)
+        parallel_itemsets, parallel_support = PyApriori(
+            20, 1, backend=backend, n_jobs=3
+        ).fit(data_transactions)
+
+        np.testing.assert_array_equal(itemsets, parallel_itemsets)
+        np.testing.assert_array_equal(support, parallel_support)
+
+    @parameterized.expand(
+        [
+            ("closed", [[0, -1, -1], [0, 1, -1], [0, 1, 2]], [7, 6, 5]),
+            ("maximal", [[0, 1, 2]], [5]),
+        ]
+    )
+    def test_pyapriori_output(self, output, expected_itemsets, expected_support):
+        transactions = np.array(
+            [
+                [True, True, True, False, False, False],
+                [True, True, True, False, False, False],
+                [True, True, True, False, False, False],
+                [True, True, False, True, False, False],
+                [True, False, False, False, True, True],
+                [True, True, True, False, False, False],
+                [True, True, True, False, False, False],
+            ]
+        )
+        py_apriori = PyApriori(2, 1, itemset_format="ids", output=output)
+
+        itemsets, support = py_apriori.fit(transactions)
+        np.testing.assert_array_equal(expected_itemsets, itemsets)
+        np.testing.assert_array_equal(expected_support, support)
+
+        itemsets, support = py_apriori.fit_stream([transactions[:4], transactions[4:]])
+        np.testing.assert_array_equal(expected_itemsets, itemsets)
+        np.testing.assert_array_equal(expected_support, support)
+
+    def test_pyapriori_output_unknown(self):
+        with self.assertRaises(ValueError):
+            PyApriori(output="frequent")
+
+    @unittest.skipUnless(pd is not None, "pandas is not installed")
+    def test_pyapriori_labels(self):
+        frame = pd.DataFrame(
+            [[True, True, False], [True, True, True], [False, True, True]],
+            columns=["bread", "milk", "tea"],
+        ).astype(pd.SparseDtype(bool, False))
+
+        itemsets, support = PyApriori(2, 2, itemset_format="labels").fit(frame)
+
+        np.testing.assert_array_equal(
+            np.array([["bread", "milk"], ["milk", "tea"]], dtype=object),
+            itemsets,
+        )
+        np.testing.assert_array_equal([2, 2], support)
+
+    @parameterized.expand(
+        [
+            (np.array, "default"),
+            (csr_matrix, "default"),
+            (csc_matrix, "default"),
+            (np.array, "bitset"),
+        ]
+    )
+    def test_pyapriori_batches(self, type_array, backend):
+        random_state = np.random.RandomState(0)
+        data_transactions = type_array(random_state.rand(150, 8) < 0.5)
+
+        itemsets, support = PyApriori(20, 1, backend=backend).fit(data_transactions)
+        for options in ({"max_candidates_per_batch": 3}, {"memory_budget": 1000}):
+            batched_itemsets, batched_support = PyApriori(
+                20, 1, backend=backend, **options
+            ).fit(data_transactions)
+
+            np.testing.assert_array_equal(itemsets, batched_itemsets)
+            np.testing.assert_array_equal(support, batched_support)
+
+    @parameterized.expand(
+        [
+            (np.array, "default"),
+            (csr_matrix, "default"),
+            (np.array, "bitset"),
+        ]
+    )
+    def test_pyapriori_fit_stream_batches(self, type_array, backend):
+        transactions = np.random.RandomState(0).rand(2000, 30) < 0.5
+        chunks = [type_array(transactions[:1000]), type_array(transactions[1000:])]
+
+        peaks = {}
+        itemsets, support = PyApriori(0.3, 1, backend=backend).fit(transactions)
+        for options in ({}, {"max_candidates_per_batch": 8}, {"memory_budget": 8000}):
+            tracemalloc.start()
+            batched_itemsets, batched_support = PyApriori(
+                0.3, 1, backend=backend, **options
+            ).fit_stream(chunks)
+            peaks[tuple(options)] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            np.testing.assert_array_equal(itemsets, batched_itemsets)
+            np.testing.assert_array_equal(support, batched_support)
+        if backend != "bitset":
+            # Slices bound the intersected columns held for a chunk, packed
+            # bitset columns are too small to outweigh the packing itself
+            self.assertLess(4 * peaks[("max_candidates_per_batch",)], peaks[()])
+
+    @parameterized.expand([(np.array,), (cp.array,), (csr_matrix,)])
+    def test_pyapriori_compact(self, type_array):
+        random_state = np.random.RandomState(0)
+        data_transactions = type_array(random_state.rand(150, 8) < 0.5)
+
+        itemsets, support = PyApriori(20, 1, itemset_format="ids").fit(
+            data_transactions
+        )
+        compact, compact_support = PyApriori(20, 1, itemset_format="compact").fit(
+            data_transactions
+        )
+
+        numpy_or_cupy = get_numpy_or_cupy(support)
+        self.assertIsInstance(compact, FrequentItemsets)
+        numpy_or_cupy.testing.assert_array_equal(itemsets, compact.to_ids())
+        numpy_or_cupy.testing.assert_array_equal(support, compact_support)
+
+    def test_pyapriori_fractional_support(self):
+        random_state = np.random.RandomState(0)
+        data_transactions = random_state.rand(150, 8) < 0.5
+
+        itemsets, support = PyApriori(30, 1).fit(data_transactions)
+        py_apriori = PyApriori(0.2, 1)
+        fractional_itemsets, fractional_support = py_apriori.fit(data_transactions)
+
+        self.assertEqual(30, py_apriori.support_threshold)
+        np.testing.assert_array_equal(itemsets, fractional_itemsets)
+        np.testing.assert_array_equal(support, fractional_support)
+
+        stream_itemsets, stream_support = PyApriori(0.2, 1).fit_stream(
+            [data_transactions[:100], data_transactions[100:]]
+        )
+        np.testing.assert_array_equal(itemsets, stream_itemsets)
+        np.testing.assert_array_equal(support, stream_support)
+
+    @parameterized.expand(
+        [
+            (np.array, {}),
+            (csr_matrix, {}),
+            (np.array, {"backend": "bitset"}),
+            (np.array, {"low_memory": True}),
+            (np.array, {"max_candidates_per_batch": 3}),
+        ]
+    )
+    def test_pyapriori_top_k(self, type_array, options):
+        random_state = np.random.RandomState(0)
+        data_transactions = type_array(random_state.rand(150, 8) < 0.5)
+        itemsets, support = PyApriori(1, 2).fit(data_transactions)
+
+        for top_k in (1, 5, 20):
+            py_apriori = PyApriori(1, 2, top_k=top_k, **options)
+            top_itemsets, top_support = py_apriori.fit(data_transactions)
+
+            threshold = np.sort(support)[-top_k]
+            self.assertEqual(threshold, py_apriori.support_threshold)
+            self.assertGreaterEqual(len(top_support), top_k)
+            self.assertEqual(
+                sorted(map(tuple, itemsets[support >= threshold].tolist())),
+                sorted(map(tuple, top_itemsets.tolist())),
+            )
+
+        stream_itemsets, _ = PyApriori(1, 2, top_k=5).fit_stream([data_transactions])
+        self.assertEqual(
+            sorted(map(tuple, itemsets[support >= np.sort(support)[-5]].tolist())),
+            sorted(map(tuple, stream_itemsets.tolist())),
+        )
+
+    def test_pyapriori_top_k_invalid(self):
+        with self.assertRaises(ValueError):
+            PyApriori(top_k=0)
+        with self.assertRaises(ValueError):
+            PyApriori(top_k=5, output="closed")
+
+    @parameterized.expand(
+        [
+            (np.array, "default"),
+            (csr_matrix, "default"),
+            (csc_matrix, "default"),
+            (np.array, "bitset"),
+        ]
+    )
+    def test_pyapriori_low_memory(self, type_array, backend):
+        random_state = np.random.RandomState(0)
+        data_transactions = type_array(random_state.rand(150, 8) < 0.5)
+
+        itemsets, support = PyApriori(20, 1, backend=backend).fit(data_transactions)
+        for options in ({}, {"prefix_cache_size": 2}, {"n_jobs": 2}):
+            low_memory_itemsets, low_memory_support = PyApriori(
+                20, 1, backend=backend, low_memory=True, **options
+            ).fit(data_transactions)
+
+            np.testing.assert_array_equal(itemsets, low_memory_itemsets)
+            np.testing.assert_array_equal(support, low_memory_support)
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_pyapriori_auto(self, type_array):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(5000, 30) < 0.02
+        # A long pattern in a few rows leaves sparse columns on deep levels
+        transactions[:12, :8] = True
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+
+        itemsets, support = PyApriori(6, 1).fit(data_transactions)
+        for options in ({}, {"low_memory": True}, {"max_candidates_per_batch": 50}):
+            py_apriori = PyApriori(6, 1, backend="auto", **options)
+            auto_itemsets, auto_support = py_apriori.fit(data_transactions)
+
+            numpy_or_cupy.testing.assert_array_equal(itemsets, auto_itemsets)
+            numpy_or_cupy.testing.assert_array_equal(support, auto_support)
+            self.assertLessEqual(
+                set(py_apriori.layouts.values()), {"dense", "sparse", "bitset"}
+            )
+
+    def test_pyapriori_auto_layouts(self):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(5000, 30) < 0.02
+        transactions[:12, :8] = True
+
+        py_apriori = PyApriori(6, 1, backend="auto")
+        py_apriori.fit(transactions)
+
+        self.assertEqual("bitset", py_apriori.layouts[2])
+        self.assertEqual("sparse", py_apriori.layouts[8])
+
+        py_apriori = PyApriori(6, 1, backend="auto", low_memory=True)
+        py_apriori.fit(transactions)
+
+        self.assertEqual({2: "bitset"}, py_apriori.layouts)
+
+    @parameterized.expand(
+        [
+            (np.array, "default"),
+            (cp.array, "default"),
+            (csr_matrix, "default"),
+            (csc_matrix, "default"),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+            (np.array, "bitset"),
+            (csr_matrix, "auto"),
+        ]
+    )
+    def test_pyapriori_trim_transactions(self, type_array, backend="default"):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(300, 10) < 0.4
+        # Repeated baskets are merged into weighted rows
+        transactions[200:] = transactions[:100]
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+
+        itemsets, support = PyApriori(10, 1, backend=backend).fit(data_transactions)
+        for options in ({}, {"n_jobs": 2}, {"low_memory": True}):
+            trimmed_itemsets, trimmed_support = PyApriori(
+                10, 1, backend=backend, trim_transactions=True, **options
+            ).fit(data_transactions)
+
+            numpy_or_cupy.testing.assert_array_equal(itemsets, trimmed_itemsets)
+            numpy_or_cupy.testing.assert_array_equal(support, trimmed_support)
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+            (np.array, "bitset"),
+            (csr_matrix, "auto"),
+        ]
+    )
+    def test_pyapriori_weights(self, type_array, backend="default"):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(100, 10) < 0.4
+        weights = random_state.randint(0, 5, 100)
+        repeated = type_array(np.repeat(transactions, weights, axis=0))
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+
+        itemsets, support = PyApriori(20, 1, backend=backend).fit(repeated)
+        for options in ({}, {"n_jobs": 2}, {"low_memory": True}):
+            weighted_itemsets, weighted_support = PyApriori(
+                20, 1, backend=backend, **options
+            ).fit(data_transactions, weights=numpy_or_cupy.asarray(weights))
+
+            numpy_or_cupy.testing.assert_array_equal(itemsets, weighted_itemsets)
+            numpy_or_cupy.testing.assert_array_equal(support, weighted_support)
+
+        # Fractional support is relative to the total weight
+        fraction_itemsets, _ = PyApriori(20 / weights.sum(), 1, backend=backend).fit(
+            data_transactions, weights=weights
+        )
+        numpy_or_cupy.testing.assert_array_equal(itemsets, fraction_itemsets)
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (np.array, "bitset"),
+            (csr_matrix, "auto"),
+        ]
+    )
+    def test_pyapriori_deduplicate(self, type_array, backend="default"):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(300, 10) < 0.4
+        transactions[100:] = np.tile(transactions[:20], (10, 1))
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+
+        for weights in (None, np.arange(300) % 3):
+            deduplicated_itemsets, deduplicated_support = PyApriori(
+                15, 1, backend=backend, deduplicate=True
+            ).fit(data_transactions, weights=weights)
+            expected = PyApriori(15, 1, backend=backend).fit(
+                data_transactions, weights=weights
+            )
+
+            numpy_or_cupy.testing.assert_array_equal(expected[0], deduplicated_itemsets)
+            numpy_or_cupy.testing.assert_array_equal(expected[1], deduplicated_support)
+
+    def test_pyapriori_invalid_weights(self):
+        transactions = np.array([[True, False], [True, True]])
+        for weights in ([1], [0.5, 1], [1, -2]):
+            with self.assertRaises(ValueError):
+                PyApriori(1, 1).fit(transactions, weights=weights)
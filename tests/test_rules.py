@@ -0,0 +1,156 @@
+"""Tests for `pyapriori.rules` module."""
+import unittest
+
+import cupy as cp
+import numpy as np
+from parameterized import parameterized
+
+from pyapriori import PyApriori, association_rules, iter_association_rules
+from pyapriori.utils.utils import get_numpy_or_cupy
+
+TRANSACTIONS = [
+    [True, True, True, False, False, False],
+    [True, True, True, False, False, False],
+    [True, True, True, False, False, False],
+    [True, True, False, True, False, False],
+    [True, False, False, False, True, True],
+    [True, True, True, False, False, False],
+    [True, True, True, False, False, False],
+]
+
+
+class TestRules(unittest.TestCase):
+    @parameterized.expand([(np.array,), (cp.array,)])
+    def test_association_rules(self, type_array):
+        data_transactions = type_array(TRANSACTIONS)
+        numpy_or_cupy = get_numpy_or_cupy(data_transactions)
+        itemsets, support = PyApriori(2, 1, itemset_format="ids").fit(data_transactions)
+
+        rules = association_rules(itemsets, support, 7, min_confidence=1.0)
+
+        numpy_or_cupy.testing.assert_array_equal(
+            numpy_or_cupy.array([[2, -1], [2, -1], [1, -1], [1, 2], [0, 2], [2, -1]]),
+            rules.antecedents,
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            numpy_or_cupy.array([[1, -1], [0, -1], [0, -1], [0, -1], [1, -1], [0, 1]]),
+            rules.consequents,
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            numpy_or_cupy.array([5, 5, 6, 5, 5, 5]), rules.support
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            numpy_or_cupy.ones(6), rules.confidence
+        )
+        numpy_or_cupy.testing.assert_allclose(
+            numpy_or_cupy.array([7 / 6, 1, 1, 1, 7 / 6, 7 / 6]), rules.lift
+        )
+        numpy_or_cupy.testing.assert_allclose(
+            numpy_or_cupy.array([5 / 49, 0, 0, 0, 5 / 49, 5 / 49]),
+            rules.leverage,
+            atol=1e-12,
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            numpy_or_cupy.full(6, numpy_or_cupy.inf), rules.conviction
+        )
+
+    def test_association_rules_dense(self):
+        itemsets, support = PyApriori(2, 1).fit(np.array(TRANSACTIONS))
+
+        rules = association_rules(itemsets, support, 7, min_confidence=0.8)
+
+        # {0} -> {1} has confidence 6 / 7
+        self.assertIn(
+            ([True, False, False, False, False, False], 6 / 7, 1.0),
+            [
+                (antecedent, confidence, conviction)
+                for antecedent, consequent, confidence, conviction in zip(
+                    rules.antecedents.tolist(),
+                    rules.consequents.tolist(),
+                    rules.confidence.tolist(),
+                    rules.conviction.tolist(),
+                )
+                if consequent == [False, True, False, False, False, False]
+            ],
+        )
+        self.assertEqual((len(rules.support), 6), rules.consequents.shape)
+
+    def test_iter_association_rules(self):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(100, 8) < 0.6
+        itemsets, support = PyApriori(10, 1, itemset_format="ids").fit(transactions)
+
+        rules = association_rules(itemsets, support, 100, min_confidence=0.5)
+        batches = list(
+            iter_association_rules(
+                itemsets, support, 100, min_confidence=0.5, batch_size=7
+            )
+        )
+
+        self.assertGreater(len(batches), 1)
+        self.assertEqual(
+            set(
+                zip(
+                    map(tuple, rules.antecedents.tolist()),
+                    map(tuple, rules.consequents.tolist()),
+                    rules.confidence.tolist(),
+                )
+            ),
+            {
+                rule
+                for batch in batches
+                for rule in zip(
+                    map(tuple, batch.antecedents.tolist()),
+                    map(tuple, batch.consequents.tolist()),
+                    batch.confidence.tolist(),
+                )
+            },
+        )
+
+    @parameterized.expand([(0.0,), (0.7,), (0.9,)])
+    def test_association_rules_all_splits(self, min_confidence):
+        random_state = np.random.RandomState(1)
+        transactions = random_state.rand(200, 9) < 0.75
+        itemsets, support = PyApriori(20, 1, itemset_format="ids").fit(transactions)
+        itemsets_support = {
+            tuple(item for item in itemset if item >= 0): itemset_support
+            for itemset, itemset_support in zip(itemsets.tolist(), support.tolist())
+        }
+        expected = set()
+        for itemset, itemset_support in itemsets_support.items():
+            for split in range(1, 2 ** len(itemset) - 1):
+                consequent = tuple(
+                    item
+                    for position, item in enumerate(itemset)
+                    if split >> position & 1
+                )
+                antecedent = tuple(sorted(set(itemset) - set(consequent)))
+                if itemset_support / itemsets_support[antecedent] >= min_confidence:
+                    expected.add((antecedent, consequent))
+
+        rules = association_rules(itemsets, support, 200, min_confidence=min_confidence)
+
+        self.assertEqual(
+            expected,
+            {
+                (
+                    tuple(item for item in antecedent if item >= 0),
+                    tuple(item for item in consequent if item >= 0),
+                )
+                for antecedent, consequent in zip(
+                    rules.antecedents.tolist(), rules.consequents.tolist()
+                )
+            },
+        )
+        self.assertEqual(len(expected), len(rules.support))
+
+    def test_association_rules_missing_subsets(self):
+        itemsets, support = PyApriori(2, 2, itemset_format="ids").fit(
+            np.array(TRANSACTIONS)
+        )
+
+        with self.assertRaises(ValueError):
+            association_rules(itemsets, support, 7)
+
+    def test_association_rules_empty(self):
+        self.assertIsNone(association_rules(None, None, 7))
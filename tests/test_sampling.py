@@ -0,0 +1,129 @@
+"""Tests for `pyapriori.sampling` module."""
+import unittest
+
+import cupy as cp
+import numpy as np
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import PyApriori, PySamplingApriori
+from pyapriori.sampling import hoeffding_sample_size
+
+
+def _as_dict(itemsets, support):
+    if hasattr(itemsets, "get"):
+        itemsets, support = itemsets.get(), support.get()
+    itemsets = [tuple(item for item in row if item >= 0) for row in itemsets.tolist()]
+    return dict(zip(itemsets, support.tolist()))
+
+
+def _transactions(n_rows, seed=0):
+    random_state = np.random.RandomState(seed)
+    return random_state.rand(n_rows, 10) < np.linspace(0.1, 0.6, 10)
+
+
+class TestPySamplingApriori(unittest.TestCase):
+    def test_hoeffding_sample_size(self):
+        self.assertEqual(185, hoeffding_sample_size(0.1, 0.05))
+        for epsilon, delta in ((0, 0.05), (0.1, 1), (-0.1, 0.5)):
+            with self.assertRaises(ValueError):
+                hoeffding_sample_size(epsilon, delta)
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (np.array, "bitset"),
+        ]
+    )
+    def test_sampling_verify(self, type_array, backend="default"):
+        data_transactions = type_array(_transactions(2000))
+
+        expected = PyApriori(0.1, 1, itemset_format="ids").fit(data_transactions)
+        miner = PySamplingApriori(
+            0.1,
+            1,
+            itemset_format="ids",
+            epsilon=0.1,
+            verify=True,
+            random_state=0,
+            backend=backend,
+        )
+        itemsets, support = miner.fit(data_transactions)
+
+        self.assertEqual(185, miner.sample_size)
+        self.assertEqual(_as_dict(*expected), _as_dict(itemsets, support))
+        self.assertTrue(bool(miner.exact_support.all()))
+        self.assertEqual(len(support), len(miner.exact_support))
+        self.assertEqual(0.0, miner.support_error)
+
+    def test_sampling_estimate(self):
+        transactions = _transactions(5000)
+
+        miner = PySamplingApriori(
+            0.1, 1, itemset_format="ids", epsilon=0.03, random_state=0
+        )
+        itemsets, support = miner.fit(transactions)
+
+        self.assertLess(miner.sample_size, len(transactions))
+        self.assertFalse(bool(miner.exact_support.any()))
+        self.assertEqual(0.03 * 5000, miner.support_error)
+        exact = _as_dict(*PyApriori(1, 1, itemset_format="ids").fit(transactions))
+        for itemset, estimate in _as_dict(itemsets, support).items():
+            self.assertLessEqual(abs(exact[itemset] - estimate), miner.support_error)
+
+    def test_sampling_small_data(self):
+        transactions = _transactions(100)
+
+        miner = PySamplingApriori(10, 2, itemset_format="ids")
+        itemsets, support = miner.fit(transactions)
+
+        expected = PyApriori(10, 2, itemset_format="ids").fit(transactions)
+        self.assertEqual(100, miner.sample_size)
+        self.assertEqual(_as_dict(*expected), _as_dict(itemsets, support))
+        self.assertTrue(bool(miner.exact_support.all()))
+
+    def test_sampling_border_misses(self):
+        transactions = _transactions(500)
+        expected = _as_dict(*PyApriori(0.2, 1, itemset_format="ids").fit(transactions))
+
+        misses = 0
+        for seed in range(10):
+            # A sample of 12 rows often misses a frequent itemset
+            miner = PySamplingApriori(
+                0.2,
+                1,
+                itemset_format="ids",
+                epsilon=0.4,
+                delta=0.9,
+                verify=True,
+                random_state=seed,
+            )
+            itemsets, support = miner.fit(transactions)
+
+            self.assertEqual(expected, _as_dict(itemsets, support))
+            misses += miner.border_misses > 0
+        self.assertGreater(misses, 0)
+
+    def test_sampling_weights(self):
+        random_state = np.random.RandomState(3)
+        transactions = _transactions(1000, 3)
+        weights = random_state.randint(0, 4, 1000)
+
+        expected = PyApriori(0.1, 1, itemset_format="ids").fit(
+            np.repeat(transactions, weights, axis=0)
+        )
+        itemsets, support = PySamplingApriori(
+            0.1, 1, itemset_format="ids", epsilon=0.1, verify=True, random_state=0
+        ).fit(transactions, weights=weights)
+
+        self.assertEqual(_as_dict(*expected), _as_dict(itemsets, support))
+
+    def test_sampling_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            PySamplingApriori(epsilon=0)
+        with self.assertRaises(ValueError):
+            PySamplingApriori(backend="gpu")
@@ -0,0 +1,104 @@
+import unittest
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+
+from pyapriori import utils
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+TRANSACTIONS = np.array(
+    [
+        [True, False, True],
+        [False, True, False],
+        [True, True, False],
+    ]
+)
+
+
+class TestAdapters(unittest.TestCase):
+    @unittest.skipUnless(pd is not None, "pandas is not installed")
+    def test_from_pandas(self):
+        frame = pd.DataFrame(TRANSACTIONS, columns=["a", "b", "c"])
+
+        data, labels = utils.from_pandas(frame)
+
+        np.testing.assert_array_equal(TRANSACTIONS, data)
+        np.testing.assert_array_equal(["a", "b", "c"], labels)
+
+    @unittest.skipUnless(pd is not None, "pandas is not installed")
+    def test_from_pandas_sparse(self):
+        frame = pd.DataFrame(TRANSACTIONS, columns=["a", "b", "c"]).astype(
+            pd.SparseDtype(bool, False)
+        )
+
+        data, labels = utils.from_pandas(frame)
+
+        self.assertIsInstance(data, csc_matrix)
+        np.testing.assert_array_equal(TRANSACTIONS, data.toarray())
+        np.testing.assert_array_equal(["a", "b", "c"], labels)
+
+    @unittest.skipUnless(pd is not None, "pandas is not installed")
+    def test_from_pandas_sparse_fill_value(self):
+        frame = pd.DataFrame(TRANSACTIONS).astype(pd.SparseDtype(bool, True))
+
+        with self.assertRaises(ValueError):
+            utils.from_pandas(frame)
+
+    @unittest.skipUnless(pa is not None, "pyarrow is not installed")
+    def test_from_arrow(self):
+        baskets = pa.array([[0, 2], [1], [0, 1]], type=pa.list_(pa.int32()))
+
+        data, labels = utils.from_arrow(baskets)
+
+        self.assertIsInstance(data, csr_matrix)
+        self.assertIsNone(labels)
+        np.testing.assert_array_equal(TRANSACTIONS, data.toarray())
+        self.assertTrue(np.shares_memory(data.indices, baskets.values.to_numpy()))
+
+    @unittest.skipUnless(pa is not None, "pyarrow is not installed")
+    def test_from_arrow_sliced_chunked(self):
+        baskets = pa.array(
+            [[1, 1], [0, 2], None, [1], [0, 1]], type=pa.list_(pa.int32())
+        )
+
+        data, _ = utils.from_arrow(pa.chunked_array([baskets[1:3], baskets[3:]]))
+
+        np.testing.assert_array_equal(
+            [
+                [True, False, True],
+                [False, False, False],
+                [False, True, False],
+                [True, True, False],
+            ],
+            data.toarray(),
+        )
+
+    @unittest.skipUnless(pa is not None, "pyarrow is not installed")
+    def test_from_arrow_labels(self):
+        baskets = pa.array([["x", "z"], ["y"], ["x", "y"]])
+
+        data, labels = utils.from_arrow(baskets)
+
+        np.testing.assert_array_equal(["x", "z", "y"], labels)
+        np.testing.assert_array_equal(
+            [[True, True, False], [False, False, True], [True, False, True]],
+            data.toarray(),
+        )
+
+    def test_to_matrix(self):
+        data, labels = utils.to_matrix(TRANSACTIONS)
+
+        self.assertIs(TRANSACTIONS, data)
+        self.assertIsNone(labels)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+import unittest
+from types import ModuleType
+
+import cupy as cp
+import numpy as np
+from cupyx.scipy.sparse import csr_matrix as cupy_csr_matrix
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import utils
+from pyapriori.utils import backend
+
+# Seconds allowed for ``import pyapriori`` in a fresh interpreter
+IMPORT_TIME_BUDGET = 2.0
+
+
+class TestBackend(unittest.TestCase):
+    def test_import_without_cupy(self):
+        code = (
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            "import pyapriori\n"
+            "print(time.perf_counter() - start, 'cupy' in sys.modules)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            universal_newlines=True,
+        ).stdout.split()
+
+        self.assertLess(float(output[0]), IMPORT_TIME_BUDGET)
+        self.assertEqual("False", output[1])
+
+    @parameterized.expand(
+        [
+            (np.array, np),
+            (csr_matrix, np),
+            (csc_matrix, np),
+            (lambda x: utils.to_bitset(np.array(x)), np),
+            (cp.array, cp),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)), cp),
+        ]
+    )
+    def test_get_numpy_or_cupy(self, type_array, expected):
+        data = type_array([[True, False], [False, True]])
+
+        self.assertIs(expected, utils.get_numpy_or_cupy(data))
+
+    def test_register_array_module(self):
+        class FakeArray:
+            pass
+
+        module = ModuleType("fake_array_module")
+        sys.modules[module.__name__] = module
+        try:
+            utils.register_array_module(
+                module.__name__, lambda data: isinstance(data, FakeArray)
+            )
+            self.assertIs(module, utils.get_numpy_or_cupy(FakeArray()))
+        finally:
+            backend.ARRAY_MODULES.pop(module.__name__)
+            del sys.modules[module.__name__]
+
+    @parameterized.expand(
+        [
+            (np.array, False),
+            (csr_matrix, True),
+            (csc_matrix, True),
+            (lambda x: utils.to_bitset(np.array(x)), False),
+        ]
+    )
+    def test_is_sparse(self, type_array, expected):
+        data = type_array([[True, False], [False, True]])
+
+        self.assertEqual(expected, utils.is_sparse(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import cupy as cp
+import numpy as np
+from cupyx.scipy.sparse import csr_matrix as cupy_csr_matrix
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import utils
+from pyapriori.utils.bitset import popcount
+
+
+class TestBitset(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x, dtype=np.float32)),),
+        ]
+    )
+    def test_to_bitset(self, type_array):
+        transactions = np.zeros((70, 3), dtype=bool)
+        transactions[::2, 0] = True
+        transactions[65:, 1] = True
+        transactions[:, 2] = True
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = utils.get_numpy_or_cupy(data_transactions)
+
+        bitset = utils.to_bitset(data_transactions)
+
+        self.assertEqual((70, 3), bitset.shape)
+        self.assertEqual((3, 2), bitset.words.shape)
+        self.assertEqual(numpy_or_cupy.uint64, bitset.words.dtype)
+        numpy_or_cupy.testing.assert_array_equal(
+            numpy_or_cupy.array([35, 5, 70]), bitset.sum(axis=0)
+        )
+
+    def test_itemsets_support(self):
+        data = utils.to_bitset(
+            np.array(
+                [
+                    [True, False, True],
+                    [False, True, True],
+                    [False, True, True],
+                ]
+            )
+        )
+
+        new_data, new_data_support = utils.itemsets_support(data, [0, 0, 1], [1, 2, 2])
+
+        self.assertIsInstance(new_data, utils.BitsetMatrix)
+        np.testing.assert_array_equal(np.array([0, 1, 2]), new_data_support)
+
+    @parameterized.expand([(np.array,), (cp.array,)])
+    def test_toarray(self, type_array):
+        transactions = np.random.RandomState(0).rand(70, 3) < 0.5
+
+        dense = utils.to_bitset(type_array(transactions)).toarray()
+
+        self.assertTrue(dense.flags.f_contiguous)
+        utils.get_numpy_or_cupy(dense).testing.assert_array_equal(
+            type_array(transactions), dense
+        )
+
+    def test_popcount(self):
+        words = np.array([0, 1, 2**64 - 1, 2**63 + 5], dtype=np.uint64)
+
+        np.testing.assert_array_equal([0, 1, 64, 3], popcount(words, np))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from pyapriori import utils
+from pyapriori.utils.eclat import mine_eclat
+
+
+class TestEclat(unittest.TestCase):
+    @parameterized.expand([(True,), (False,)])
+    def test_mine_eclat(self, diffsets):
+        # Transactions {0, 1, 2}, {0, 1}, {0, 2}, {1}
+        data = np.array(
+            [
+                [True, True, True],
+                [True, True, False],
+                [True, False, True],
+                [False, True, False],
+            ]
+        )
+        tidsets = utils.to_bitset(data).words
+
+        result = mine_eclat(
+            np.arange(3), tidsets, np.array([3, 3, 2]), 2, diffsets=diffsets
+        )
+
+        mined = {
+            tuple(itemset): support
+            for itemsets, supports in result
+            for itemset, support in zip(itemsets.tolist(), supports.tolist())
+        }
+        self.assertEqual({(0,): 3, (1,): 3, (2,): 2, (0, 1): 2, (0, 2): 2}, mined)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pyapriori import utils
+
+
+class TestFimi(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "transactions.dat")
+        with open(self.path, "w") as file:
+            file.write("1 3 4\n0 1\n\n2\n1 4\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_fimi(self):
+        data = utils.read_fimi(self.path)
+
+        np.testing.assert_array_equal(
+            [
+                [False, True, False, True, True],
+                [True, True, False, False, False],
+                [False, False, True, False, False],
+                [False, True, False, False, True],
+            ],
+            data.toarray(),
+        )
+
+    def test_iter_fimi(self):
+        chunks = list(utils.iter_fimi(self.path, chunk_size=3, n_items=6))
+
+        self.assertEqual([(3, 6), (1, 6)], [chunk.shape for chunk in chunks])
+        np.testing.assert_array_equal(
+            [[False, True, False, False, True, False]], chunks[1].toarray()
+        )
+
+    def test_read_fimi_blocks(self):
+        data = utils.read_fimi(self.path)
+
+        for block_size in (1, 4, 7):
+            data_blocks = utils.read_fimi(self.path, block_size=block_size)
+            np.testing.assert_array_equal(data.toarray(), data_blocks.toarray())
+
+    def test_read_fimi_remap(self):
+        path = os.path.join(self.directory.name, "remap.dat")
+        with open(path, "w") as file:
+            file.write("700 12 12\n5000000000 12\r\n")
+
+        data, items = utils.read_fimi(path, remap=True)
+
+        np.testing.assert_array_equal([12, 700, 5000000000], items)
+        np.testing.assert_array_equal(
+            [[True, True, False], [True, False, True]], data.toarray()
+        )
+
+    def test_read_fimi_directory(self):
+        data = utils.read_fimi(self.path, directory=self.directory.name)
+
+        indices = np.load(
+            os.path.join(self.directory.name, "indices.npy"), mmap_mode="r"
+        )
+        np.testing.assert_array_equal([1, 3, 4, 0, 1, 2, 1, 4], indices)
+        base = data.indices
+        while not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+
+    def test_read_fimi_invalid(self):
+        path = os.path.join(self.directory.name, "invalid.dat")
+        with open(path, "w") as file:
+            file.write("1 2\n3,4\n")
+
+        with self.assertRaises(ValueError):
+            utils.read_fimi(path)
+        with self.assertRaises(ValueError):
+            utils.read_fimi(self.path, n_items=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
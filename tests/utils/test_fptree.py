@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from pyapriori.utils import fptree
+from pyapriori.utils.fptree import (
+    build_fptree,
+    conditional_pattern_base,
+    mine_fptree,
+)
+
+
+class TestFPTree(unittest.TestCase):
+    def setUp(self):
+        # Transactions {0, 1, 2}, {0, 1}, {0, 2}, {1}
+        self.indptr = np.array([0, 3, 5, 7, 8])
+        self.indices = np.array([0, 1, 2, 0, 1, 0, 2, 1])
+        self.tree = build_fptree(self.indptr, self.indices, np.ones(4), 3)
+
+    def test_build_fptree(self):
+        np.testing.assert_array_equal([-1, -1, 0, 0, 2], self.tree.parent)
+        np.testing.assert_array_equal([0, 1, 1, 2, 2], self.tree.item)
+        np.testing.assert_array_equal([3, 1, 2, 1, 1], self.tree.count)
+        np.testing.assert_array_equal([0, 0, 1, 1, 2], self.tree.depth)
+        np.testing.assert_array_equal([0, 0, 0, 0, 0], self.tree.tree)
+
+    def test_build_fptree_forest(self):
+        # {0, 1, 2}, {0, 1} in tree 0 and {0, 2}, {1} in tree 1
+        forest = build_fptree(
+            self.indptr, self.indices, np.ones(4), 3, np.array([0, 0, 1, 1])
+        )
+
+        np.testing.assert_array_equal([-1, -1, -1, 0, 1, 3], forest.parent)
+        np.testing.assert_array_equal([0, 0, 1, 1, 2, 2], forest.item)
+        np.testing.assert_array_equal([2, 1, 1, 2, 1, 1], forest.count)
+        np.testing.assert_array_equal([0, 0, 0, 1, 1, 2], forest.depth)
+        np.testing.assert_array_equal([0, 1, 1, 0, 1, 0], forest.tree)
+
+    def test_conditional_pattern_base(self):
+        indptr, indices, weights = conditional_pattern_base(self.tree, np.array([3, 4]))
+
+        np.testing.assert_array_equal([0, 1, 3], indptr)
+        np.testing.assert_array_equal([0, 0, 1], indices)
+        np.testing.assert_array_equal([1, 1], weights)
+
+    def test_mine_fptree(self):
+        result = mine_fptree(self.tree, 3, 2)
+
+        mined = {
+            tuple(itemset): support
+            for itemsets, supports in result
+            for itemset, support in zip(itemsets.tolist(), supports.tolist())
+        }
+        self.assertEqual({(0,): 3, (1,): 3, (2,): 2, (0, 1): 2, (0, 2): 2}, mined)
+
+    def test_mine_fptree_groups(self):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(100, 8) < 0.6
+        indptr = np.concatenate(([0], np.cumsum(transactions.sum(axis=1))))
+        indices = np.nonzero(transactions)[1]
+        tree = build_fptree(indptr, indices, np.ones(100), 8)
+
+        with mock.patch.object(fptree, "MAX_BASE_SIZE", 4):
+            result = mine_fptree(tree, 8, 20)
+
+        mined = {
+            tuple(itemset): support
+            for itemsets, supports in result
+            for itemset, support in zip(itemsets.tolist(), supports.tolist())
+        }
+        expected = {}
+        for mask in range(1, 2**8):
+            itemset = tuple(item for item in range(8) if mask >> item & 1)
+            support = int(transactions[:, list(itemset)].all(axis=1).sum())
+            if support >= 20:
+                expected[itemset] = support
+        self.assertEqual(expected, mined)
+        self.assertEqual(len(expected), sum(len(supports) for _, supports in result))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pyapriori import utils
+
+
+class TestFrequentItemsets(unittest.TestCase):
+    def setUp(self):
+        # Positions of items 4, 1 and 3
+        self.itemsets = utils.FrequentItemsets.from_levels(
+            [np.array([[0], [2]]), np.array([[0, 1], [1, 2]])],
+            [np.array([5, 4]), np.array([3, 2])],
+            np.array([4, 1, 3]),
+            5,
+        )
+
+    def test_from_levels(self):
+        np.testing.assert_array_equal([0, 1, 2, 4, 6], self.itemsets.offsets)
+        np.testing.assert_array_equal([4, 3, 1, 4, 1, 3], self.itemsets.item_ids)
+        self.assertEqual(np.uint32, self.itemsets.support.dtype)
+        self.assertEqual(4, len(self.itemsets))
+
+    def test_conversions(self):
+        np.testing.assert_array_equal(
+            [[4, -1], [3, -1], [1, 4], [1, 3]], self.itemsets.to_ids()
+        )
+        np.testing.assert_array_equal(
+            utils.itemsets_to_dense(self.itemsets.to_ids(), 5),
+            self.itemsets.to_dense(),
+        )
+        self.assertEqual(
+            [frozenset({4}), frozenset({3}), frozenset({1, 4}), frozenset({1, 3})],
+            self.itemsets.to_sets(),
+        )
+        frame = self.itemsets.to_pandas()
+        self.assertEqual([5, 4, 3, 2], frame["support"].tolist())
+        self.assertEqual((frozenset({1, 4}), 3), list(self.itemsets)[2])
+
+    def test_level(self):
+        itemsets, support = self.itemsets.level(2)
+
+        np.testing.assert_array_equal([[1, 4], [1, 3]], itemsets)
+        np.testing.assert_array_equal([3, 2], support)
+        self.assertIs(self.itemsets.item_ids, itemsets.base)
+        self.assertEqual((0, 3), self.itemsets.level(3)[0].shape)
+
+    def test_save_load(self):
+        self.itemsets.labels = np.array(list("abcde"), dtype=object)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "itemsets.npz")
+            self.itemsets.save(path)
+
+            for mmap in (True, False):
+                loaded = utils.FrequentItemsets.load(path, mmap=mmap)
+
+                self.assertEqual(mmap, isinstance(loaded.item_ids, np.memmap))
+                np.testing.assert_array_equal(self.itemsets.item_ids, loaded.item_ids)
+                np.testing.assert_array_equal(self.itemsets.support, loaded.support)
+                self.assertEqual(5, loaded.n_items)
+                self.assertEqual(frozenset({"b", "e"}), loaded.to_sets()[2])
+                del loaded
+
+
+if __name__ == "__main__":
+    unittest.main()
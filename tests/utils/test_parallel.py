@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import utils
+from pyapriori.utils.parallel import (
+    effective_n_jobs,
+    parallel_itemsets_support,
+    row_blocks,
+)
+
+
+class TestParallel(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (np.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (utils.to_bitset,),
+        ]
+    )
+    def test_parallel_itemsets_support(self, type_array):
+        random_state = np.random.RandomState(0)
+        data = type_array(random_state.rand(300, 6) < 0.5)
+        multiplier_mask_left = np.array([0, 0, 1, 3, 4], dtype=np.int32)
+        multiplier_mask_right = np.array([1, 5, 2, 4, 5], dtype=np.int32)
+
+        new_data, new_data_support = utils.itemsets_support(
+            data, multiplier_mask_left, multiplier_mask_right
+        )
+        parallel_data, parallel_support = parallel_itemsets_support(
+            data, multiplier_mask_left, multiplier_mask_right, 3
+        )
+
+        self.assertEqual(type(new_data), type(parallel_data))
+        np.testing.assert_array_equal(new_data_support, parallel_support)
+        np.testing.assert_array_equal(
+            utils.get_support(new_data, np), utils.get_support(parallel_data, np)
+        )
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (utils.to_bitset,),
+        ]
+    )
+    def test_get_support(self, type_array):
+        random_state = np.random.RandomState(0)
+        data = type_array(random_state.rand(300, 6) < 0.5)
+
+        np.testing.assert_array_equal(
+            utils.get_support(data, np), utils.get_support(data, np, n_jobs=4)
+        )
+
+    def test_row_blocks(self):
+        self.assertEqual([(0, 3), (3, 7)], row_blocks(np.zeros((7, 2)), 2))
+        self.assertEqual([(0, 0)], row_blocks(np.zeros((0, 2)), 2))
+        bitset = utils.to_bitset(np.zeros((130, 2), dtype=bool))
+        self.assertEqual([(0, 1), (1, 3)], row_blocks(bitset, 2))
+
+    def test_effective_n_jobs(self):
+        self.assertEqual(1, effective_n_jobs(None))
+        self.assertEqual(4, effective_n_jobs(4))
+        self.assertGreaterEqual(effective_n_jobs(-1), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
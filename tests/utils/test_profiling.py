@@ -0,0 +1,59 @@
+import tracemalloc
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from pyapriori import utils
+
+
+class TestProfiling(unittest.TestCase):
+    def test_level_profiler(self):
+        profiler = utils.LevelProfiler(np)
+
+        profiler.start_level(2, 0.5)
+        with utils.profile_stage(profiler, "itemsets_support"):
+            np.ones(1000)
+        with utils.profile_stage(profiler, "itemsets_support"):
+            pass
+        profiler.end_level(10, 2, 3)
+
+        stats = profiler.levels[0]
+        self.assertEqual((2, 10, 2, 3, 0.5), stats[:4] + (stats.density,))
+        self.assertGreater(stats.support_time, 0)
+        self.assertEqual(0.0, stats.generate_time)
+        self.assertGreaterEqual(stats.peak_host_memory, 8000)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_level_profiler_peak_device_memory(self):
+        # Pool sizes returned by consecutive `total_bytes` calls
+        pool_sizes = iter([100, 800, 300])
+        device = SimpleNamespace(
+            cuda=SimpleNamespace(Device=lambda: SimpleNamespace(synchronize=int)),
+            get_default_memory_pool=lambda: SimpleNamespace(
+                total_bytes=lambda: next(pool_sizes)
+            ),
+        )
+        profiler = utils.LevelProfiler(device)
+
+        profiler.start_level(2, 0.5)
+        with utils.profile_stage(profiler, "generate_candidates"):
+            pass
+        with utils.profile_stage(profiler, "itemsets_support"):
+            pass
+        profiler.end_level(10, 2, 3)
+
+        self.assertEqual(800, profiler.levels[0].peak_device_memory)
+
+    def test_profile_stage_disabled(self):
+        with utils.profile_stage(None, "itemsets_support"):
+            pass
+
+        self.assertIs(
+            utils.profile_stage(None, "min_support_set"),
+            utils.profile_stage(None, "itemsets_support"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
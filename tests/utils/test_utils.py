@@ -45,6 +45,69 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(expected_itemset, itemsets.tolist())
         self.assertEqual([5, 6, 7], support.tolist())
 
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_frequent_single_itemsets_ids(self, type_array):
+        transactions = [
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+            [True, True, False, True, False, False],
+            [True, False, False, False, True, True],
+            [True, True, True, False, False, False],
+            [True, True, True, False, False, False],
+        ]
+        data_transactions = type_array(transactions)
+        itemsets, support, data = utils.frequent_single_itemsets(
+            data_transactions, 2, itemset_format="ids"
+        )
+
+        self.assertEqual((7, 3), data.shape)
+        self.assertEqual([[2], [1], [0]], itemsets.tolist())
+        self.assertEqual([5, 6, 7], support.tolist())
+
+    @parameterized.expand(
+        [
+            (
+                np.array([[0, 1, 1], [1, 1, 0], [1, 0, 1]], dtype=bool),
+                np.array([[1, 1, 1], [1, 1, 1]], dtype=bool),
+            ),
+            (
+                np.array([[2, 1], [2, 0], [1, 0]], dtype=np.int32),
+                np.array([[2, 1, 0], [2, 0, 0]], dtype=np.int32),
+            ),
+        ]
+    )
+    def test_join_candidates(self, previous_candidates, expected_candidates):
+        candidates = utils.join_candidates(previous_candidates, [0, 1], [1, 2])
+
+        np.testing.assert_array_equal(expected_candidates, candidates)
+
+    def test_pad_itemsets_to_dense(self):
+        itemsets = utils.pad_itemsets(
+            [np.array([[3], [0]]), np.array([[0, 2]]), np.array([[0, 1, 3]])]
+        )
+
+        np.testing.assert_array_equal(
+            [[3, -1, -1], [0, -1, -1], [0, 2, -1], [0, 1, 3]], itemsets
+        )
+        np.testing.assert_array_equal(
+            [
+                [False, False, False, True],
+                [True, False, False, False],
+                [True, False, True, False],
+                [True, True, False, True],
+            ],
+            utils.itemsets_to_dense(itemsets, 4),
+        )
+
     @parameterized.expand(
         [
             (np.array([{2}, {1}, {0}]), None, [0, 0, 1], [1, 2, 2]),
@@ -69,6 +132,24 @@ class TestUtils(unittest.TestCase):
             expected_multiplier_mask_right, multiplier_mask_right
         )
 
+    @parameterized.expand([(np.array,), (cp.array,)])
+    def test_generate_candidates_groups(self, type_array):
+        previous_candidates = type_array(np.zeros((9, 3), dtype=np.int32))
+        previous_multiplier_mask = type_array([0, 0, 0, 2, 4, 4, 5, 5, 5])
+        numpy_or_cupy = utils.get_numpy_or_cupy(previous_candidates)
+
+        multiplier_mask_left, multiplier_mask_right = utils.generate_candidates(
+            previous_candidates, previous_multiplier_mask
+        )
+
+        self.assertEqual(numpy_or_cupy.int32, multiplier_mask_left.dtype)
+        numpy_or_cupy.testing.assert_array_equal(
+            type_array([0, 0, 1, 4, 6, 6, 7]), multiplier_mask_left
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            type_array([1, 2, 2, 5, 7, 8, 8]), multiplier_mask_right
+        )
+
     @parameterized.expand(
         [
             (
@@ -247,9 +328,254 @@ class TestUtils(unittest.TestCase):
         np.testing.assert_array_equal(
             expected_new_candidates_support, new_candidates_support
         )
-        self.assertEqual(expected_new_multiplier_mask_left, new_multiplier_mask_left)
+        np.testing.assert_array_equal(
+            expected_new_multiplier_mask_left, new_multiplier_mask_left
+        )
         np.testing.assert_array_equal(expected_new_data, new_data)
 
+    @parameterized.expand([(np.array,), (cp.array,)])
+    def test_match_itemsets(self, type_array):
+        reference = type_array([[1, 3, -1], [0, 1, 2], [0, 2, -1], [1, 2, 3]])
+        queries = type_array([[0, 2, -1], [1, 2, 3], [0, 1, 3], [1, 3, -1], [4, 5, 6]])
+        numpy_or_cupy = utils.get_numpy_or_cupy(reference)
+
+        positions = utils.match_itemsets(reference, queries)
+
+        numpy_or_cupy.testing.assert_array_equal(
+            type_array([2, 3, -1, 0, -1]), positions
+        )
+
+    @parameterized.expand([(np.array,), (cp.array,)])
+    def test_prune_candidates(self, type_array):
+        # {1, 2} is missing, so {0, 1, 2} has an infrequent subset
+        previous_candidates = type_array(
+            [[0, 1], [0, 2], [0, 3], [1, 3], [2, 3]], dtype=np.int32
+        )
+        numpy_or_cupy = utils.get_numpy_or_cupy(previous_candidates)
+
+        multiplier_mask_left, multiplier_mask_right = utils.prune_candidates(
+            previous_candidates, type_array([0, 0, 1]), type_array([1, 2, 2])
+        )
+
+        numpy_or_cupy.testing.assert_array_equal(
+            type_array([0, 1]), multiplier_mask_left
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            type_array([2, 2]), multiplier_mask_right
+        )
+
+    @parameterized.expand([(np.array,), (cp.array,)])
+    def test_covered_itemsets(self, type_array):
+        itemsets = type_array([[0, 1], [0, 2], [1, 2], [1, 3]], dtype=np.int32)
+        itemsets_support = type_array([5, 4, 4, 3])
+        supersets = type_array([[0, 1, 2]], dtype=np.int32)
+        numpy_or_cupy = utils.get_numpy_or_cupy(itemsets)
+
+        covered = utils.covered_itemsets(
+            itemsets, itemsets_support, supersets, type_array([4])
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            type_array([True, True, True, False]), covered
+        )
+
+        covered = utils.covered_itemsets(
+            itemsets, itemsets_support, supersets, type_array([4]), same_support=True
+        )
+        numpy_or_cupy.testing.assert_array_equal(
+            type_array([False, True, True, False]), covered
+        )
+
+    @parameterized.expand(
+        [
+            (np.array, None),
+            (np.array, 1),
+            (np.array, 2),
+            (csr_matrix, 2),
+            (csc_matrix, 2),
+            (lambda x: utils.to_bitset(np.array(x)), 2),
+        ]
+    )
+    def test_batched_support_set(self, type_array, batch_size):
+        candidates = np.array([[0], [1], [2], [3]], dtype=np.int32)
+        data = type_array(
+            [
+                [True, True, True, False],
+                [True, True, False, True],
+                [True, False, True, True],
+                [True, True, True, True],
+            ]
+        )
+        multiplier_mask_left, multiplier_mask_right = utils.generate_candidates(
+            candidates
+        )
+
+        (
+            new_candidates,
+            new_candidates_support,
+            new_multiplier_mask_left,
+            new_data,
+        ) = utils.batched_support_set(
+            candidates,
+            data,
+            multiplier_mask_left,
+            multiplier_mask_right,
+            min_support=3,
+            batch_size=batch_size,
+        )
+
+        self.assertEqual([[0, 1], [0, 2], [0, 3]], new_candidates.tolist())
+        np.testing.assert_array_equal([3, 3, 3], new_candidates_support)
+        np.testing.assert_array_equal([0, 0, 0], new_multiplier_mask_left)
+        self.assertEqual((4, 3), new_data.shape)
+        np.testing.assert_array_equal(
+            [3, 3, 3], utils.get_support(new_data, utils.get_numpy_or_cupy(new_data))
+        )
+
+    @parameterized.expand(
+        [
+            (np.array, 1024),
+            (np.array, 1),
+            (csr_matrix, 2),
+            (csc_matrix, 2),
+            (lambda x: utils.to_bitset(np.array(x)), 2),
+        ]
+    )
+    def test_prefix_support(self, type_array, cache_size):
+        candidates = np.array([[0, 1], [0, 2], [0, 3], [1, 2], [1, 3]], dtype=np.int32)
+        data = type_array(
+            [
+                [True, True, True, False],
+                [True, True, False, True],
+                [True, False, True, True],
+                [True, True, True, True],
+            ]
+        )
+        multiplier_mask_left, multiplier_mask_right = utils.generate_candidates(
+            candidates, np.array([0, 0, 0, 1, 1])
+        )
+
+        support = utils.prefix_support(
+            data,
+            candidates,
+            multiplier_mask_left,
+            multiplier_mask_right,
+            cache_size=cache_size,
+        )
+
+        np.testing.assert_array_equal(
+            utils.count_itemsets(
+                data,
+                utils.join_candidates(
+                    candidates, multiplier_mask_left, multiplier_mask_right
+                ),
+            ),
+            support,
+        )
+        np.testing.assert_array_equal([2, 2, 2, 1], support)
+
+    @parameterized.expand([(np.array,), (csr_matrix,), (utils.to_bitset,)])
+    def test_count_itemsets_batch_size(self, type_array):
+        transactions = np.random.RandomState(0).rand(50, 6) < 0.6
+        itemsets = np.array([[0, 1], [0, 2], [1, 5], [3, 4], [2, 5]])
+        weights = np.arange(50)
+        data = type_array(transactions)
+
+        expected = weights @ (
+            transactions[:, itemsets[:, 0]] & transactions[:, itemsets[:, 1]]
+        )
+        for batch_size in (None, 1, 2, 5):
+            np.testing.assert_array_equal(
+                expected,
+                utils.count_itemsets(
+                    data, itemsets, weights=weights, batch_size=batch_size
+                ),
+            )
+
+    @parameterized.expand(
+        [
+            (np.array, 4),
+            (csr_matrix, 10),
+            (lambda x: utils.to_bitset(np.array(x)), 8),
+        ]
+    )
+    def test_column_bytes(self, type_array, expected):
+        data = type_array([[True, False], [True, True], [False, False], [True, False]])
+
+        self.assertEqual(expected, utils.column_bytes(data))
+
+    @parameterized.expand([(3, 10, 3), (0.3, 10, 3), (0.25, 10, 3), (1.0, 7, 7)])
+    def test_absolute_support(self, min_support, n_transactions, expected):
+        self.assertEqual(expected, utils.absolute_support(min_support, n_transactions))
+
+    def test_absolute_support_invalid(self):
+        with self.assertRaises(ValueError):
+            utils.absolute_support(1.5, 10)
+
+    def test_top_k_threshold(self):
+        top_support, threshold = utils.top_k_threshold(
+            np.zeros(0, dtype=np.int64), np.array([5, 1]), 3
+        )
+        self.assertEqual(0, threshold)
+
+        top_support, threshold = utils.top_k_threshold(
+            top_support, np.array([4, 7, 2]), 3
+        )
+        self.assertEqual(4, threshold)
+        np.testing.assert_array_equal([4, 5, 7], np.sort(top_support))
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x)),),
+        ]
+    )
+    def test_to_layout(self, type_array):
+        transactions = np.random.RandomState(0).rand(70, 4) < 0.3
+        data_transactions = type_array(transactions)
+        numpy_or_cupy = utils.get_numpy_or_cupy(data_transactions)
+
+        for layout in ("dense", "sparse", "bitset", "dense", "bitset", "sparse"):
+            data_transactions = utils.to_layout(data_transactions, layout)
+
+            self.assertEqual(layout, utils.data_layout(data_transactions))
+            numpy_or_cupy.testing.assert_array_equal(
+                transactions.sum(axis=0),
+                utils.get_support(data_transactions, numpy_or_cupy),
+            )
+        with self.assertRaises(ValueError):
+            utils.to_layout(data_transactions, "coo")
+
+    def test_choose_layout(self):
+        left = np.repeat(np.arange(9), 40)
+        right = np.tile(np.arange(10, 50), 9)
+        dense_support = np.full(50, 30000)
+        sparse_support = np.full(50, 20)
+
+        self.assertEqual(
+            "bitset", utils.choose_layout("dense", 100000, dense_support, left, right)
+        )
+        self.assertEqual(
+            "sparse", utils.choose_layout("dense", 100000, sparse_support, left, right)
+        )
+        # Converting does not pay off for a single candidate
+        self.assertEqual(
+            "dense",
+            utils.choose_layout("dense", 100000, dense_support, left[:1], right[:1]),
+        )
+        # Bitset intersections take more memory than sparse ones
+        self.assertEqual(
+            "sparse",
+            utils.choose_layout(
+                "sparse", 100000, np.full(50, 1200), left, right, keep_memory=True
+            ),
+        )
+        self.assertEqual(
+            "bitset",
+            utils.choose_layout("sparse", 100000, np.full(50, 1200), left, right),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
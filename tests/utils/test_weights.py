@@ -0,0 +1,157 @@
+import unittest
+
+import cupy as cp
+import numpy as np
+from cupyx.scipy.sparse import csr_matrix as cupy_csr_matrix
+from parameterized import parameterized
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+
+from pyapriori import utils
+
+
+def _to_dense(data):
+    if isinstance(data, utils.BitsetMatrix):
+        data = data.toarray()
+    elif hasattr(data, "toarray"):
+        data = data.toarray()
+    return data.get() if hasattr(data, "get") else np.asarray(data)
+
+
+class TestWeights(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (np.array,),
+            (cp.array,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (lambda x: cupy_csr_matrix(csr_matrix(x, dtype=np.float32)),),
+            (utils.to_bitset,),
+            (lambda x: utils.to_bitset(cp.array(x)),),
+        ]
+    )
+    def test_weighted_support(self, type_array):
+        random_state = np.random.RandomState(0)
+        transactions = random_state.rand(150, 5) < 0.5
+        data = type_array(transactions)
+        numpy_or_cupy = utils.get_numpy_or_cupy(data)
+        for weights in (
+            random_state.randint(1, 1000, 150),
+            np.r_[random_state.randint(0, 9, 70), np.ones(80, dtype=np.int64)],
+        ):
+            numpy_or_cupy.testing.assert_array_equal(
+                numpy_or_cupy.asarray(weights @ transactions),
+                utils.weighted_support(data, numpy_or_cupy.asarray(weights)),
+            )
+
+    @parameterized.expand(
+        [
+            (np.array,),
+            (np.asfortranarray,),
+            (csr_matrix,),
+            (csc_matrix,),
+            (utils.to_bitset,),
+        ]
+    )
+    def test_trim_transactions(self, type_array):
+        transactions = np.array(
+            [
+                [True, True, False],
+                [True, False, False],
+                [True, True, False],
+                [False, True, True],
+                [True, True, False],
+                [False, False, False],
+            ]
+        )
+        data = type_array(transactions)
+
+        trimmed, weights = utils.trim_transactions(data, None, 2)
+
+        self.assertEqual(utils.data_layout(data), utils.data_layout(trimmed))
+        np.testing.assert_array_equal(
+            [[True, True, False], [False, True, True]], _to_dense(trimmed)
+        )
+        np.testing.assert_array_equal([3, 1], weights)
+
+        trimmed, weights = utils.trim_transactions(
+            data, np.arange(1, 7), 2, merge=False
+        )
+
+        np.testing.assert_array_equal(transactions[[0, 2, 3, 4]], _to_dense(trimmed))
+        np.testing.assert_array_equal([1, 3, 4, 5], weights)
+
+    def test_trim_transactions_unchanged(self):
+        data = np.array([[True, True], [False, True]])
+
+        trimmed, weights = utils.trim_transactions(data, None, 1)
+
+        self.assertIs(data, trimmed)
+        self.assertIsNone(weights)
+
+    @parameterized.expand(
+        [(np.array,), (csr_matrix,), (csc_matrix,), (utils.to_bitset,)]
+    )
+    def test_row_lengths_and_keys(self, type_array):
+        transactions = np.random.RandomState(0).rand(200, 70) < 0.1
+        transactions[100:] = transactions[:100]
+        data = type_array(transactions)
+
+        np.testing.assert_array_equal(transactions.sum(axis=1), utils.row_lengths(data))
+        keys = utils.row_keys(data)
+        self.assertEqual(
+            len(np.unique(transactions, axis=0)), len(np.unique(keys, axis=0))
+        )
+        np.testing.assert_array_equal(keys[:100], keys[100:])
+
+    @parameterized.expand(
+        [(np.array,), (cp.array,), (csr_matrix,), (csc_matrix,), (utils.to_bitset,)]
+    )
+    def test_take_rows(self, type_array):
+        transactions = np.random.RandomState(0).rand(130, 4) < 0.5
+        rows = np.array([129, 3, 64, 65, 0])
+
+        taken = utils.take_rows(type_array(transactions), rows)
+
+        np.testing.assert_array_equal(transactions[rows], _to_dense(taken))
+
+    @parameterized.expand([(np.array,), (csr_matrix,), (utils.to_bitset,)])
+    def test_deduplicate_transactions(self, type_array):
+        transactions = np.array(
+            [
+                [True, False, True],
+                [False, False, False],
+                [True, False, True],
+                [False, True, False],
+                [True, False, True],
+                [False, False, False],
+            ]
+        )
+
+        unique, weights = utils.deduplicate_transactions(type_array(transactions))
+
+        np.testing.assert_array_equal(
+            [[True, False, True], [False, False, False], [False, True, False]],
+            _to_dense(unique),
+        )
+        np.testing.assert_array_equal([3, 2, 1], weights)
+
+        unique, weights = utils.deduplicate_transactions(
+            type_array(transactions), np.array([1, 9, 1, 4, 1, 9])
+        )
+
+        np.testing.assert_array_equal(
+            [[False, False, False], [False, True, False], [True, False, True]],
+            _to_dense(unique),
+        )
+        np.testing.assert_array_equal([18, 4, 3], weights)
+
+    def test_check_weights(self):
+        self.assertIsNone(utils.check_weights(None, 3, np))
+        weights = utils.check_weights([1, 0, 2], 3, np)
+        self.assertEqual(np.int64, weights.dtype)
+        np.testing.assert_array_equal([1, 0, 2], weights)
+
+        for weights in ([1.5, 1, 1], [1, 1], [1, -1, 1]):
+            with self.assertRaises(ValueError):
+                utils.check_weights(weights, 3, np)